@@ -0,0 +1,116 @@
+"""
+Adaptive load shedding.
+Compares in-flight requests, event loop lag and MongoDB pool wait against
+their limits and decides, per route priority, whether a new request is
+admitted. Low-priority routes are shed as soon as any signal crosses its
+limit, normal routes at twice the limit, critical routes never.
+"""
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.db_stats import pool_wait
+from app.loop_monitor import loop_monitor
+from app.metrics import metrics
+
+CRITICAL = "critical"
+NORMAL = "normal"
+LOW = "low"
+
+# Routes that keep being served however loaded the worker is
+CRITICAL_ROUTES = frozenset({
+    ("POST", "/admin/login"),
+    ("GET", "/org/get"),
+    ("GET", "/health"),
+    ("GET", "/metrics"),
+    ("GET", "/.well-known/jwks.json"),
+})
+
+# Expensive routes whose callers can retry later
+LOW_PRIORITY_ROUTES = frozenset({
+    ("POST", "/org/create"),
+    ("POST", "/org/get-many"),
+})
+
+# Overload ratio at which each priority is shed
+SHED_AT = {LOW: 1.0, NORMAL: 2.0}
+
+requests_in_flight = metrics.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+requests_shed = metrics.counter(
+    "http_requests_shed_total",
+    "HTTP requests rejected by load shedding",
+    ("priority", "signal")
+)
+
+
+def route_priority(method: str, path: str) -> str:
+    """Priority class of a route."""
+    if method == "OPTIONS":
+        # CORS preflights are answered without doing any work
+        return CRITICAL
+    route = (method, path)
+    if route in CRITICAL_ROUTES:
+        return CRITICAL
+    if route in LOW_PRIORITY_ROUTES:
+        return LOW
+    return NORMAL
+
+
+class LoadShedder:
+    """Tracks in-flight requests and decides admission from overload signals."""
+
+    def __init__(
+        self,
+        max_in_flight: int = settings.SHED_MAX_IN_FLIGHT,
+        max_loop_lag_seconds: float = settings.SHED_MAX_LOOP_LAG_MS / 1000,
+        max_pool_wait_seconds: float = settings.SHED_MAX_POOL_WAIT_MS / 1000
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_loop_lag_seconds = max_loop_lag_seconds
+        self.max_pool_wait_seconds = max_pool_wait_seconds
+        # Only touched from the event loop thread
+        self.in_flight = 0
+
+    def signals(self) -> Dict[str, float]:
+        """Each overload signal as a fraction of its limit (1.0 = at the limit)."""
+        return {
+            "in_flight": self.in_flight / self.max_in_flight,
+            "loop_lag": loop_monitor.lag / self.max_loop_lag_seconds,
+            "pool_wait": pool_wait.wait_seconds / self.max_pool_wait_seconds,
+        }
+
+    def overload(self) -> Tuple[float, str]:
+        """The highest overload ratio and the signal that produced it."""
+        signal, ratio = max(self.signals().items(), key=lambda item: item[1])
+        return ratio, signal
+
+    def admit(self, priority: str) -> Optional[str]:
+        """
+        Decide whether to start a request.
+
+        Args:
+            priority: Route priority (CRITICAL, NORMAL or LOW)
+
+        Returns:
+            None if admitted, otherwise the name of the signal over its limit
+        """
+        if priority == CRITICAL:
+            return None
+        ratio, signal = self.overload()
+        if ratio < SHED_AT[priority]:
+            return None
+        requests_shed.inc(priority=priority, signal=signal)
+        return signal
+
+    def started(self) -> None:
+        self.in_flight += 1
+        requests_in_flight.set(self.in_flight)
+
+    def finished(self) -> None:
+        self.in_flight -= 1
+        requests_in_flight.set(self.in_flight)
+
+
+# Singleton instance
+load_shedder = LoadShedder()
@@ -3,7 +3,7 @@ Configuration module for Croupier application.
 Loads environment variables and provides application settings.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -17,14 +17,162 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "croupier_master"
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    # "mongo" connects to MONGODB_URL; "memory" keeps everything in-process
+    # (app.memory_mongo), for tests and benchmarks only
+    MONGODB_BACKEND: str = "mongo"
+    
+    # Database Resilience
+    # Attempts (including the first) for reads failing with AutoReconnect
+    DB_RETRY_ATTEMPTS: int = 3
+    DB_RETRY_BASE_DELAY_MS: float = 50.0
+    DB_RETRY_MAX_DELAY_MS: float = 1000.0
+    # Total time a read may spend on retries (server-selection timeouts are never retried)
+    DB_RETRY_BUDGET_MS: float = 2000.0
+    # Consecutive connection failures that open the circuit (503 + Retry-After)
+    DB_BREAKER_FAILURE_THRESHOLD: int = 5
+    DB_BREAKER_RESET_SECONDS: float = 10.0
+    DB_BREAKER_HALF_OPEN_PROBES: int = 1
     
     # JWT Configuration
     JWT_SECRET_KEY: str = "your-secret-key-change-this-in-production"
-    JWT_ALGORITHM: str = "HS256"
+    # RS256 signs with rotating keys published at /.well-known/jwks.json;
+    # HS256 signs with JWT_SECRET_KEY (which otherwise encrypts stored private keys)
+    JWT_ALGORITHM: str = "RS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    JWT_KEY_SIZE: int = 2048
+    JWT_KEY_ROTATION_DAYS: int = 30
+    # Must exceed JWKS_CACHE_MAX_AGE so verifiers see a key before it signs
+    JWT_KEY_PREPUBLISH_HOURS: int = 24
+    JWT_KEY_RELOAD_SECONDS: int = 300
+    JWKS_CACHE_MAX_AGE: int = 3600
+    # How often revocations made by other workers are pulled into memory
+    REVOCATION_SYNC_SECONDS: float = 2.0
+    # Each sync re-reads revocations this much older than the newest one seen
+    REVOCATION_SYNC_OVERLAP_SECONDS: float = 30.0
     
     # Security
     BCRYPT_ROUNDS: int = 12
+    # When enabled, the first worker to start stores the highest cost whose hash
+    # time fits BCRYPT_TARGET_MS on its host in the master database, and every
+    # worker uses that cost instead of BCRYPT_ROUNDS. Logins re-hash passwords
+    # stored at a lower cost
+    BCRYPT_CALIBRATE: bool = True
+    BCRYPT_TARGET_MS: float = 250.0
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+    
+    # Login Admission Control
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_STORE: str = "memory"  # "memory" or "mongodb" (shared across workers)
+    LOGIN_EMAIL_BURST: int = 10
+    LOGIN_EMAIL_PER_MINUTE: float = 10.0
+    LOGIN_IP_BURST: int = 30
+    LOGIN_IP_PER_MINUTE: float = 60.0
+    # The per-IP bucket keys on the socket peer address. Behind a proxy or load
+    # balancer that is the proxy, so every client shares one bucket: name the
+    # header the proxy sets (e.g. "X-Forwarded-For") and how many trusted
+    # proxies append to it
+    LOGIN_CLIENT_IP_HEADER: Optional[str] = None
+    LOGIN_TRUSTED_PROXY_HOPS: int = 1
+    LOGIN_MAX_CONCURRENT_VERIFIES: Optional[int] = None  # defaults to CPU count
+    LOGIN_MAX_QUEUE: int = 32
+    LOGIN_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    
+    # Membership Filters (skip database lookups for unknown emails / org names)
+    BLOOM_FILTER_ENABLED: bool = True
+    BLOOM_FILTER_ERROR_RATE: float = 0.01
+    BLOOM_FILTER_MIN_CAPACITY: int = 100000
+    BLOOM_SYNC_INTERVAL_SECONDS: float = 5.0
+    # Re-read records this much older than the last sync (clock skew between workers);
+    # reads trust a filter miss only this long after the last successful sync
+    BLOOM_SYNC_OVERLAP_SECONDS: float = 60.0
+    
+    # Principal Cache (admin + organization documents per admin_id)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Tenant Collections (org_<organization id>)
+    # Moves legacy org_<name> collections to org_<id> in the background at startup
+    TENANT_MIGRATION_ENABLED: bool = True
+    
+    # Idempotency-Key support on mutating routes
+    IDEMPOTENCY_ENABLED: bool = True
+    # How long a completed response can be replayed
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    # How long an in-flight request holds its key (a retry meanwhile gets 409)
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Maximum names + ids per POST /org/get-many request
+    ORGANIZATION_BATCH_MAX: int = 100
+    
+    # HTTP Caching
+    HTTP_CACHE_MAX_AGE: int = 0
+    # How long a served ETag may answer If-None-Match without a database read.
+    # Writes in this process invalidate immediately; this bounds cross-worker staleness.
+    ETAG_STAMP_TTL_SECONDS: float = 5.0
+    
+    # Logging (queued; written by a background thread)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_QUEUE_SIZE: int = 10000
+    # Repeated warnings/errors with the same message template: the first
+    # LOG_SAMPLE_BURST per window are written, then one in LOG_SAMPLE_EVERY
+    LOG_SAMPLE_BURST: int = 20
+    LOG_SAMPLE_EVERY: int = 100
+    LOG_SAMPLE_WINDOW_SECONDS: float = 60.0
+    
+    # Server-Timing header with each request's MongoDB command count and time
+    SERVER_TIMING_ENABLED: bool = True
+    
+    # Event Loop Lag Monitor (exported at GET /metrics)
+    LOOP_LAG_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL_MS: float = 100.0
+    # Wake-ups later than this count as stalls
+    LOOP_LAG_THRESHOLD_MS: float = 100.0
+    # Log the stack of the call blocking the loop; defaults to DEBUG
+    LOOP_LAG_CAPTURE_STACKS: Optional[bool] = None
+    
+    # Load Shedding (503 before any work once a signal exceeds its limit;
+    # low-priority routes at the limit, others at twice the limit, login and
+    # GET /org/get never)
+    LOAD_SHEDDING_ENABLED: bool = True
+    SHED_MAX_IN_FLIGHT: int = 256
+    SHED_MAX_LOOP_LAG_MS: float = 250.0
+    SHED_MAX_POOL_WAIT_MS: float = 100.0
+    SHED_RETRY_AFTER_SECONDS: int = 1
+    
+    # Per-Tenant Fair Share (authenticated writes, keyed on organization_id)
+    TENANT_FAIR_SHARE_ENABLED: bool = True
+    # Slots shared by all organizations, handed out by weighted fair queuing
+    TENANT_MAX_CONCURRENT: int = 32
+    # Most slots one organization gets while other organizations are waiting
+    # (a lone organization can use every free slot)
+    TENANT_MAX_IN_FLIGHT: int = 8
+    # Waiting requests per organization before 429
+    TENANT_MAX_QUEUE: int = 16
+    TENANT_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    # organization_id -> weight (default 1.0), as JSON: {"<organization id>": 2}
+    TENANT_WEIGHTS: Dict[str, float] = {}
+    
+    # Request Profiling (collapsed-stack artifacts, see GET /admin/profiles)
+    PROFILING_ENABLED: bool = False
+    # Signs X-Debug-Profile (trigger) and X-Profile-Operator (download) header
+    # values; both are rejected when unset
+    PROFILING_SECRET: Optional[str] = None
+    # Fraction of requests profiled without a header
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_SECONDS: float = 30.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_ARTIFACTS: int = 100
+    
+    # Compression
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
     
     class Config:
         env_file = ".env"
@@ -4,9 +4,11 @@ Manages MongoDB connections for master database and dynamic organization collect
 """
 from pymongo import MongoClient, ASCENDING
 from pymongo.database import Database
-from pymongo.collection import Collection
-from typing import Optional
+from typing import Dict, Optional
 from app.config import settings
+from app.memory_mongo import MemoryClient
+from app.db_stats import command_listener, pool_wait
+from app.resilience import ResilientCollection, db_resilience
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,19 +20,57 @@ class DatabaseManager:
     _instance: Optional['DatabaseManager'] = None
     _client: Optional[MongoClient] = None
     _master_db: Optional[Database] = None
+    # Collection handles (wrapped in the retry/circuit-breaker layer) by
+    # collection name, valid for the current client
+    _collections: Dict[str, ResilientCollection] = {}
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
         return cls._instance
     
-    def connect(self) -> None:
-        """Establish connection to MongoDB."""
+    def connect(self, client: Optional[MongoClient] = None) -> None:
+        """
+        Establish connection to MongoDB.
+        
+        Args:
+            client: Already constructed client to use instead of the one
+                selected by MONGODB_BACKEND
+        """
         if self._client is None:
-            self._client = MongoClient(settings.MONGODB_URL)
+            self._client = client or self._create_client()
             self._master_db = self._client[settings.MONGODB_DB_NAME]
+            self._collections = {}
             self._initialize_master_db()
-            logger.info(f"Connected to MongoDB: {settings.MONGODB_URL}")
+            logger.info("Connected to MongoDB: %s", self.backend_name)
+    
+    @staticmethod
+    def _create_client() -> MongoClient:
+        """
+        Create a client for the configured backend.
+        
+        Every call with the memory backend returns a new, empty in-process
+        database, so each connect() starts from a clean state.
+        
+        Raises:
+            ValueError: If MONGODB_BACKEND is not "mongo" or "memory"
+        """
+        if settings.MONGODB_BACKEND == "memory":
+            return MemoryClient(event_listeners=[command_listener])
+        if settings.MONGODB_BACKEND != "mongo":
+            raise ValueError(f"Unknown MONGODB_BACKEND: {settings.MONGODB_BACKEND}")
+        return MongoClient(
+            settings.MONGODB_URL,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            event_listeners=[command_listener, pool_wait]
+        )
+    
+    @property
+    def backend_name(self) -> str:
+        """Human-readable description of the connected backend."""
+        if isinstance(self._client, MemoryClient):
+            return f"in-memory ({settings.MONGODB_DB_NAME})"
+        return settings.MONGODB_URL
     
     def disconnect(self) -> None:
         """Close MongoDB connection."""
@@ -38,6 +78,7 @@ class DatabaseManager:
             self._client.close()
             self._client = None
             self._master_db = None
+            self._collections = {}
             logger.info("Disconnected from MongoDB")
     
     def _initialize_master_db(self) -> None:
@@ -47,6 +88,8 @@ class DatabaseManager:
             [("organization_name", ASCENDING)], 
             unique=True
         )
+        self.master_db.organizations.create_index([("created_at", ASCENDING)])
+        self.master_db.organizations.create_index([("updated_at", ASCENDING)])
         
         # Create indexes for admin_users collection
         self.master_db.admin_users.create_index(
@@ -56,6 +99,67 @@ class DatabaseManager:
         self.master_db.admin_users.create_index(
             [("organization_id", ASCENDING)]
         )
+        # created_at / updated_at support incremental membership filter sync
+        self.master_db.admin_users.create_index([("created_at", ASCENDING)])
+        self.master_db.admin_users.create_index([("updated_at", ASCENDING)])
+        
+        # Create indexes for refresh_tokens collection (TTL purges expired tokens)
+        self.master_db.refresh_tokens.create_index(
+            [("token_hash", ASCENDING)],
+            unique=True
+        )
+        self.master_db.refresh_tokens.create_index(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0
+        )
+        self.master_db.refresh_tokens.create_index(
+            [("admin_id", ASCENDING)]
+        )
+        self.master_db.refresh_tokens.create_index(
+            [("family_id", ASCENDING)]
+        )
+        self.master_db.refresh_tokens.create_index(
+            [("organization_id", ASCENDING)]
+        )
+        
+        # Create indexes for jwt_keys collection (TTL drops keys whose tokens have expired)
+        self.master_db.jwt_keys.create_index(
+            [("kid", ASCENDING)],
+            unique=True
+        )
+        self.master_db.jwt_keys.create_index(
+            [("generation", ASCENDING)],
+            unique=True
+        )
+        self.master_db.jwt_keys.create_index(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0
+        )
+        
+        # Create indexes for revoked_tokens collection
+        self.master_db.revoked_tokens.create_index(
+            [("kind", ASCENDING), ("value", ASCENDING)],
+            unique=True
+        )
+        self.master_db.revoked_tokens.create_index(
+            [("revoked_at", ASCENDING)]
+        )
+        self.master_db.revoked_tokens.create_index(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0
+        )
+        
+        # TTL index purges idle shared login rate-limit buckets
+        self.master_db.login_rate_limits.create_index(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0
+        )
+        
+        # TTL index purges idempotency records once they may no longer be replayed
+        self.master_db.idempotency_keys.create_index(
+            [("expires_at", ASCENDING)],
+            expireAfterSeconds=0
+        )
         
         logger.info("Master database initialized with indexes")
     
@@ -67,38 +171,80 @@ class DatabaseManager:
         return self._master_db
     
     @property
-    def organizations(self) -> Collection:
+    def organizations(self) -> ResilientCollection:
         """Get organizations collection from master database."""
-        return self.master_db.organizations
+        return self._collection("organizations")
     
     @property
-    def admin_users(self) -> Collection:
+    def admin_users(self) -> ResilientCollection:
         """Get admin_users collection from master database."""
-        return self.master_db.admin_users
+        return self._collection("admin_users")
+    
+    @property
+    def refresh_tokens(self) -> ResilientCollection:
+        """Get refresh_tokens collection from master database."""
+        return self._collection("refresh_tokens")
     
-    def get_org_collection(self, organization_name: str) -> Collection:
+    @property
+    def login_rate_limits(self) -> ResilientCollection:
+        """Get login_rate_limits collection from master database."""
+        return self._collection("login_rate_limits")
+    
+    @property
+    def jwt_keys(self) -> ResilientCollection:
+        """Get jwt_keys collection from master database."""
+        return self._collection("jwt_keys")
+    
+    @property
+    def revoked_tokens(self) -> ResilientCollection:
+        """Get revoked_tokens collection from master database."""
+        return self._collection("revoked_tokens")
+    
+    @property
+    def idempotency_keys(self) -> ResilientCollection:
+        """Get idempotency_keys collection from master database."""
+        return self._collection("idempotency_keys")
+    
+    @property
+    def app_settings(self) -> ResilientCollection:
+        """Get app_settings collection (fleet-wide values) from master database."""
+        return self._collection("app_settings")
+    
+    def _collection(self, collection_name: str) -> ResilientCollection:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = ResilientCollection(self.master_db[collection_name], db_resilience)
+            self._collections[collection_name] = collection
+        return collection
+    
+    def get_org_collection(self, organization_id: str) -> ResilientCollection:
         """
         Get or create a dynamic collection for an organization.
         
+        Collections are named after the immutable organization id, so renames
+        never touch tenant data. Handles are cached per collection name;
+        MongoDB creates the collection itself lazily on first write.
+        
         Args:
-            organization_name: Name of the organization
+            organization_id: Organization's id
             
         Returns:
             Collection instance for the organization
         """
-        collection_name = f"org_{organization_name}"
-        return self.master_db[collection_name]
+        return self._collection(f"org_{organization_id}")
     
-    def drop_org_collection(self, organization_name: str) -> None:
+    def drop_org_collection(self, organization_id: str) -> None:
         """
         Drop an organization's dynamic collection.
         
         Args:
-            organization_name: Name of the organization
+            organization_id: Organization's id (or, for a collection that has
+                not been migrated yet, its name)
         """
-        collection_name = f"org_{organization_name}"
+        collection_name = f"org_{organization_id}"
         self.master_db.drop_collection(collection_name)
-        logger.info(f"Dropped collection: {collection_name}")
+        self._collections.pop(collection_name, None)
+        logger.info("Dropped collection: %s", collection_name)
 
 
 # Global database manager instance
@@ -0,0 +1,156 @@
+"""
+Per-request MongoDB command accounting and connection pool wait tracking.
+A pymongo command listener adds every command's duration to the stats of the
+request it runs for (a context variable, which run_in_threadpool carries into
+worker threads) and to process-wide metrics. A pool listener measures how
+long threads wait to check out a connection, a saturation signal for
+admission control.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import threading
+import time
+from pymongo import monitoring
+from app.metrics import metrics
+
+mongodb_commands = metrics.counter(
+    "mongodb_commands_total",
+    "MongoDB commands sent",
+    ("command",)
+)
+mongodb_command_seconds = metrics.histogram(
+    "mongodb_command_seconds",
+    "MongoDB command duration",
+    ("command",)
+)
+mongodb_pool_wait_seconds = metrics.histogram(
+    "mongodb_pool_wait_seconds",
+    "Time spent waiting to check out a pooled connection"
+)
+
+
+class CommandStats:
+    """Commands sent on behalf of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.commands: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, command_name: str, duration_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration_ms += duration_ms
+            self.commands[command_name] += 1
+
+
+current_command_stats: ContextVar[Optional[CommandStats]] = ContextVar("command_stats", default=None)
+
+
+def record_command(command_name: str, duration_micros: int) -> None:
+    """Attribute one completed command to the current request and the metrics."""
+    stats = current_command_stats.get()
+    if stats is not None:
+        stats.record(command_name, duration_micros / 1000)
+    mongodb_commands.inc(command=command_name)
+    mongodb_command_seconds.observe(duration_micros / 1e6, command=command_name)
+
+
+@contextmanager
+def track_commands() -> Iterator[CommandStats]:
+    """Collect the commands sent within this context (and threads it hands work to)."""
+    stats = CommandStats()
+    token = current_command_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_command_stats.reset(token)
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """pymongo listener feeding record_command."""
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        record_command(event.command_name, event.duration_micros)
+
+    def failed(self, event) -> None:
+        record_command(event.command_name, event.duration_micros)
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """
+    pymongo listener tracking connection checkout wait.
+
+    ``wait_seconds`` is an exponentially weighted average that also decays
+    with time (halving every ``half_life_seconds``), so it falls back to
+    zero once the pool stops being contended.
+    """
+
+    def __init__(self, half_life_seconds: float = 1.0):
+        self.half_life_seconds = half_life_seconds
+        self._average = 0.0
+        self._updated = time.monotonic()
+        self._started = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def wait_seconds(self) -> float:
+        age = time.monotonic() - self._updated
+        return self._average * 0.5 ** (age / self.half_life_seconds)
+
+    def record(self, wait: float) -> None:
+        """Fold one checkout's wait into the average."""
+        with self._lock:
+            self._average = self.wait_seconds * 0.8 + wait * 0.2
+            self._updated = time.monotonic()
+        mongodb_pool_wait_seconds.observe(wait)
+
+    def connection_check_out_started(self, event) -> None:
+        self._started.at = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        self._finish()
+
+    def connection_check_out_failed(self, event) -> None:
+        self._finish()
+
+    def _finish(self) -> None:
+        started = getattr(self._started, "at", None)
+        if started is not None:
+            self._started.at = None
+            self.record(time.perf_counter() - started)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+
+# Singleton instances
+command_listener = CommandTimingListener()
+pool_wait = PoolWaitListener()
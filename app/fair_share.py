@@ -0,0 +1,207 @@
+"""
+Per-tenant fair share of request concurrency.
+Authenticated work runs in one of a fixed number of slots shared by all
+organizations. When the slots are taken, waiting requests are served by
+weighted fair queuing (start-time fair queuing over organization_id), so a
+noisy tenant queues behind its own backlog while everyone else keeps getting
+their share. The per-organization cap only applies while another
+organization under its cap is waiting: a tenant alone on an idle worker can
+use every free slot.
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+import asyncio
+import time
+from fastapi import HTTPException, status
+from app.config import settings
+from app.metrics import metrics
+
+tenant_in_flight = metrics.gauge(
+    "tenant_requests_in_flight",
+    "Requests holding a fair-share slot, per organization",
+    ("tenant",)
+)
+tenant_queue_depth = metrics.gauge(
+    "tenant_queue_depth",
+    "Requests waiting for a fair-share slot, per organization",
+    ("tenant",)
+)
+tenant_rejected = metrics.counter(
+    "tenant_requests_rejected_total",
+    "Requests rejected by the per-organization limits",
+    ("tenant", "reason")
+)
+tenant_queue_wait = metrics.histogram(
+    "tenant_queue_wait_seconds",
+    "Time requests waited for a fair-share slot, per organization",
+    ("tenant",)
+)
+
+
+class _TenantState:
+    """One organization's slots, waiters and virtual finish time."""
+
+    __slots__ = ("weight", "in_flight", "waiters", "finish_tag")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.finish_tag = 0.0
+
+
+class TenantScheduler:
+    """
+    Weighted fair queuing of request slots across organizations.
+
+    A tenant's next request is tagged with the virtual time it would start
+    at (its previous finish tag, or the current virtual time if it has been
+    idle); a freed slot goes to the waiting tenant with the lowest tag, and
+    each grant pushes the tenant's tag forward by 1 / weight. Only touched
+    from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = settings.TENANT_MAX_CONCURRENT,
+        max_per_tenant: int = settings.TENANT_MAX_IN_FLIGHT,
+        max_queue: int = settings.TENANT_MAX_QUEUE,
+        queue_timeout: float = settings.TENANT_QUEUE_TIMEOUT_SECONDS,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_tenant = max_per_tenant
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.weights = settings.TENANT_WEIGHTS if weights is None else weights
+        self.in_flight = 0
+        self._tenants: Dict[str, _TenantState] = {}
+        self._virtual_time = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _state(self, tenant: str) -> _TenantState:
+        # Waiters belong to one event loop; start over when a new loop runs the app
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._tenants.clear()
+            self.in_flight = 0
+            self._virtual_time = 0.0
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = _TenantState(self.weights.get(tenant, 1.0))
+            self._tenants[tenant] = state
+        return state
+
+    def _start_tag(self, state: _TenantState) -> float:
+        return max(state.finish_tag, self._virtual_time)
+
+    def _grant(self, tenant: str, state: _TenantState) -> None:
+        start = self._start_tag(state)
+        state.finish_tag = start + 1.0 / state.weight
+        self._virtual_time = start
+        state.in_flight += 1
+        self.in_flight += 1
+        tenant_in_flight.set(state.in_flight, tenant=tenant)
+
+    def _dispatch(self) -> None:
+        """
+        Hand free slots to waiting tenants, lowest start tag first.
+
+        Tenants under their cap go first; tenants over it get a slot only
+        when nobody under the cap is waiting, so no slot sits idle.
+        """
+        while self.in_flight < self.max_concurrent:
+            waiting = [(tenant, state) for tenant, state in self._tenants.items() if state.waiters]
+            if not waiting:
+                return
+            candidates = [
+                (tenant, state) for tenant, state in waiting
+                if state.in_flight < self.max_per_tenant
+            ] or waiting
+            tenant, state = min(candidates, key=lambda item: self._start_tag(item[1]))
+            waiter = state.waiters.popleft()
+            tenant_queue_depth.set(len(state.waiters), tenant=tenant)
+            if waiter.done():
+                # Timed out or cancelled, not yet removed by its request
+                continue
+            self._grant(tenant, state)
+            waiter.set_result(None)
+
+    def _release(self, tenant: str, state: _TenantState) -> None:
+        state.in_flight -= 1
+        self.in_flight -= 1
+        tenant_in_flight.set(state.in_flight, tenant=tenant)
+        self._dispatch()
+        if not state.in_flight and not state.waiters:
+            self._tenants.pop(tenant, None)
+
+    def queue_depth(self, tenant: str) -> int:
+        state = self._tenants.get(tenant)
+        return len(state.waiters) if state else 0
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        """
+        Hold one of the shared slots on behalf of an organization.
+
+        Args:
+            tenant: organization_id of the authenticated admin
+
+        Raises:
+            HTTPException: 429 if the organization's queue is full or no slot
+                frees up in time
+        """
+        if not settings.TENANT_FAIR_SHARE_ENABLED:
+            yield
+            return
+
+        state = self._state(tenant)
+        # Free slots are only left over once every waiter has been served
+        # (see _dispatch), so a free slot can go straight to this request
+        if self.in_flight < self.max_concurrent and not state.waiters:
+            self._grant(tenant, state)
+        else:
+            await self._wait(tenant, state)
+        try:
+            yield
+        finally:
+            self._release(tenant, state)
+
+    async def _wait(self, tenant: str, state: _TenantState) -> None:
+        if len(state.waiters) >= self.max_queue:
+            self._reject(tenant, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        tenant_queue_depth.set(len(state.waiters), tenant=tenant)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the wait was abandoned
+                self._release(tenant, state)
+            elif waiter in state.waiters:
+                state.waiters.remove(waiter)
+                tenant_queue_depth.set(len(state.waiters), tenant=tenant)
+                if not state.in_flight and not state.waiters:
+                    self._tenants.pop(tenant, None)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(tenant, "timeout")
+            raise
+        finally:
+            tenant_queue_wait.observe(time.perf_counter() - started, tenant=tenant)
+
+    def _reject(self, tenant: str, reason: str) -> None:
+        tenant_rejected.inc(tenant=tenant, reason=reason)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent requests for this organization",
+            headers={"Retry-After": "1"},
+        )
+
+
+# Singleton instance
+tenant_scheduler = TenantScheduler()
@@ -0,0 +1,140 @@
+"""
+HTTP caching helpers for conditional GET.
+Builds strong ETags from document version fields and caches the latest stamp per key.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional, Tuple
+import hashlib
+import threading
+import time
+from fastapi import Response, status
+from app.config import settings
+
+
+def make_etag(document_id: str, version: datetime) -> str:
+    """
+    Build a strong ETag from a document's id and its last-modified time.
+
+    Args:
+        document_id: Immutable document id
+        version: updated_at (or created_at for never-updated documents)
+
+    Returns:
+        Quoted ETag value
+    """
+    digest = hashlib.sha1(f"{document_id}:{version.isoformat()}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current quoted ETag
+
+    Returns:
+        True if the client's cached representation is current
+    """
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP-date."""
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Build validator and Cache-Control headers for a cacheable response.
+
+    Args:
+        etag: Quoted ETag
+        last_modified: Last modification time of the resource
+
+    Returns:
+        Header dictionary
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str) -> Response:
+    """Build a bodyless 304 response carrying the current validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag)
+    )
+
+
+class VersionStampCache:
+    """
+    In-process cache of the latest ETag per resource key.
+
+    Lets a conditional GET answer 304 without touching the database or
+    building the response. Entries are dropped on local writes and expire
+    after a short TTL, which bounds staleness when another worker writes.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._stamps: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get the cached ETag for a key.
+
+        Args:
+            key: Resource key
+
+        Returns:
+            Cached ETag or None if missing or expired
+        """
+        entry = self._stamps.get(key)
+        if entry is None:
+            return None
+        etag, expires_at = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                if self._stamps.get(key) is entry:
+                    del self._stamps[key]
+            return None
+        return etag
+
+    def set(self, key: str, etag: str) -> None:
+        """Store the current ETag for a key."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._stamps[key] = (etag, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached ETag for a key."""
+        with self._lock:
+            self._stamps.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached ETags."""
+        with self._lock:
+            self._stamps.clear()
+
+
+# Singleton instance for organization metadata, keyed by organization name
+organization_stamps = VersionStampCache(settings.ETAG_STAMP_TTL_SECONDS)
@@ -0,0 +1,167 @@
+"""
+Idempotency-Key handling for mutating routes.
+The first request with a key claims it in the master database; its final
+response is stored there (TTL-indexed) and in an in-process front cache, so
+a retry with the same key and request replays the response instead of
+running the operation again.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import threading
+from app.config import settings
+from app.db import DatabaseManager
+from app.repositories.idempotency_repository import IdempotencyRepository, STATE_COMPLETED
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROCEED = "proceed"
+REPLAY = "replay"
+MISMATCH = "mismatch"
+IN_PROGRESS = "in_progress"
+
+
+def scoped_key(method: str, path: str, authorization: str, key: str) -> str:
+    """
+    Namespace a client's key by route and credentials.
+
+    Two clients sending the same key to the same route never share a record,
+    and a key reused on another route is a different key.
+    """
+    return hashlib.sha256(f"{method} {path}\n{authorization}\n{key}".encode("utf-8")).hexdigest()
+
+
+def fingerprint(query_string: bytes, body: bytes) -> str:
+    """Hash of the request parts that must match for a replay."""
+    return hashlib.sha256(query_string + b"\n" + body).hexdigest()
+
+
+class IdempotencyCache:
+    """LRU cache of completed records, each kept until its own expiry."""
+
+    def __init__(self, max_entries: int = settings.IDEMPOTENCY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                return None
+            if record["expires_at"] <= datetime.utcnow():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return record
+
+    def set(self, key: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class IdempotencyStore:
+    """Coordinates the front cache and the master-database records."""
+
+    def __init__(self):
+        self.cache = IdempotencyCache()
+        self.ttl = timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+        self.lock_seconds = settings.IDEMPOTENCY_LOCK_SECONDS
+        self._repo: Optional[IdempotencyRepository] = None
+
+    def init(self, db_manager: DatabaseManager) -> None:
+        """Bind to the connected database."""
+        self._repo = IdempotencyRepository(db_manager)
+
+    def clear(self) -> None:
+        """Unbind from the database and drop cached responses."""
+        self._repo = None
+        self.cache.clear()
+
+    def cached(self, key: str, request_fingerprint: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Answer from the front cache without touching the database.
+
+        Returns:
+            (REPLAY, record), (MISMATCH, None), or (None, None) on a miss
+        """
+        record = self.cache.get(key)
+        if record is None:
+            return None, None
+        if record["fingerprint"] != request_fingerprint:
+            return MISMATCH, None
+        return REPLAY, record
+
+    def begin(self, key: str, request_fingerprint: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Claim a key, or find out what a previous request with it did.
+
+        Args:
+            key: Scoped idempotency key
+            request_fingerprint: Hash of this request
+
+        Returns:
+            (PROCEED, {"claim_token": token}) if this request should run (pass
+            the token to ``finish``/``abandon``), (REPLAY, record) to return
+            the stored response, (MISMATCH, None) if the key belongs to a
+            different request, (IN_PROGRESS, None) while it still runs
+        """
+        outcome = self.cached(key, request_fingerprint)
+        if outcome[0] is not None:
+            return outcome
+        token, existing = self._repo.claim(key, request_fingerprint, self.lock_seconds, self.ttl)
+        if token is not None:
+            return PROCEED, {"claim_token": token}
+        if existing is None:
+            # Claimed and released by others while we looked; let the client retry
+            return IN_PROGRESS, None
+        if existing["fingerprint"] != request_fingerprint:
+            return MISMATCH, None
+        if existing["state"] != STATE_COMPLETED:
+            return IN_PROGRESS, None
+        self.cache.set(key, existing)
+        return REPLAY, existing
+
+    def finish(
+        self,
+        key: str,
+        token: str,
+        request_fingerprint: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes
+    ) -> None:
+        """Store a claimed request's response for replays."""
+        if not self._repo.complete(key, token, status_code, headers, body):
+            # Our lock expired and another request took the key over
+            logger.warning("Idempotency claim was taken over before completion")
+            return
+        self.cache.set(key, {
+            "fingerprint": request_fingerprint,
+            "state": STATE_COMPLETED,
+            "status_code": status_code,
+            "headers": [list(header) for header in headers],
+            "body": body,
+            "expires_at": datetime.utcnow() + self.ttl
+        })
+
+    def abandon(self, key: str, token: str) -> None:
+        """Release a claim whose request failed, so a retry runs it again."""
+        try:
+            self._repo.release(key, token)
+        except Exception as e:
+            # The claim's lock expires on its own
+            logger.error("Releasing idempotency key failed: %s", e)
+
+
+# Singleton instance
+idempotency_store = IdempotencyStore()
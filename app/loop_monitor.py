@@ -0,0 +1,116 @@
+"""
+Event loop lag monitoring.
+A coroutine measures how late its periodic wake-ups are (time the loop spent
+running something else without yielding) and exports it as a metric. With
+stack capture enabled, a watchdog thread snapshots the event loop thread's
+stack when a wake-up is overdue, which names the call that blocked the loop.
+"""
+from typing import Optional
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from app.config import settings
+from app.metrics import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+loop_lag = metrics.gauge(
+    "event_loop_lag_seconds",
+    "Lag of the most recent event loop wake-up"
+)
+loop_lag_histogram = metrics.histogram(
+    "event_loop_lag_seconds_distribution",
+    "Event loop wake-up lag",
+    buckets=LAG_BUCKETS
+)
+loop_blocked = metrics.counter(
+    "event_loop_blocked_total",
+    "Event loop stalls longer than LOOP_LAG_THRESHOLD_MS"
+)
+
+
+class LoopLagMonitor:
+    """Measures event loop lag and optionally captures the stacks of stalls."""
+
+    def __init__(
+        self,
+        interval_seconds: float = settings.LOOP_LAG_INTERVAL_MS / 1000,
+        threshold_seconds: float = settings.LOOP_LAG_THRESHOLD_MS / 1000
+    ):
+        self.interval_seconds = interval_seconds
+        self.threshold_seconds = threshold_seconds
+        # Smoothed lag, read by admission control
+        self.lag = 0.0
+        self.last_blocking_stack: Optional[str] = None
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog_stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def record(self, lag: float) -> None:
+        """Record one wake-up's lag."""
+        self.lag = lag if lag > self.lag else self.lag * 0.8 + lag * 0.2
+        loop_lag.set(lag)
+        loop_lag_histogram.observe(lag)
+        if lag >= self.threshold_seconds:
+            loop_blocked.inc()
+            if self._watchdog is None:
+                logger.warning("Event loop blocked for %.0f ms", lag * 1000)
+
+    async def run(self, capture_stacks: bool = False) -> None:
+        """
+        Measure lag until cancelled.
+
+        Args:
+            capture_stacks: Start the watchdog thread that records blocking stacks
+        """
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        if capture_stacks:
+            self._start_watchdog()
+        try:
+            while True:
+                started = loop.time()
+                await asyncio.sleep(self.interval_seconds)
+                self._heartbeat = time.monotonic()
+                self.record(max(loop.time() - started - self.interval_seconds, 0.0))
+        finally:
+            self._stop_watchdog()
+
+    def _start_watchdog(self) -> None:
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def _stop_watchdog(self) -> None:
+        self._watchdog_stop.set()
+        self._watchdog = None
+
+    def _watch(self) -> None:
+        overdue_after = self.interval_seconds + self.threshold_seconds
+        captured_for = None
+        while not self._watchdog_stop.wait(self.threshold_seconds / 2):
+            heartbeat = self._heartbeat
+            if time.monotonic() - heartbeat < overdue_after or captured_for == heartbeat:
+                continue
+            # One capture per stall: the loop has not woken since this heartbeat
+            captured_for = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.last_blocking_stack = stack
+            logger.warning(
+                "Event loop blocked for over %.0f ms in:\n%s",
+                self.threshold_seconds * 1000, stack
+            )
+
+
+# Singleton instance
+loop_monitor = LoopLagMonitor()
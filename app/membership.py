@@ -0,0 +1,195 @@
+"""
+Probabilistic membership filters for known admin emails and organization names.
+Lets lookups skip the database for names and emails never seen; the unique
+indexes remain the real arbiter.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+import asyncio
+import hashlib
+import math
+import threading
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Bloom filter over strings using double hashing of a single blake2b digest."""
+    
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+    
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+    
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        positions = list(self._positions(item))
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+    
+    @property
+    def saturated(self) -> bool:
+        """True once more items were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+class KnownIdentities:
+    """
+    Membership filters for admin emails and organization names.
+    
+    Built from the master collections at startup and updated by the
+    repositories on every create/update. Deletions are not removed (a stale
+    hit only costs the usual database lookup). Writes made by other workers
+    are picked up by ``sync`` every BLOOM_SYNC_INTERVAL_SECONDS, so a miss
+    may be stale. The create/rename pre-checks always treat a miss as final
+    (a unique index backs the answer); reads do so only while the filters
+    are ``fresh`` and otherwise go to the database and ``add_*`` whatever
+    the filter missed.
+    """
+    
+    def __init__(self):
+        self.emails: Optional[BloomFilter] = None
+        self.organization_names: Optional[BloomFilter] = None
+        self._last_sync: Optional[datetime] = None
+    
+    @property
+    def ready(self) -> bool:
+        """True once the filters have been built."""
+        return self.emails is not None and self.organization_names is not None
+    
+    @property
+    def fresh(self) -> bool:
+        """True while the last successful sync is within BLOOM_SYNC_OVERLAP_SECONDS."""
+        return (
+            self._last_sync is not None
+            and datetime.utcnow() - self._last_sync <= timedelta(seconds=settings.BLOOM_SYNC_OVERLAP_SECONDS)
+        )
+    
+    def might_have_email(self, email: str) -> bool:
+        """False only if the email is definitely not registered."""
+        return not settings.BLOOM_FILTER_ENABLED or not self.ready or email in self.emails
+    
+    def might_have_organization(self, organization_name: str) -> bool:
+        """False only if the organization name is definitely not registered."""
+        return (
+            not settings.BLOOM_FILTER_ENABLED
+            or not self.ready
+            or organization_name in self.organization_names
+        )
+    
+    def rules_out_email(self, email: str) -> bool:
+        """True if a read may skip the database: a miss on a freshly synced filter."""
+        return self.fresh and not self.might_have_email(email)
+    
+    def rules_out_organization(self, organization_name: str) -> bool:
+        """True if a read may skip the database: a miss on a freshly synced filter."""
+        return self.fresh and not self.might_have_organization(organization_name)
+    
+    def add_email(self, email: str) -> None:
+        """Record a registered admin email."""
+        if self.emails is not None:
+            self.emails.add(email)
+    
+    def add_organization(self, organization_name: str) -> None:
+        """Record a registered organization name."""
+        if self.organization_names is not None:
+            self.organization_names.add(organization_name)
+    
+    def build(self, db_manager: DatabaseManager) -> None:
+        """
+        Build both filters from the master collections.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        started = datetime.utcnow()
+        emails = self._build_filter(
+            db_manager.admin_users.estimated_document_count(),
+            (doc["email"] for doc in db_manager.admin_users.find({}, {"email": 1, "_id": 0}))
+        )
+        names = self._build_filter(
+            db_manager.organizations.estimated_document_count(),
+            (doc["organization_name"] for doc in db_manager.organizations.find(
+                {}, {"organization_name": 1, "_id": 0}
+            ))
+        )
+        self.emails, self.organization_names = emails, names
+        self._last_sync = started
+        logger.info(
+            "Built membership filters: %s emails, %s organization names",
+            emails.count, names.count
+        )
+    
+    def sync(self, db_manager: DatabaseManager) -> None:
+        """
+        Add identities created or renamed since the last sync (by any worker).
+        
+        Rebuilds from scratch once a filter is past its sized capacity.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        if not self.ready or self.emails.saturated or self.organization_names.saturated:
+            self.build(db_manager)
+            return
+        
+        started = datetime.utcnow()
+        # created_at/updated_at come from each writer's clock; the overlap
+        # covers skew between workers (anything later missed is added when read)
+        since = self._last_sync - timedelta(seconds=settings.BLOOM_SYNC_OVERLAP_SECONDS)
+        changed = {"$or": [{"created_at": {"$gte": since}}, {"updated_at": {"$gte": since}}]}
+        for doc in db_manager.admin_users.find(changed, {"email": 1, "_id": 0}):
+            self.emails.add(doc["email"])
+        for doc in db_manager.organizations.find(changed, {"organization_name": 1, "_id": 0}):
+            self.organization_names.add(doc["organization_name"])
+        self._last_sync = started
+    
+    @staticmethod
+    def _build_filter(expected: int, items: Iterable[str]) -> BloomFilter:
+        bloom = BloomFilter(
+            max(settings.BLOOM_FILTER_MIN_CAPACITY, expected * 2),
+            settings.BLOOM_FILTER_ERROR_RATE
+        )
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+
+async def run_sync_loop(db_manager: DatabaseManager) -> None:
+    """
+    Periodically sync the membership filters until cancelled.
+    
+    Args:
+        db_manager: Database manager instance
+    """
+    while True:
+        await asyncio.sleep(settings.BLOOM_SYNC_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(known_identities.sync, db_manager)
+        except Exception as e:
+            logger.error("Membership filter sync failed: %s", e)
+
+
+# Singleton instance
+known_identities = KnownIdentities()
@@ -0,0 +1,759 @@
+"""
+In-memory stand-in for the subset of pymongo the application uses.
+Lets benchmarks and tests run the real repositories and services without a MongoDB server.
+"""
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+import functools
+import itertools
+import threading
+import time
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.results import DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+IndexKeys = Union[str, List[Tuple[str, int]]]
+
+
+def _get_path(doc: Mapping[str, Any], path: str) -> Any:
+    """Resolve a dotted field path, returning _MISSING if any part is absent."""
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if value is _MISSING or value is None or operand is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        return value <= operand
+    except TypeError:
+        # MongoDB only compares values of the same BSON type class
+        return False
+
+
+def _equals(value: Any, operand: Any) -> bool:
+    if value is _MISSING:
+        return operand is None
+    if isinstance(value, list) and not isinstance(operand, list):
+        return operand in value
+    return value == operand
+
+
+def _is_operator(condition: Any) -> bool:
+    """True for operator expressions such as {"$gt": 1}, as opposed to literal values."""
+    return isinstance(condition, Mapping) and bool(condition) and next(iter(condition)).startswith("$")
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if not _is_operator(condition):
+        return _equals(value, condition)
+    for op, operand in condition.items():
+        if op == "$eq":
+            matched = _equals(value, operand)
+        elif op == "$ne":
+            matched = not _equals(value, operand)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            matched = _compare(value, op, operand)
+        elif op == "$in":
+            matched = any(_equals(value, item) for item in operand)
+        elif op == "$nin":
+            matched = not any(_equals(value, item) for item in operand)
+        elif op == "$exists":
+            matched = (value is not _MISSING) == bool(operand)
+        else:
+            raise OperationFailure(f"Unsupported query operator: {op}")
+        if not matched:
+            return False
+    return True
+
+
+def matches(doc: Mapping[str, Any], query: Optional[Mapping[str, Any]]) -> bool:
+    """
+    Evaluate a MongoDB query filter against a document.
+    
+    Args:
+        doc: Document
+        query: Filter supporting $or/$and/$nor and field operators
+            $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $exists
+        
+    Returns:
+        True if the document matches
+    """
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, sub) for sub in condition):
+                return False
+        elif not _matches_condition(_get_path(doc, key), condition):
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = bool(projection.get("_id", 1))
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if fields and all(fields.values()):
+        result = {}
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        for field in fields:
+            value = _get_path(doc, field)
+            if value is not _MISSING:
+                _set_path(result, field, value)
+        return deepcopy(result)
+    result = deepcopy(doc)
+    for field in fields:
+        _unset_path(result, field)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _normalize_keys(keys: IndexKeys, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(keys, str):
+        return [(keys, direction if direction is not None else ASCENDING)]
+    return [(field, order) for field, order in keys]
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Missing/None sort first, then numbers, strings, other types
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, ObjectId):
+        return (3, str(value))
+    if isinstance(value, datetime):
+        return (5, value)
+    return (6, repr(value))
+
+
+def _sort(docs: List[Dict[str, Any]], keys: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, order in reversed(keys):
+        docs.sort(key=lambda d: _sort_key(_get_path(d, field)), reverse=order < 0)
+    return docs
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class _CommandEvent:
+    """Subset of pymongo's CommandSucceededEvent / CommandFailedEvent."""
+    
+    def __init__(self, command_name: str, database_name: str, duration_micros: int, failure: Any = None):
+        self.command_name = command_name
+        self.database_name = database_name
+        self.duration_micros = duration_micros
+        self.failure = failure
+
+
+def _publish(owner: Any, command_name: str, started: float, failure: Any = None) -> None:
+    """Report one command to the client's event listeners, like a server round trip."""
+    event = _CommandEvent(command_name, owner._database_name, int((time.perf_counter() - started) * 1e6), failure)
+    for listener in owner._listeners:
+        if failure is None:
+            listener.succeeded(event)
+        else:
+            listener.failed(event)
+
+
+def _command(command_name: str) -> Callable:
+    """Decorate a collection/database method that stands for one server command."""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self._listeners:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                _publish(self, command_name, started, failure=str(e))
+                raise
+            _publish(self, command_name, started)
+            return result
+        return wrapper
+    return decorator
+
+
+class MemoryCursor:
+    """Lazy cursor over a query; supports sort/skip/limit chaining and iteration."""
+    
+    def __init__(
+        self,
+        collection: "MemoryCollection",
+        query: Optional[Mapping[str, Any]],
+        projection: Optional[Mapping[str, Any]]
+    ):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[Iterator[Dict[str, Any]]] = None
+    
+    def sort(self, key_or_list: IndexKeys, direction: Optional[int] = None) -> "MemoryCursor":
+        self._sort = _normalize_keys(key_or_list, direction)
+        return self
+    
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._skip = skip
+        return self
+    
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._limit = limit
+        return self
+    
+    def _evaluate(self) -> Iterator[Dict[str, Any]]:
+        docs = self._collection._select(self._query)
+        if self._sort:
+            docs = _sort(docs, self._sort)
+        end = self._skip + self._limit if self._limit else None
+        return iter([_project(doc, self._projection) for doc in docs[self._skip:end]])
+    
+    @_command("find")
+    def _execute(self) -> Iterator[Dict[str, Any]]:
+        return self._evaluate()
+    
+    def __iter__(self) -> "MemoryCursor":
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        if self._results is None:
+            # Like pymongo, the query is sent on first iteration
+            self._results = self._execute()
+        return next(self._results)
+    
+    @property
+    def _listeners(self) -> List[Any]:
+        return self._collection._listeners
+    
+    @property
+    def _database_name(self) -> str:
+        return self._collection._database_name
+    
+    def close(self) -> None:
+        self._results = iter(())
+
+
+class _Namespace:
+    """Storage of one collection: documents in insertion order plus indexes."""
+    
+    def __init__(self):
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[str, Any]] = {"_id_": {"key": [("_id", ASCENDING)]}}
+        # Unique index name -> key tuple -> owning _id
+        self.unique: Dict[str, Dict[Tuple[Any, ...], Any]] = {}
+        self.lock = threading.RLock()
+    
+    @property
+    def exists(self) -> bool:
+        return bool(self.docs) or len(self.indexes) > 1
+
+
+class MemoryCollection:
+    """
+    Handle to a collection, resolved by name on every operation like pymongo's.
+    
+    Documents are copied on the way in and out, like a BSON round trip.
+    Unique indexes (single or compound, missing fields indexed as null) are
+    enforced with DuplicateKeyError. TTL indexes are accepted but documents
+    never expire; the application filters on expiry fields anyway.
+    """
+    
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+    
+    @property
+    def _listeners(self) -> List[Any]:
+        return self.database.client._listeners
+    
+    @property
+    def _database_name(self) -> str:
+        return self.database.name
+    
+    @property
+    def _docs(self) -> Dict[Any, Dict[str, Any]]:
+        return self.database._namespace(self.name).docs
+    
+    @property
+    def _indexes(self) -> Dict[str, Dict[str, Any]]:
+        return self.database._namespace(self.name).indexes
+    
+    @property
+    def _unique(self) -> Dict[str, Dict[Tuple[Any, ...], Any]]:
+        return self.database._namespace(self.name).unique
+    
+    @property
+    def _lock(self) -> threading.RLock:
+        return self.database._namespace(self.name).lock
+    
+    # Indexes
+    
+    @_command("createIndexes")
+    def create_index(self, keys: IndexKeys, unique: bool = False, name: Optional[str] = None, **kwargs) -> str:
+        """
+        Create an index; only uniqueness is enforced.
+        
+        Returns:
+            Index name
+            
+        Raises:
+            DuplicateKeyError: If existing documents violate a new unique index
+        """
+        fields = _normalize_keys(keys)
+        name = name or "_".join(f"{field}_{order}" for field, order in fields)
+        with self._lock:
+            if name in self._indexes:
+                return name
+            spec = {"key": fields, "unique": unique, **kwargs}
+            if unique:
+                entries: Dict[Tuple[Any, ...], Any] = {}
+                for _id, doc in self._docs.items():
+                    key = self._index_key(fields, doc)
+                    if key in entries:
+                        raise DuplicateKeyError(f"E11000 duplicate key error index: {name}", 11000)
+                    entries[key] = _id
+                self._unique[name] = entries
+            self._indexes[name] = spec
+        return name
+    
+    def index_information(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return deepcopy(self._indexes)
+    
+    @staticmethod
+    def _index_key(fields: List[Tuple[str, int]], doc: Mapping[str, Any]) -> Tuple[Any, ...]:
+        values = (_get_path(doc, field) for field, _ in fields)
+        return tuple(None if v is _MISSING else _hashable(v) for v in values)
+    
+    def _check_unique(self, doc: Mapping[str, Any], own_id: Any) -> None:
+        for name, entries in self._unique.items():
+            owner = entries.get(self._index_key(self._indexes[name]["key"], doc), own_id)
+            if owner != own_id:
+                raise DuplicateKeyError(f"E11000 duplicate key error index: {name}", 11000)
+    
+    def _index(self, doc: Mapping[str, Any]) -> None:
+        for name, entries in self._unique.items():
+            entries[self._index_key(self._indexes[name]["key"], doc)] = doc["_id"]
+    
+    def _unindex(self, doc: Mapping[str, Any]) -> None:
+        for name, entries in self._unique.items():
+            entries.pop(self._index_key(self._indexes[name]["key"], doc), None)
+    
+    # Reads
+    
+    def _select(self, query: Optional[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Matching stored documents (not copies); caller must not mutate them."""
+        with self._lock:
+            query = query or {}
+            _id = query.get("_id", _MISSING)
+            if _id is not _MISSING and not _is_operator(_id):
+                return self._lookup(_id, query)
+            # Equality on every field of a unique index is a point lookup, as in MongoDB
+            for name, entries in self._unique.items():
+                fields = self._indexes[name]["key"]
+                if all(field in query and not _is_operator(query[field]) for field, _ in fields):
+                    key = tuple(_hashable(query[field]) for field, _ in fields)
+                    owner = entries.get(key, _MISSING)
+                    return [] if owner is _MISSING else self._lookup(owner, query)
+            return [doc for doc in self._docs.values() if matches(doc, query)]
+    
+    def _lookup(self, _id: Any, query: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        doc = self._docs.get(_hashable(_id))
+        return [doc] if doc is not None and matches(doc, query) else []
+    
+    def find(
+        self,
+        filter: Optional[Mapping[str, Any]] = None,
+        projection: Optional[Mapping[str, Any]] = None,
+        sort: Optional[IndexKeys] = None,
+        skip: int = 0,
+        limit: int = 0
+    ) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection).skip(skip).limit(limit)
+        return cursor.sort(sort) if sort else cursor
+    
+    def find_one(
+        self,
+        filter: Optional[Any] = None,
+        projection: Optional[Mapping[str, Any]] = None,
+        sort: Optional[IndexKeys] = None
+    ) -> Optional[Dict[str, Any]]:
+        if filter is not None and not isinstance(filter, Mapping):
+            filter = {"_id": filter}
+        return next(self.find(filter, projection, sort=sort, limit=1), None)
+    
+    @_command("aggregate")
+    def count_documents(self, filter: Mapping[str, Any], **kwargs) -> int:
+        return len(self._select(filter))
+    
+    @_command("count")
+    def estimated_document_count(self) -> int:
+        return len(self._docs)
+    
+    # Writes
+    
+    @_command("insert")
+    def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        with self._lock:
+            # pymongo adds the generated _id to the caller's document
+            document.setdefault("_id", ObjectId())
+            self._insert(document)
+        return InsertOneResult(document["_id"], True)
+    
+    @_command("insert")
+    def insert_many(self, documents: Iterable[Dict[str, Any]], ordered: bool = True) -> InsertManyResult:
+        ids = []
+        with self._lock:
+            for document in documents:
+                document.setdefault("_id", ObjectId())
+                self._insert(document)
+                ids.append(document["_id"])
+        return InsertManyResult(ids, True)
+    
+    def _insert(self, document: Dict[str, Any]) -> None:
+        doc = deepcopy(document)
+        key = _hashable(doc["_id"])
+        if key in self._docs:
+            raise DuplicateKeyError("E11000 duplicate key error index: _id_", 11000)
+        self._check_unique(doc, doc["_id"])
+        self._docs[key] = doc
+        self._index(doc)
+    
+    def _apply_update(self, doc: Dict[str, Any], update: Mapping[str, Any], inserting: bool) -> Dict[str, Any]:
+        if isinstance(update, list):
+            raise OperationFailure("Aggregation pipeline updates are not supported in memory")
+        if not update or not all(op.startswith("$") for op in update):
+            raise ValueError("update only works with $ operators")
+        new = deepcopy(doc)
+        for op, fields in update.items():
+            for path, value in fields.items():
+                current = _get_path(new, path)
+                if op == "$set":
+                    _set_path(new, path, deepcopy(value))
+                elif op == "$setOnInsert":
+                    if inserting:
+                        _set_path(new, path, deepcopy(value))
+                elif op == "$unset":
+                    _unset_path(new, path)
+                elif op == "$inc":
+                    _set_path(new, path, (0 if current is _MISSING else current) + value)
+                elif op == "$max":
+                    if current is _MISSING or current is None or value > current:
+                        _set_path(new, path, value)
+                elif op == "$min":
+                    if current is _MISSING or current is None or value < current:
+                        _set_path(new, path, value)
+                elif op == "$currentDate":
+                    _set_path(new, path, datetime.utcnow())
+                else:
+                    raise OperationFailure(f"Unsupported update operator: {op}")
+        return new
+    
+    def _upsert_seed(self, query: Mapping[str, Any]) -> Dict[str, Any]:
+        doc: Dict[str, Any] = {}
+        for key, condition in (query or {}).items():
+            if key.startswith("$"):
+                continue
+            if _is_operator(condition):
+                if "$eq" in condition:
+                    _set_path(doc, key, deepcopy(condition["$eq"]))
+            else:
+                _set_path(doc, key, deepcopy(condition))
+        return doc
+    
+    def _update(
+        self,
+        query: Mapping[str, Any],
+        update: Mapping[str, Any],
+        upsert: bool,
+        many: bool,
+        sort: Optional[IndexKeys] = None
+    ) -> Tuple[int, int, Any, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Apply an update under the collection lock.
+        
+        Returns:
+            (matched, modified, upserted_id, first document before, first document after)
+        """
+        with self._lock:
+            targets = self._select(query)
+            if sort:
+                targets = _sort(targets, _normalize_keys(sort))
+            if not many:
+                targets = targets[:1]
+            if not targets:
+                if not upsert:
+                    return 0, 0, None, None, None
+                new = self._apply_update(self._upsert_seed(query), update, inserting=True)
+                new.setdefault("_id", ObjectId())
+                self._insert(new)
+                return 0, 0, new["_id"], None, self._docs[_hashable(new["_id"])]
+            
+            # Validate every change before applying any, so a duplicate key leaves no partial write
+            changes = [(doc, self._apply_update(doc, update, inserting=False)) for doc in targets]
+            for index, (old, new) in enumerate(changes):
+                self._unindex(old)
+                try:
+                    self._check_unique(new, new["_id"])
+                except DuplicateKeyError:
+                    self._index(old)
+                    for previous_old, previous_new in changes[:index]:
+                        self._unindex(previous_new)
+                        self._index(previous_old)
+                    raise
+                self._index(new)
+            modified = 0
+            for old, new in changes:
+                if new != old:
+                    modified += 1
+                self._docs[_hashable(new["_id"])] = new
+            return len(changes), modified, None, changes[0][0], changes[0][1]
+    
+    @_command("update")
+    def update_one(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **kwargs) -> UpdateResult:
+        matched, modified, upserted_id, _, _ = self._update(filter, update, upsert, many=False)
+        return UpdateResult(self._raw_update_result(matched, modified, upserted_id), True)
+    
+    @_command("update")
+    def update_many(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **kwargs) -> UpdateResult:
+        matched, modified, upserted_id, _, _ = self._update(filter, update, upsert, many=True)
+        return UpdateResult(self._raw_update_result(matched, modified, upserted_id), True)
+    
+    @staticmethod
+    def _raw_update_result(matched: int, modified: int, upserted_id: Any) -> Dict[str, Any]:
+        raw = {"n": matched or int(upserted_id is not None), "nModified": modified, "ok": 1.0}
+        if upserted_id is not None:
+            raw["upserted"] = upserted_id
+        return raw
+    
+    @_command("findAndModify")
+    def find_one_and_update(
+        self,
+        filter: Mapping[str, Any],
+        update: Mapping[str, Any],
+        projection: Optional[Mapping[str, Any]] = None,
+        sort: Optional[IndexKeys] = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        _, _, _, before, after = self._update(filter, update, upsert, many=False, sort=sort)
+        doc = after if return_document else before
+        return None if doc is None else _project(doc, projection)
+    
+    @_command("findAndModify")
+    def find_one_and_delete(
+        self,
+        filter: Mapping[str, Any],
+        projection: Optional[Mapping[str, Any]] = None,
+        sort: Optional[IndexKeys] = None,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            targets = self._select(filter)
+            if sort:
+                targets = _sort(targets, _normalize_keys(sort))
+            if not targets:
+                return None
+            self._delete(targets[0])
+            return _project(targets[0], projection)
+    
+    def _delete(self, doc: Dict[str, Any]) -> None:
+        self._unindex(doc)
+        del self._docs[_hashable(doc["_id"])]
+    
+    @_command("delete")
+    def delete_one(self, filter: Mapping[str, Any], **kwargs) -> DeleteResult:
+        with self._lock:
+            targets = self._select(filter)[:1]
+            for doc in targets:
+                self._delete(doc)
+        return DeleteResult({"n": len(targets), "ok": 1.0}, True)
+    
+    @_command("delete")
+    def delete_many(self, filter: Mapping[str, Any], **kwargs) -> DeleteResult:
+        with self._lock:
+            targets = self._select(filter)
+            for doc in targets:
+                self._delete(doc)
+        return DeleteResult({"n": len(targets), "ok": 1.0}, True)
+    
+    def drop(self) -> None:
+        self.database.drop_collection(self.name)
+    
+    @_command("renameCollection")
+    def rename(self, new_name: str, dropTarget: bool = False, **kwargs) -> None:
+        """
+        Rename the collection, keeping documents and indexes.
+        
+        Raises:
+            OperationFailure: If the collection does not exist, or the target
+                exists and dropTarget is False
+        """
+        self.database._rename(self.name, new_name, dropTarget)
+
+
+class MemoryDatabase:
+    """Database of lazily created collections."""
+    
+    def __init__(self, client: "MemoryClient", name: str):
+        self.client = client
+        self.name = name
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+    
+    def _namespace(self, name: str) -> _Namespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            with self._lock:
+                namespace = self._namespaces.setdefault(name, _Namespace())
+        return namespace
+    
+    def _rename(self, name: str, new_name: str, drop_target: bool) -> None:
+        with self._lock:
+            source = self._namespaces.get(name)
+            if source is None or not source.exists:
+                raise OperationFailure(f"Source collection {self.name}.{name} does not exist")
+            target = self._namespaces.get(new_name)
+            if target is not None and target.exists and not drop_target:
+                raise OperationFailure(f"Target collection {self.name}.{new_name} exists")
+            self._namespaces[new_name] = self._namespaces.pop(name)
+    
+    @property
+    def _listeners(self) -> List[Any]:
+        return self.client._listeners
+    
+    @property
+    def _database_name(self) -> str:
+        return self.name
+    
+    def get_collection(self, name: str) -> MemoryCollection:
+        return MemoryCollection(self, name)
+    
+    def __getitem__(self, name: str) -> MemoryCollection:
+        return self.get_collection(name)
+    
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get_collection(name)
+    
+    @_command("listCollections")
+    def list_collection_names(self, filter: Optional[Mapping[str, Any]] = None, **kwargs) -> List[str]:
+        with self._lock:
+            names = [name for name, ns in self._namespaces.items() if ns.exists]
+        return [name for name in names if matches({"name": name}, filter)]
+    
+    @_command("drop")
+    def drop_collection(self, name_or_collection: Union[str, MemoryCollection]) -> None:
+        name = getattr(name_or_collection, "name", name_or_collection)
+        with self._lock:
+            self._namespaces.pop(name, None)
+    
+    @_command("command")
+    def command(self, command: Union[str, Mapping[str, Any]], *args, **kwargs) -> Dict[str, Any]:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == "ping":
+            return {"ok": 1.0}
+        raise OperationFailure(f"Unsupported command: {name}")
+
+
+class MemoryClient:
+    """
+    Client whose databases live in this process only.
+    
+    Every instance has its own storage, so separate clients (or separate
+    database names on one client) are fully isolated from each other.
+    """
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, *args, event_listeners: Optional[List[Any]] = None, **kwargs):
+        self.id = next(self._ids)
+        # pymongo CommandListeners; each collection operation is reported as one command
+        self._listeners = list(event_listeners or [])
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self._lock = threading.Lock()
+    
+    def get_database(self, name: str) -> MemoryDatabase:
+        with self._lock:
+            database = self._databases.get(name)
+            if database is None:
+                database = self._databases[name] = MemoryDatabase(self, name)
+            return database
+    
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        return self.get_database(name)
+    
+    def list_database_names(self) -> List[str]:
+        with self._lock:
+            return list(self._databases)
+    
+    def drop_database(self, name_or_database: Union[str, MemoryDatabase]) -> None:
+        name = getattr(name_or_database, "name", name_or_database)
+        with self._lock:
+            self._databases.pop(name, None)
+    
+    @property
+    def _database_name(self) -> str:
+        return "admin"
+    
+    @_command("buildInfo")
+    def server_info(self) -> Dict[str, Any]:
+        return {"version": "memory", "ok": 1.0}
+    
+    def close(self) -> None:
+        """Nothing to release; data stays available until the client is dropped."""
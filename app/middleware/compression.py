@@ -0,0 +1,184 @@
+"""
+Response compression middleware.
+Negotiates brotli or gzip from Accept-Encoding for payloads above a size threshold.
+Every response it could have compressed carries ``Vary: Accept-Encoding``, and
+compressed bodies get a weak ETag, since their bytes differ from the identity body
+the strong ETag names.
+"""
+from typing import Optional
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class _GzipCompressor:
+    """Streaming gzip compressor."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    """Streaming brotli compressor."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def weaken_etag(headers: MutableHeaders) -> None:
+    """Mark a strong ETag weak (the body is a different encoding of the same resource)."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        "br", "gzip" or None if the client accepts neither
+    """
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    best = None
+    best_q = 0.0
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        candidates = supported if coding == "*" else (coding,)
+        for candidate in candidates:
+            if candidate not in supported or q <= 0:
+                continue
+            # Prefer brotli over gzip when both have the same weight
+            if q > best_q or (q == best_q and candidate == "br"):
+                best, best_q = candidate, q
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with brotli or gzip."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.GZIP_COMPRESS_LEVEL,
+        brotli_quality: int = settings.BROTLI_QUALITY
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self.app, self, encoding)
+        await responder(scope, receive, send)
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper that compresses the outgoing body."""
+
+    def __init__(self, app: ASGIApp, middleware: CompressionMiddleware, encoding: Optional[str]):
+        self.app = app
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+        self.if_none_match = ""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        self.if_none_match = Headers(scope=scope).get("if-none-match", "")
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk tells us
+            # whether the response is worth compressing.
+            self.initial_message = message
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" in headers:
+                self.passthrough = True
+                return
+            # The body depends on Accept-Encoding whether or not this one is compressed
+            headers.add_vary_header("Accept-Encoding")
+            if message["status"] == 304 and headers.get("etag"):
+                # Echo the validator the client holds: weak if its copy was compressed
+                if ("W/" + headers["etag"]) in self.if_none_match:
+                    weaken_etag(headers)
+            self.passthrough = self.encoding is None or message["status"] in (204, 304)
+        elif message_type != "http.response.body":
+            await self.send(message)
+        elif self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        elif not self.started:
+            self.started = True
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) < self.middleware.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.middleware._compressor(self.encoding)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            weaken_etag(headers)
+            if more_body:
+                del headers["Content-Length"]
+                message["body"] = self.compressor.process(body)
+            else:
+                message["body"] = self.compressor.process(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+        else:
+            body = self.compressor.process(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self.compressor.finish()
+            message["body"] = body
+            await self.send(message)
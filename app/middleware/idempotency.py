@@ -0,0 +1,147 @@
+"""
+Idempotency-Key middleware.
+For mutating routes, a request carrying an Idempotency-Key header runs at
+most once per key; retries receive the original response with an
+``Idempotent-Replayed: true`` header.
+"""
+from typing import List, Tuple
+from fastapi.concurrency import run_in_threadpool
+from starlette import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.idempotency import (
+    IN_PROGRESS,
+    MISMATCH,
+    PROCEED,
+    IdempotencyStore,
+    fingerprint,
+    idempotency_store,
+    scoped_key
+)
+from app.responses import FastJSONResponse
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Token endpoints are left out on purpose: their responses are credentials
+IDEMPOTENT_ROUTES = frozenset({
+    ("POST", "/org/create"),
+    ("PUT", "/org/update"),
+    ("DELETE", "/org/delete"),
+})
+
+# Responses that say nothing final about the request and must not be replayed
+_TRANSIENT_STATUSES = frozenset({status.HTTP_409_CONFLICT, status.HTTP_429_TOO_MANY_REQUESTS})
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware replaying stored responses for repeated Idempotency-Keys."""
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in IDEMPOTENT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _error(scope, receive, send, status.HTTP_400_BAD_REQUEST,
+                         f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        body = await _read_body(receive)
+        key = scoped_key(scope["method"], scope["path"], headers.get("authorization", ""), key)
+        request_fingerprint = fingerprint(scope.get("query_string", b""), body)
+
+        outcome, record = self.store.cached(key, request_fingerprint)
+        if outcome is None:
+            outcome, record = await run_in_threadpool(self.store.begin, key, request_fingerprint)
+        if outcome == MISMATCH:
+            await _error(scope, receive, send, status.HTTP_422_UNPROCESSABLE_ENTITY,
+                         "Idempotency-Key was already used with a different request")
+            return
+        if outcome == IN_PROGRESS:
+            await _error(scope, receive, send, status.HTTP_409_CONFLICT,
+                         "A request with this Idempotency-Key is still in progress",
+                         headers={"Retry-After": "1"})
+            return
+        if outcome != PROCEED:
+            await _replay(record, send)
+            return
+
+        await self._run(scope, body, receive, send, key, record["claim_token"], request_fingerprint)
+
+    async def _run(
+        self,
+        scope: Scope,
+        body: bytes,
+        receive: Receive,
+        send: Send,
+        key: str,
+        token: str,
+        request_fingerprint: str
+    ) -> None:
+        response_status = 0
+        response_headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def replay_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                response_headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_body, capture)
+        except BaseException:
+            await run_in_threadpool(self.store.abandon, key, token)
+            raise
+        if response_status >= 500 or response_status in _TRANSIENT_STATUSES or not response_status:
+            await run_in_threadpool(self.store.abandon, key, token)
+            return
+        await run_in_threadpool(
+            self.store.finish, key, token, request_fingerprint, response_status, response_headers, b"".join(chunks)
+        )
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def _replay(record: dict, send: Send) -> None:
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+    headers.append((REPLAYED_HEADER.encode("latin-1"), b"true"))
+    await send({"type": "http.response.start", "status": record["status_code"], "headers": headers})
+    await send({"type": "http.response.body", "body": bytes(record["body"])})
+
+
+async def _error(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str, headers=None) -> None:
+    response = FastJSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+    await response(scope, receive, send)
@@ -0,0 +1,45 @@
+"""
+Load shedding middleware.
+Rejects requests with 503 before any work (body parsing, authentication,
+database calls) when the worker is overloaded for their route's priority.
+"""
+from starlette import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.admission import LoadShedder, load_shedder, route_priority
+from app.responses import FastJSONResponse
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware applying LoadShedder admission to every HTTP request."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        shedder: LoadShedder = load_shedder,
+        retry_after: int = settings.SHED_RETRY_AFTER_SECONDS
+    ):
+        self.app = app
+        self.shedder = shedder
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        signal = self.shedder.admit(route_priority(scope["method"], scope["path"]))
+        if signal is not None:
+            response = FastJSONResponse(
+                {"detail": "Server overloaded, retry later"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.retry_after), "X-Shed-Reason": signal}
+            )
+            await response(scope, receive, send)
+            return
+
+        self.shedder.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.finished()
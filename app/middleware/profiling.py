@@ -0,0 +1,55 @@
+"""
+Request profiling middleware.
+Profiles a request when it carries a valid signed X-Debug-Profile header or
+is picked by PROFILING_SAMPLE_RATE; all other requests pay one header lookup
+and one random draw.
+"""
+import random
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.profiling import ProfileStore, SamplingProfiler, profile_store, verify_profile_request
+from app.structured_logging import request_id_var
+
+PROFILE_HEADER = "x-debug-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware writing a collapsed-stack profile for triggered requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = settings.PROFILING_SAMPLE_RATE,
+        store: ProfileStore = profile_store
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.store = store
+
+    def _triggered(self, scope: Scope) -> bool:
+        header = Headers(scope=scope).get(PROFILE_HEADER)
+        if header is not None:
+            return verify_profile_request(header)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = self.store.new_name(scope["method"], scope["path"], request_id_var.get())
+        profiler = SamplingProfiler()
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = name
+            await send(message)
+
+        # The artifact is written by the sampling thread once it stops
+        profiler.start(on_finish=lambda finished: self.store.save(name, finished))
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
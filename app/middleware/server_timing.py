@@ -0,0 +1,37 @@
+"""
+Server-Timing middleware.
+Reports the MongoDB commands a request sent and their total time, plus the
+time the application took, e.g.
+``Server-Timing: db;dur=1.84;desc="3 commands", app;dur=4.02``.
+"""
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db_stats import track_commands
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware attaching per-request database timings to responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_commands() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    plural = "" if stats.count == 1 else "s"
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration_ms:.2f};desc="{stats.count} command{plural}", app;dur={elapsed_ms:.2f}'
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -1,73 +1,66 @@
 """
 Pydantic models for request validation and response serialization.
 """
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, StringConstraints, model_validator
+from typing import Annotated, List, Optional
 from datetime import datetime
-import re
+from app.config import settings
+
+
+ORGANIZATION_NAME_PATTERN = r'^[a-zA-Z0-9_-]+$'
+
+
+def _validate_password_complexity(v: str) -> str:
+    """Validate password complexity in a single pass over the string."""
+    has_upper = has_lower = has_digit = False
+    for c in v:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            return v
+    if not has_upper:
+        raise ValueError('Password must contain at least one uppercase letter')
+    if not has_lower:
+        raise ValueError('Password must contain at least one lowercase letter')
+    raise ValueError('Password must contain at least one digit')
+
+
+# Organization name: alphanumeric, underscores and hyphens, normalized to lowercase.
+# Length, pattern and lowercasing all run inside pydantic-core.
+OrganizationName = Annotated[
+    str,
+    StringConstraints(
+        min_length=3,
+        max_length=50,
+        pattern=ORGANIZATION_NAME_PATTERN,
+        to_lower=True
+    )
+]
+
+# Admin password: at least 8 characters with upper, lower and digit.
+Password = Annotated[
+    str,
+    StringConstraints(min_length=8),
+    AfterValidator(_validate_password_complexity)
+]
 
 
 class OrganizationCreate(BaseModel):
     """Schema for creating a new organization."""
-    organization_name: str = Field(..., min_length=3, max_length=50)
+    organization_name: OrganizationName
     email: EmailStr
-    password: str = Field(..., min_length=8)
-    
-    @validator('organization_name')
-    def validate_organization_name(cls, v):
-        """Validate organization name format (alphanumeric, underscores, hyphens)."""
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
-            raise ValueError(
-                'Organization name must contain only alphanumeric characters, '
-                'underscores, and hyphens'
-            )
-        return v.lower()  # Normalize to lowercase
-    
-    @validator('password')
-    def validate_password(cls, v):
-        """Validate password complexity."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+    password: Password
 
 
 class OrganizationUpdate(BaseModel):
     """Schema for updating an organization."""
-    organization_name: Optional[str] = Field(None, min_length=3, max_length=50, description="New organization name")
+    organization_name: Optional[OrganizationName] = Field(None, description="New organization name")
     email: Optional[EmailStr] = Field(None, description="New admin email")
-    password: Optional[str] = Field(None, min_length=8, description="New admin password")
-    
-    @validator('organization_name')
-    def validate_organization_name(cls, v):
-        """Validate organization name format."""
-        if v is not None:
-            if not re.match(r'^[a-zA-Z0-9_-]+$', v):
-                raise ValueError(
-                    'Organization name must contain only alphanumeric characters, '
-                    'underscores, and hyphens'
-                )
-            return v.lower()
-        return v
-    
-    @validator('password')
-    def validate_password(cls, v):
-        """Validate password complexity."""
-        if v is not None:
-            if len(v) < 8:
-                raise ValueError('Password must be at least 8 characters long')
-            if not any(c.isupper() for c in v):
-                raise ValueError('Password must contain at least one uppercase letter')
-            if not any(c.islower() for c in v):
-                raise ValueError('Password must contain at least one lowercase letter')
-            if not any(c.isdigit() for c in v):
-                raise ValueError('Password must contain at least one digit')
-        return v
+    password: Optional[Password] = Field(None, description="New admin password")
 
 
 class OrganizationGet(BaseModel):
@@ -75,6 +68,21 @@ class OrganizationGet(BaseModel):
     organization_name: str
 
 
+class OrganizationGetMany(BaseModel):
+    """Schema for retrieving several organizations at once."""
+    organization_names: List[str] = Field(default_factory=list, description="Organization names to look up")
+    organization_ids: List[str] = Field(default_factory=list, description="Organization ids to look up")
+    
+    @model_validator(mode='after')
+    def check_batch_size(self) -> 'OrganizationGetMany':
+        count = len(self.organization_names) + len(self.organization_ids)
+        if count == 0:
+            raise ValueError('Provide at least one organization name or id')
+        if count > settings.ORGANIZATION_BATCH_MAX:
+            raise ValueError(f'At most {settings.ORGANIZATION_BATCH_MAX} names and ids per request')
+        return self
+
+
 class OrganizationDelete(BaseModel):
     """Schema for deleting an organization."""
     organization_name: str
@@ -88,11 +96,19 @@ class OrganizationResponse(BaseModel):
     connection_details: Optional[str] = Field(None, description="Connection details for organization's dynamic database")
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+
+
+class OrganizationLookup(BaseModel):
+    """One result of a batch lookup; organization is null when not found."""
+    organization_name: Optional[str] = None
+    id: Optional[str] = None
+    found: bool
+    organization: Optional[OrganizationResponse] = None
+
+
+class OrganizationGetManyResponse(BaseModel):
+    """Schema for batch lookup results, in request order (names, then ids)."""
+    results: List[OrganizationLookup]
 
 
 class AdminLogin(BaseModel):
@@ -101,10 +117,16 @@ class AdminLogin(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token."""
+    refresh_token: str
+
+
 class TokenResponse(BaseModel):
     """Schema for JWT token response."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
     admin_id: str
     organization_id: str
     organization_name: str
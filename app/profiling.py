@@ -0,0 +1,222 @@
+"""
+On-demand request profiling.
+A sampling thread snapshots every thread's stack at a fixed interval while a
+profiled request runs, and writes the result as collapsed stacks (one
+``frame;frame;frame count`` line per unique stack), the input format of
+flamegraph.pl, speedscope and most flame graph viewers.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_SUFFIX = ".folded"
+_ARTIFACT_NAME = re.compile(r"^[A-Za-z0-9_.-]+\.folded$")
+
+# Signed into every header, so a trigger header never works as a read credential
+PURPOSE_TRIGGER = "profile-trigger"
+PURPOSE_READ = "profile-read"
+
+# Leaf frames of threads that are parked rather than working (idle thread
+# pool workers, the event loop waiting in select, queue listeners)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+
+def sign_profile_request(
+    expires: int,
+    secret: Optional[str] = None,
+    purpose: str = PURPOSE_TRIGGER
+) -> str:
+    """
+    Build a signed profiling header value valid until ``expires``.
+
+    Args:
+        expires: Unix timestamp after which the signature is rejected
+        secret: Signing secret (defaults to PROFILING_SECRET)
+        purpose: PURPOSE_TRIGGER for X-Debug-Profile, PURPOSE_READ for
+            X-Profile-Operator
+
+    Returns:
+        Header value ``<expires>.<hex hmac-sha256>``
+    """
+    key = (secret or settings.PROFILING_SECRET or "").encode("utf-8")
+    digest = hmac.new(key, f"{purpose}:{expires}".encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+
+def verify_profile_request(
+    value: str,
+    secret: Optional[str] = None,
+    purpose: str = PURPOSE_TRIGGER
+) -> bool:
+    """
+    Check a signed profiling header value.
+
+    Args:
+        value: Raw header value
+        secret: Signing secret (defaults to PROFILING_SECRET)
+        purpose: Purpose the value must have been signed for
+
+    Returns:
+        True if the signature is valid and not expired
+    """
+    secret = secret or settings.PROFILING_SECRET
+    if not secret:
+        return False
+    expires, _, _ = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(value, sign_profile_request(int(expires), secret, purpose))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for the duration of one request.
+
+    Samples all threads (minus idle ones), so work the request hands to the
+    thread pool - repositories, bcrypt - is captured along with the event
+    loop. Concurrent requests show up in the same profile.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = settings.PROFILING_INTERVAL_MS / 1000,
+        max_seconds: float = settings.PROFILING_MAX_SECONDS
+    ):
+        self.interval_seconds = interval_seconds
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_finish=None) -> None:
+        """
+        Start sampling in a daemon thread.
+
+        Args:
+            on_finish: Called from the sampling thread with this profiler once it stops
+        """
+        self._thread = threading.Thread(
+            target=self._run, args=(on_finish,), name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the sampling thread to stop; does not wait for it."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the sampling thread (and its on_finish callback) to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, on_finish) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            self.sample(sys._current_frames(), own_id, names)
+            self._stop.wait(self.interval_seconds)
+        if on_finish is not None:
+            try:
+                on_finish(self)
+            except Exception as e:
+                logger.error("Writing profile failed: %s", e)
+
+    def sample(self, frames: Dict[int, object], own_id: int, names: Dict[int, str]) -> None:
+        """Record one snapshot of thread stacks."""
+        self.samples += 1
+        for thread_id, frame in frames.items():
+            if thread_id == own_id:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Directory of collapsed-stack artifacts, pruned to the newest PROFILING_MAX_ARTIFACTS."""
+
+    def __init__(
+        self,
+        directory: str = settings.PROFILING_DIR,
+        max_artifacts: int = settings.PROFILING_MAX_ARTIFACTS
+    ):
+        self.directory = Path(directory)
+        self.max_artifacts = max_artifacts
+
+    def new_name(self, method: str, path: str, request_id: Optional[str]) -> str:
+        """Artifact name for a request: ``<epoch ms>_<METHOD>_<path>_<request id>.folded``."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+        suffix = re.sub(r"[^A-Za-z0-9]+", "", request_id or "")[:32]
+        return f"{int(time.time() * 1000)}_{method}_{slug}_{suffix}{ARTIFACT_SUFFIX}"
+
+    def save(self, name: str, profiler: SamplingProfiler) -> None:
+        """Write a profile and prune the oldest artifacts."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = f"# samples={profiler.samples} interval_ms={profiler.interval_seconds * 1000:g}\n"
+        (self.directory / name).write_text(header + profiler.collapsed(), encoding="utf-8")
+        artifacts = sorted(self.directory.glob(f"*{ARTIFACT_SUFFIX}"))
+        for old in artifacts[:max(len(artifacts) - self.max_artifacts, 0)]:
+            old.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, object]]:
+        """Stored artifacts, newest first."""
+        if not self.directory.is_dir():
+            return []
+        return [
+            {"name": path.name, "size": path.stat().st_size}
+            for path in sorted(self.directory.glob(f"*{ARTIFACT_SUFFIX}"), reverse=True)
+        ]
+
+    def read(self, name: str) -> Optional[str]:
+        """
+        Read one artifact.
+
+        Args:
+            name: Artifact file name as returned by list()
+
+        Returns:
+            Collapsed-stack text or None if the name is invalid or missing
+        """
+        if not _ARTIFACT_NAME.match(name):
+            return None
+        path = self.directory / name
+        if not path.is_file():
+            return None
+        return path.read_text(encoding="utf-8")
+
+
+# Singleton instance
+profile_store = ProfileStore()
@@ -7,10 +7,17 @@ from datetime import datetime
 from bson import ObjectId
 from pymongo.errors import DuplicateKeyError
 from app.db import DatabaseManager
+from app.single_flight import SingleFlight
+from app.membership import known_identities
+from app.security.principal import principal_cache
+from app.resilience import DATABASE_UNAVAILABLE
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared across repository instances so concurrent requests coalesce
+_lookups = SingleFlight()
+
 
 class AdminRepository:
     """Repository for admin user CRUD operations."""
@@ -44,23 +51,55 @@ class AdminRepository:
             
             result = self.collection.insert_one(admin_data)
             admin_data['_id'] = result.inserted_id
+            known_identities.add_email(admin_data['email'])
             
-            logger.info(f"Created admin user: {admin_data['email']}")
+            logger.info("Created admin user: %s", admin_data['email'])
             return self._serialize_document(admin_data)
         except DuplicateKeyError:
-            logger.error(f"Admin email already exists: {admin_data['email']}")
+            logger.error("Admin email already exists: %s", admin_data['email'])
             raise
     
     def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
         Find admin user by email.
         
+        A membership filter miss is trusted only while the filter is fresh
+        (see ``KnownIdentities.fresh``).
+        
         Args:
             email: Email address of the admin
             
         Returns:
             Admin document or None if not found
         """
+        if known_identities.rules_out_email(email):
+            return None
+        admin = _lookups.do(("email", email), self._find_by_email, email)
+        if admin is not None and not known_identities.might_have_email(email):
+            # Registered by another worker since the last filter sync
+            known_identities.add_email(email)
+        return admin
+    
+    def email_exists(self, email: str) -> bool:
+        """
+        Check if an email is registered, for uniqueness pre-checks.
+        
+        A membership filter miss is taken as final (it can be stale for
+        emails registered by other workers moments ago; the unique index on
+        email rejects those at insert).
+        
+        Args:
+            email: Email address to check
+            
+        Returns:
+            True if registered, False otherwise
+        """
+        if not known_identities.might_have_email(email):
+            return False
+        return self.find_by_email(email) is not None
+    
+    def _find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Query admin user by email (uncoalesced)."""
         doc = self.collection.find_one({"email": email})
         if doc:
             return self._serialize_document(doc)
@@ -80,8 +119,10 @@ class AdminRepository:
             doc = self.collection.find_one({"_id": ObjectId(admin_id)})
             if doc:
                 return self._serialize_document(doc)
+        except DATABASE_UNAVAILABLE:
+            raise
         except Exception as e:
-            logger.error(f"Error finding admin by ID: {str(e)}")
+            logger.error("Error finding admin by ID: %s", e)
         return None
     
     def find_by_organization(self, organization_id: str) -> Optional[Dict[str, Any]]:
@@ -115,6 +156,8 @@ class AdminRepository:
             Updated admin document or None if not found
         """
         update_data['updated_at'] = datetime.utcnow()
+        if 'email' in update_data:
+            known_identities.add_email(update_data['email'])
         
         try:
             result = self.collection.find_one_and_update(
@@ -123,13 +166,42 @@ class AdminRepository:
                 return_document=True
             )
             
+            principal_cache.invalidate_admin(admin_id)
             if result:
-                logger.info(f"Updated admin user: {admin_id}")
+                logger.info("Updated admin user: %s", admin_id)
                 return self._serialize_document(result)
+        except DATABASE_UNAVAILABLE:
+            raise
         except Exception as e:
-            logger.error(f"Error updating admin: {str(e)}")
+            logger.error("Error updating admin: %s", e)
         return None
     
+    def replace_password_hash(
+        self,
+        admin_id: str,
+        old_hash: str,
+        new_hash: str
+    ) -> bool:
+        """
+        Swap a password hash for an equivalent one with a different cost.
+        
+        Only applies if the stored hash is still ``old_hash`` so a concurrent
+        password change is never overwritten. Does not touch ``updated_at``.
+        
+        Args:
+            admin_id: Admin user's MongoDB ObjectId as string
+            old_hash: Hash the caller verified against
+            new_hash: Replacement hash
+            
+        Returns:
+            True if the hash was replaced
+        """
+        result = self.collection.update_one(
+            {"_id": ObjectId(admin_id), "password": old_hash},
+            {"$set": {"password": new_hash}}
+        )
+        return result.modified_count > 0
+    
     def delete_by_organization(self, organization_id: str) -> bool:
         """
         Delete admin user by organization ID.
@@ -141,9 +213,10 @@ class AdminRepository:
             True if deleted, False if not found
         """
         result = self.collection.delete_one({"organization_id": organization_id})
+        principal_cache.invalidate_organization(organization_id)
         
         if result.deleted_count > 0:
-            logger.info(f"Deleted admin user for organization: {organization_id}")
+            logger.info("Deleted admin user for organization: %s", organization_id)
             return True
         return False
     
@@ -0,0 +1,132 @@
+"""
+Repository layer for idempotency keys.
+Stores the fingerprint and final response of requests sent with an Idempotency-Key.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import uuid
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_IN_PROGRESS = "in_progress"
+STATE_COMPLETED = "completed"
+
+# A record can vanish between a failed insert and the read (released or purged)
+_CLAIM_ATTEMPTS = 3
+
+
+class IdempotencyRepository:
+    """Repository for idempotency records (purged by the TTL index on expires_at)."""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize repository with database manager.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+        self.collection = db_manager.idempotency_keys
+    
+    def claim(
+        self,
+        key: str,
+        fingerprint: str,
+        lock_seconds: float,
+        ttl: timedelta
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Reserve a key for a request that is about to run.
+        
+        An in-progress claim whose lock has expired (its worker died) is taken
+        over. Each claim gets its own token; ``complete`` and ``release`` only
+        touch the record while it still holds that token.
+        
+        Args:
+            key: Scoped idempotency key
+            fingerprint: Hash of the request
+            lock_seconds: How long the claim blocks other requests with the key
+            ttl: How long the record is kept
+            
+        Returns:
+            (claim token, None) if the claim succeeded, (None, existing record)
+            if another request holds or completed the key, (None, None) if the
+            key kept changing hands
+        """
+        for _ in range(_CLAIM_ATTEMPTS):
+            now = datetime.utcnow()
+            token = uuid.uuid4().hex
+            record = {
+                "_id": key,
+                "fingerprint": fingerprint,
+                "state": STATE_IN_PROGRESS,
+                "claim_token": token,
+                "locked_until": now + timedelta(seconds=lock_seconds),
+                "created_at": now,
+                "expires_at": now + ttl
+            }
+            try:
+                self.collection.insert_one(record)
+                return token, None
+            except DuplicateKeyError:
+                pass
+            taken_over = self.collection.find_one_and_update(
+                {"_id": key, "state": STATE_IN_PROGRESS, "locked_until": {"$lt": now}},
+                {"$set": {k: v for k, v in record.items() if k != "_id"}},
+                return_document=ReturnDocument.AFTER
+            )
+            if taken_over is not None:
+                return token, None
+            existing = self.collection.find_one({"_id": key})
+            if existing is not None:
+                return None, existing
+        return None, None
+    
+    def complete(
+        self,
+        key: str,
+        token: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes
+    ) -> bool:
+        """
+        Store the final response of a claimed key.
+        
+        Args:
+            key: Scoped idempotency key
+            token: Token returned by ``claim``
+            status_code: Response status
+            headers: Response headers as (name, value) pairs
+            body: Response body
+            
+        Returns:
+            False if the claim was taken over by another request meanwhile
+        """
+        result = self.collection.update_one(
+            {"_id": key, "state": STATE_IN_PROGRESS, "claim_token": token},
+            {"$set": {
+                "state": STATE_COMPLETED,
+                "status_code": status_code,
+                "headers": [list(header) for header in headers],
+                "body": body,
+                "completed_at": datetime.utcnow()
+            }}
+        )
+        return result.matched_count > 0
+    
+    def release(self, key: str, token: str) -> None:
+        """
+        Drop an in-progress claim so the request can be retried.
+        
+        A claim taken over by another request is left alone.
+        
+        Args:
+            key: Scoped idempotency key
+            token: Token returned by ``claim``
+        """
+        self.collection.delete_one({"_id": key, "state": STATE_IN_PROGRESS, "claim_token": token})
@@ -7,10 +7,26 @@ from datetime import datetime
 from bson import ObjectId
 from pymongo.errors import DuplicateKeyError
 from app.db import DatabaseManager
+from app.single_flight import SingleFlight
+from app.membership import known_identities
+from app.security.principal import principal_cache
+from app.resilience import DATABASE_UNAVAILABLE
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared across repository instances so concurrent requests coalesce
+_lookups = SingleFlight()
+
+# Fields returned by metadata reads (everything OrganizationResponse needs)
+_METADATA_PROJECTION = {
+    "organization_name": 1,
+    "email": 1,
+    "connection_details": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
 
 class OrganizationRepository:
     """Repository for organization CRUD operations."""
@@ -44,27 +60,38 @@ class OrganizationRepository:
             
             result = self.collection.insert_one(organization_data)
             organization_data['_id'] = result.inserted_id
+            known_identities.add_organization(organization_data['organization_name'])
             
-            logger.info(f"Created organization: {organization_data['organization_name']}")
+            logger.info("Created organization: %s", organization_data['organization_name'])
             return self._serialize_document(organization_data)
         except DuplicateKeyError:
-            logger.error(f"Organization already exists: {organization_data['organization_name']}")
+            logger.error("Organization already exists: %s", organization_data['organization_name'])
             raise
     
     def find_by_name(self, organization_name: str) -> Optional[Dict[str, Any]]:
         """
         Find organization by name.
         
+        A membership filter miss is trusted only while the filter is fresh
+        (see ``KnownIdentities.fresh``).
+        
         Args:
             organization_name: Name of the organization
             
         Returns:
             Organization document or None if not found
         """
-        doc = self.collection.find_one({"organization_name": organization_name})
-        if doc:
-            return self._serialize_document(doc)
-        return None
+        if known_identities.rules_out_organization(organization_name):
+            return None
+        org = _lookups.do(
+            ("organization_name", organization_name),
+            self._find_one,
+            {"organization_name": organization_name}
+        )
+        if org is not None and not known_identities.might_have_organization(organization_name):
+            # Created or renamed by another worker since the last filter sync
+            known_identities.add_organization(organization_name)
+        return org
     
     def find_by_id(self, organization_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -77,11 +104,72 @@ class OrganizationRepository:
             Organization document or None if not found
         """
         try:
-            doc = self.collection.find_one({"_id": ObjectId(organization_id)})
-            if doc:
-                return self._serialize_document(doc)
+            return _lookups.do(
+                ("id", organization_id),
+                self._find_one,
+                {"_id": ObjectId(organization_id)}
+            )
+        except DATABASE_UNAVAILABLE:
+            raise
         except Exception as e:
-            logger.error(f"Error finding organization by ID: {str(e)}")
+            logger.error("Error finding organization by ID: %s", e)
+        return None
+    
+    def find_many(
+        self,
+        organization_names: List[str],
+        ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Find several organizations by name and/or id in one query.
+        
+        Malformed ids and names a fresh membership filter rules out are not queried.
+        
+        Args:
+            organization_names: Organization names
+            ids: MongoDB ObjectIds as strings
+            
+        Returns:
+            Matching organization documents (metadata fields only), in no particular order
+        """
+        names = list({
+            name for name in organization_names
+            if not known_identities.rules_out_organization(name)
+        })
+        object_ids = list({
+            ObjectId(organization_id) for organization_id in ids
+            if ObjectId.is_valid(organization_id)
+        })
+        clauses = []
+        if names:
+            clauses.append({"organization_name": {"$in": names}})
+        if object_ids:
+            clauses.append({"_id": {"$in": object_ids}})
+        if not clauses:
+            return []
+        query = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+        docs = [
+            self._serialize_document(doc)
+            for doc in self.collection.find(query, _METADATA_PROJECTION)
+        ]
+        for doc in docs:
+            if not known_identities.might_have_organization(doc['organization_name']):
+                known_identities.add_organization(doc['organization_name'])
+        return docs
+    
+    def _find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run a single-document query and serialize the result.
+        
+        Args:
+            query: MongoDB filter
+            
+        Returns:
+            Organization document or None if not found
+        """
+        doc = self.collection.find_one(query)
+        if doc:
+            return self._serialize_document(doc)
         return None
     
     def update(
@@ -100,6 +188,8 @@ class OrganizationRepository:
             Updated organization document or None if not found
         """
         update_data['updated_at'] = datetime.utcnow()
+        if 'organization_name' in update_data:
+            known_identities.add_organization(update_data['organization_name'])
         
         result = self.collection.find_one_and_update(
             {"organization_name": organization_name},
@@ -108,7 +198,8 @@ class OrganizationRepository:
         )
         
         if result:
-            logger.info(f"Updated organization: {organization_name}")
+            principal_cache.invalidate_organization(str(result['_id']))
+            logger.info("Updated organization: %s", organization_name)
             return self._serialize_document(result)
         return None
     
@@ -125,13 +216,17 @@ class OrganizationRepository:
         result = self.collection.delete_one({"organization_name": organization_name})
         
         if result.deleted_count > 0:
-            logger.info(f"Deleted organization: {organization_name}")
+            logger.info("Deleted organization: %s", organization_name)
             return True
         return False
     
     def exists(self, organization_name: str) -> bool:
         """
-        Check if organization exists.
+        Check if organization exists, for uniqueness pre-checks.
+        
+        A membership filter miss is taken as final (it can be stale for names
+        taken by other workers moments ago; the unique index on
+        organization_name rejects those at write).
         
         Args:
             organization_name: Name to check
@@ -139,6 +234,8 @@ class OrganizationRepository:
         Returns:
             True if exists, False otherwise
         """
+        if not known_identities.might_have_organization(organization_name):
+            return False
         return self.collection.count_documents(
             {"organization_name": organization_name}
         ) > 0
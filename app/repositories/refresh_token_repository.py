@@ -0,0 +1,109 @@
+"""
+Repository layer for refresh token data access.
+Handles storage, rotation and revocation of hashed refresh tokens.
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pymongo import ReturnDocument
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenRepository:
+    """Repository for refresh token operations."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize repository with database manager.
+
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+        self.collection = db_manager.refresh_tokens
+
+    def create(
+        self,
+        token_hash: str,
+        admin_id: str,
+        organization_id: str,
+        family_id: str,
+        expires_at: datetime
+    ) -> None:
+        """
+        Store a new refresh token.
+
+        Args:
+            token_hash: SHA-256 hash of the opaque token
+            admin_id: Admin user the token belongs to
+            organization_id: Organization of the admin
+            family_id: Rotation chain the token belongs to
+            expires_at: Expiry time (documents are removed by the TTL index)
+        """
+        self.collection.insert_one({
+            "token_hash": token_hash,
+            "admin_id": admin_id,
+            "organization_id": organization_id,
+            "family_id": family_id,
+            "used_at": None,
+            "created_at": datetime.utcnow(),
+            "expires_at": expires_at
+        })
+
+    def consume(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically mark a token as used.
+
+        Args:
+            token_hash: SHA-256 hash of the presented token
+
+        Returns:
+            The token document as it was before consumption, or None if not found.
+            A non-null ``used_at`` on the returned document means the token was
+            already rotated and is being replayed.
+        """
+        return self.collection.find_one_and_update(
+            {"token_hash": token_hash, "expires_at": {"$gt": datetime.utcnow()}},
+            {"$set": {"used_at": datetime.utcnow()}},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    def revoke_family(self, family_id: str) -> int:
+        """
+        Revoke every token in a rotation chain.
+
+        Args:
+            family_id: Rotation chain identifier
+
+        Returns:
+            Number of tokens revoked
+        """
+        result = self.collection.delete_many({"family_id": family_id})
+        logger.warning("Revoked refresh token family: %s", family_id)
+        return result.deleted_count
+
+    def revoke_by_admin(self, admin_id: str) -> int:
+        """
+        Revoke all refresh tokens of an admin user.
+
+        Args:
+            admin_id: Admin user's MongoDB ObjectId as string
+
+        Returns:
+            Number of tokens revoked
+        """
+        return self.collection.delete_many({"admin_id": admin_id}).deleted_count
+
+    def revoke_by_organization(self, organization_id: str) -> int:
+        """
+        Revoke all refresh tokens of an organization.
+
+        Args:
+            organization_id: Organization's MongoDB ObjectId as string
+
+        Returns:
+            Number of tokens revoked
+        """
+        return self.collection.delete_many({"organization_id": organization_id}).deleted_count
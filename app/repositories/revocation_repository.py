@@ -0,0 +1,86 @@
+"""
+Repository layer for access token revocations.
+Stores revoked token ids and per-admin / per-organization revocation cutoffs.
+"""
+from typing import Any, Dict, Iterator
+from datetime import datetime
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+KIND_JTI = "jti"
+KIND_ADMIN = "admin"
+KIND_ORGANIZATION = "organization"
+
+
+class RevocationRepository:
+    """Repository for token revocation entries."""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize repository with database manager.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+        self.collection = db_manager.revoked_tokens
+    
+    def revoke_jti(self, jti: str, expires_at: datetime) -> None:
+        """
+        Revoke a single token.
+        
+        Args:
+            jti: Token id
+            expires_at: Token expiry; the entry is purged by the TTL index after it
+        """
+        self.collection.update_one(
+            {"kind": KIND_JTI, "value": jti},
+            {"$set": {"expires_at": expires_at}, "$currentDate": {"revoked_at": True}},
+            upsert=True
+        )
+    
+    def revoke_before(
+        self,
+        kind: str,
+        value: str,
+        cutoff: float,
+        expires_at: datetime
+    ) -> None:
+        """
+        Revoke every token of an admin or organization issued before a cutoff.
+        
+        Args:
+            kind: KIND_ADMIN or KIND_ORGANIZATION
+            value: Admin or organization id
+            cutoff: Unix timestamp; tokens with an earlier ``iat`` are revoked
+            expires_at: When every affected token has expired
+        """
+        self.collection.update_one(
+            {"kind": kind, "value": value},
+            {
+                "$max": {"cutoff": cutoff, "expires_at": expires_at},
+                "$currentDate": {"revoked_at": True}
+            },
+            upsert=True
+        )
+        logger.info("Revoked tokens for %s: %s", kind, value)
+    
+    def find_since(self, since: datetime) -> Iterator[Dict[str, Any]]:
+        """
+        Stream revocation entries written at or after a point in time.
+        
+        ``revoked_at`` is stamped by the database server, so every writer
+        shares one clock.
+        
+        Args:
+            since: Lower bound on ``revoked_at`` (server time)
+            
+        Returns:
+            Cursor over matching entries
+        """
+        return self.collection.find(
+            {"revoked_at": {"$gte": since}, "expires_at": {"$gt": datetime.utcnow()}},
+            {"_id": 0, "kind": 1, "value": 1, "cutoff": 1, "expires_at": 1, "revoked_at": 1}
+        )
@@ -0,0 +1,267 @@
+"""
+Database resilience: bounded retries with jittered backoff and a circuit breaker.
+Collections handed out by DatabaseManager route every operation through
+``db_resilience``, so a MongoDB outage turns into fast 503 responses with
+Retry-After instead of requests piling up behind server-selection timeouts.
+"""
+from typing import Any, Callable, Dict
+import math
+import random
+import threading
+import time
+from pymongo.errors import AutoReconnect, ConnectionFailure, ServerSelectionTimeoutError
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Operations that only read and are safe to repeat. Writes rely on pymongo's
+# own retryable writes (one retry, with server-side deduplication).
+RETRYABLE_METHODS = frozenset({
+    "find_one",
+    "count_documents",
+    "estimated_document_count",
+    "distinct",
+    "aggregate",
+    "index_information",
+    "list_indexes",
+})
+
+# Operations returning a lazy cursor: the query runs on the first fetch
+CURSOR_METHODS = frozenset({"find"})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DatabaseUnavailableError(Exception):
+    """Raised without contacting MongoDB while the circuit breaker is open."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Database unavailable, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+# Errors meaning MongoDB could not be reached; handlers must let these propagate
+DATABASE_UNAVAILABLE = (ConnectionFailure, DatabaseUnavailableError)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls pass; ``failure_threshold`` consecutive connection failures
+    open the circuit. Open: calls fail immediately for ``reset_seconds``.
+    Half-open: up to ``half_open_probes`` calls go through; a success closes
+    the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.DB_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = settings.DB_BREAKER_RESET_SECONDS,
+        half_open_probes: int = settings.DB_BREAKER_HALF_OPEN_PROBES
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> int:
+        """Whole seconds until the breaker lets a probe through (at least 1)."""
+        remaining = self._opened_at + self.reset_seconds - time.monotonic()
+        return max(math.ceil(remaining), 1)
+
+    def before_call(self) -> None:
+        """
+        Admit a call.
+
+        Raises:
+            DatabaseUnavailableError: If the circuit is open, or half-open
+                with all probe slots taken
+        """
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    raise DatabaseUnavailableError(self.retry_after())
+                self.state = HALF_OPEN
+                self._probes = 0
+                logger.info("Database circuit half-open, probing")
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    raise DatabaseUnavailableError(1)
+                self._probes += 1
+
+    def record_success(self) -> None:
+        """Record a call that reached the server."""
+        if self.state == CLOSED and not self.consecutive_failures:
+            return
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                logger.info("Database circuit closed")
+
+    def record_failure(self) -> None:
+        """Record a call that failed to reach the server."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(
+                        "Database circuit open for %ss after %s consecutive failures",
+                        self.reset_seconds, self.consecutive_failures
+                    )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State for the health endpoint."""
+        snapshot = {"state": self.state, "consecutive_failures": self.consecutive_failures}
+        if self.state == OPEN:
+            snapshot["retry_after"] = self.retry_after()
+        return snapshot
+
+
+class DatabaseResilience:
+    """Retry policy plus circuit breaker applied to every collection operation."""
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        attempts: int = settings.DB_RETRY_ATTEMPTS,
+        base_delay_seconds: float = settings.DB_RETRY_BASE_DELAY_MS / 1000,
+        max_delay_seconds: float = settings.DB_RETRY_MAX_DELAY_MS / 1000,
+        budget_seconds: float = settings.DB_RETRY_BUDGET_MS / 1000
+    ):
+        self.breaker = breaker
+        self.attempts = max(attempts, 1)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget_seconds = budget_seconds
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+    def call(self, fn: Callable[..., Any], *args: Any, retry: bool = False, **kwargs: Any) -> Any:
+        """
+        Run one database operation under the breaker.
+
+        Every connection failure counts towards opening the circuit, retried
+        or not. A server-selection timeout is never retried: it already waited
+        the full timeout, and repeating it would hold the caller for a
+        multiple of it. Retries stop once ``budget_seconds`` have passed
+        since the first attempt.
+
+        Args:
+            fn: Bound collection method
+            retry: Whether the operation is safe to repeat on AutoReconnect
+
+        Raises:
+            DatabaseUnavailableError: If the circuit is open
+            ConnectionFailure: If MongoDB stays unreachable after retries
+        """
+        self.breaker.before_call()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                result = fn(*args, **kwargs)
+            except ServerSelectionTimeoutError:
+                self.breaker.record_failure()
+                raise
+            except AutoReconnect:
+                self.breaker.record_failure()
+                if retry and attempt + 1 < self.attempts and self.breaker.state == CLOSED:
+                    delay = self.backoff(attempt)
+                    if time.monotonic() - started + delay < self.budget_seconds:
+                        time.sleep(delay)
+                        attempt += 1
+                        continue
+                raise
+            except ConnectionFailure:
+                self.breaker.record_failure()
+                raise
+            except Exception:
+                # The server answered (duplicate key, bad query, ...)
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+class ResilientCursor:
+    """
+    Cursor proxy whose fetches go through DatabaseResilience (without retries).
+
+    Creating a cursor does not contact MongoDB, so the breaker only hears
+    about a ``find`` once its first batch is fetched. Chained modifiers
+    (sort, limit, ...) return the proxy.
+    """
+
+    def __init__(self, cursor: Any, resilience: DatabaseResilience):
+        self._cursor = cursor
+        self._resilience = resilience
+
+    def __iter__(self) -> "ResilientCursor":
+        return self
+
+    def __next__(self) -> Any:
+        return self._resilience.call(next, self._cursor)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._cursor, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def chained(*args: Any, **kwargs: Any) -> Any:
+            result = attribute(*args, **kwargs)
+            return self if result is self._cursor else result
+
+        return chained
+
+
+class ResilientCollection:
+    """
+    Collection proxy routing method calls through DatabaseResilience.
+
+    Attributes (name, full_name, ...) pass through unchanged. Cursors returned
+    by ``find`` are wrapped in ResilientCursor, since their query only runs
+    when iterated.
+    """
+
+    def __init__(self, collection: Any, resilience: DatabaseResilience):
+        self._collection = collection
+        self._resilience = resilience
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._collection, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        retry = name in RETRYABLE_METHODS
+
+        if name in CURSOR_METHODS:
+            def guarded(*args: Any, **kwargs: Any) -> Any:
+                return ResilientCursor(attribute(*args, **kwargs), self._resilience)
+        else:
+            def guarded(*args: Any, **kwargs: Any) -> Any:
+                return self._resilience.call(attribute, *args, retry=retry, **kwargs)
+
+        # Later lookups of the same method skip __getattr__
+        self.__dict__[name] = guarded
+        return guarded
+
+    def __getitem__(self, name: str) -> "ResilientCollection":
+        return ResilientCollection(self._collection[name], self._resilience)
+
+
+# Singleton instance
+db_resilience = DatabaseResilience(CircuitBreaker())
@@ -0,0 +1,35 @@
+"""
+Response classes for fast JSON encoding.
+Serializes pydantic models through pydantic-core and everything else through orjson.
+"""
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import orjson
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips FastAPI's jsonable_encoder + stdlib json path.
+
+    Pydantic models are encoded straight to bytes by pydantic-core, so a
+    route returning ``FastJSONResponse(model)`` avoids the re-validation and
+    intermediate dict FastAPI builds for ``response_model``. Plain dicts and
+    lists (health checks, error bodies) are encoded with orjson.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encode response content to JSON bytes.
+
+        Args:
+            content: Pydantic model or JSON-compatible Python object
+
+        Returns:
+            Encoded JSON body
+        """
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
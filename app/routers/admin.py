@@ -1,22 +1,26 @@
 """
 API endpoints for admin authentication.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.models.schemas import AdminLogin, TokenResponse, ErrorResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from app.models.schemas import AdminLogin, RefreshRequest, TokenResponse, ErrorResponse
 from app.services.auth_service import AuthService
-from app.db import get_db, DatabaseManager
+from app.services.registry import get_auth_service
+from app.responses import FastJSONResponse
+from app.security.login_throttle import client_ip, login_admission
+from app.security.dependencies import get_current_admin, require_profiling_operator
+from app.security.revocation import revocation_list
+from app.profiling import profile_store
+from typing import Dict, Any
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
-def get_auth_service(db: DatabaseManager = Depends(get_db)) -> AuthService:
-    """Dependency to get auth service instance."""
-    return AuthService(db)
-
-
 @router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: AdminLogin,
+    request: Request,
     service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -24,12 +28,91 @@ async def login(
     
     - Validates credentials
     - Returns signed JWT containing admin_id + organization_id
+    - Returns an opaque refresh token for POST /admin/refresh
+    - Rate limited per email and per client IP (429), bounded concurrency (503)
     """
-    token = service.login(login_data)
+    # Off the event loop: with LOGIN_RATE_LIMIT_STORE=mongodb each bucket is a round trip
+    await run_in_threadpool(login_admission.check_rate, login_data.email, client_ip(request))
+    
+    # Lookup and bcrypt verify run off the event loop, a bounded number at a time
+    async with login_admission.verify_slot():
+        token = await run_in_threadpool(service.login, login_data)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return token
+    return FastJSONResponse(token)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    refresh_data: RefreshRequest,
+    service: AuthService = Depends(get_auth_service)
+):
+    """
+    Exchange a refresh token for a new access token.
+    
+    - Validates the refresh token with an indexed lookup (no bcrypt)
+    - Rotates the refresh token; the presented one becomes unusable
+    """
+    token = await run_in_threadpool(service.refresh, refresh_data.refresh_token)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return FastJSONResponse(token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(current_admin: Dict[str, Any] = Depends(get_current_admin)):
+    """
+    Revoke the presented access token.
+    
+    - Requires Authentication
+    - The token is rejected by every worker from now until it expires
+    """
+    if current_admin.get("jti") and current_admin.get("exp"):
+        await run_in_threadpool(
+            revocation_list.revoke_token,
+            current_admin["jti"],
+            current_admin["exp"]
+        )
+    return None
+
+
+@router.get("/profiles", dependencies=[Depends(require_profiling_operator)])
+async def list_profiles():
+    """
+    List stored request profiles, newest first.
+    
+    - Requires a signed X-Profile-Operator header (PROFILING_SECRET), not an admin token
+    - Profiles are recorded when PROFILING_ENABLED and a request carries a
+      signed X-Debug-Profile header or is sampled (PROFILING_SAMPLE_RATE)
+    """
+    profiles = await run_in_threadpool(profile_store.list)
+    return FastJSONResponse({"profiles": profiles})
+
+
+@router.get(
+    "/profiles/{name}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_profiling_operator)]
+)
+async def get_profile(name: str):
+    """
+    Download one request profile as collapsed stacks.
+    
+    - Requires a signed X-Profile-Operator header (PROFILING_SECRET), not an admin token
+    - Feed to flamegraph.pl or open in speedscope to render a flame graph
+    """
+    content = await run_in_threadpool(profile_store.read, name)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(content)
@@ -0,0 +1,24 @@
+"""
+Public key discovery endpoint for token verification by other services.
+"""
+from fastapi import APIRouter
+from app.config import settings
+from app.responses import FastJSONResponse
+from app.security.key_ring import key_ring
+
+router = APIRouter(tags=["Keys"])
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks():
+    """
+    JSON Web Key Set of the public keys that sign access tokens.
+    
+    - Includes the active key, the next scheduled key and retired keys
+      whose tokens may still be valid
+    - Cacheable; new keys are published well before they start signing
+    """
+    return FastJSONResponse(
+        key_ring.jwks(),
+        headers={"Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"}
+    )
@@ -0,0 +1,18 @@
+"""
+Metrics endpoint for Prometheus-compatible scrapers.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.metrics import metrics
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Metrics of this worker in the Prometheus text exposition format.
+
+    - Event loop lag and stalls
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
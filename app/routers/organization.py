@@ -1,26 +1,33 @@
 """
 API endpoints for organization management.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
 from app.models.schemas import (
     OrganizationCreate, 
     OrganizationUpdate, 
     OrganizationResponse,
-    OrganizationDelete
+    OrganizationDelete,
+    OrganizationGetMany,
+    OrganizationGetManyResponse
 )
 from app.services.organization_service import OrganizationService
-from app.db import get_db, DatabaseManager
-from app.security.dependencies import get_current_admin
-from typing import Dict, Any
+from app.services.registry import get_organization_service
+from app.responses import FastJSONResponse
+from app.http_cache import (
+    organization_stamps,
+    make_etag,
+    etag_matches,
+    cache_headers,
+    not_modified
+)
+from app.security.dependencies import get_current_principal
+from app.fair_share import tenant_scheduler
+from typing import Dict, Any, Optional
 
 router = APIRouter(prefix="/org", tags=["Organization"])
 
 
-def get_organization_service(db: DatabaseManager = Depends(get_db)) -> OrganizationService:
-    """Dependency to get organization service instance."""
-    return OrganizationService(db)
-
-
 @router.post("/create", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
 async def create_organization(
     org_data: OrganizationCreate,
@@ -34,27 +41,76 @@ async def create_organization(
     - Creates admin user
     - Returns organization details
     """
-    return service.create_organization(org_data)
+    # Off the event loop: during a MongoDB outage the checks below can block
+    # for up to the server-selection timeout
+    created = await run_in_threadpool(service.create_organization, org_data)
+    return FastJSONResponse(created, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/get", response_model=OrganizationResponse)
+@router.get(
+    "/get",
+    response_model=OrganizationResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}}
+)
 async def get_organization(
     organization_name: str,
+    if_none_match: Optional[str] = Header(None),
     service: OrganizationService = Depends(get_organization_service)
 ):
     """
     Get organization details by name.
     
     - Input: organization_name (query parameter)
-    - Returns: Organization metadata
+    - Returns: Organization metadata with ETag/Last-Modified validators
+    - Returns 304 when If-None-Match matches the current ETag
+    """
+    # Answer revalidation from the cached version stamp without a database read
+    if if_none_match:
+        cached_etag = organization_stamps.get(organization_name)
+        if cached_etag and etag_matches(if_none_match, cached_etag):
+            return not_modified(cached_etag)
+    
+    # Run off the event loop so concurrent reads overlap and coalesce
+    org = await run_in_threadpool(service.get_organization, organization_name)
+    last_modified = org.updated_at or org.created_at
+    etag = make_etag(org.id, last_modified)
+    organization_stamps.set(organization_name, etag)
+    
+    if if_none_match and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return FastJSONResponse(org, headers=cache_headers(etag, last_modified))
+
+
+@router.post("/get-many", response_model=OrganizationGetManyResponse)
+async def get_organizations(
+    lookup: OrganizationGetMany,
+    service: OrganizationService = Depends(get_organization_service)
+):
     """
-    return service.get_organization(organization_name)
+    Get several organizations by name and/or id in one request.
+    
+    - Input: organization_names and/or organization_ids (up to ORGANIZATION_BATCH_MAX in total)
+    - Served by a single database query
+    - Returns one result per requested name, then per requested id, in request order,
+      each with found=false and organization=null when it does not exist
+    """
+    results = await run_in_threadpool(
+        service.get_organizations,
+        lookup.organization_names,
+        lookup.organization_ids
+    )
+    # Prime the version stamps so follow-up conditional GETs can answer 304
+    for result in results:
+        if result.organization_name and result.organization:
+            org = result.organization
+            organization_stamps.set(org.organization_name, make_etag(org.id, org.updated_at or org.created_at))
+    return FastJSONResponse(OrganizationGetManyResponse(results=results))
 
 
 @router.put("/update", response_model=OrganizationResponse)
 async def update_organization(
     update_data: OrganizationUpdate,
-    current_admin: Dict[str, Any] = Depends(get_current_admin),
+    current_admin: Dict[str, Any] = Depends(get_current_principal),
     service: OrganizationService = Depends(get_organization_service)
 ):
     """
@@ -63,12 +119,14 @@ async def update_organization(
     - Requires Authentication
     - Validates new name uniqueness
     - Handles collection migration if name changes
+    - Bounded per organization; excess requests queue fairly or get 429
     """
     # The admin can only update their own organization
     # We use the organization name from the token or the current name passed in body?
     # The requirement says "Inputs: new organization_name, new email, new password"
     # It implies we are updating the organization the admin belongs to.
-    # We should use the organization_name from the token to identify WHICH org to update.
+    # We use the admin's current organization_name (resolved from the principal, so it
+    # survives renames after the token was issued) to identify WHICH org to update.
     
     current_org_name = current_admin.get("organization_name")
     admin_id = current_admin.get("admin_id")
@@ -80,20 +138,26 @@ async def update_organization(
             detail="Invalid authentication token"
         )
     
-    return service.update_organization(current_org_name, update_data, admin_id)
+    # Runs off the event loop in one of the organization's fair-share slots
+    async with tenant_scheduler.slot(current_admin["organization_id"]):
+        updated = await run_in_threadpool(
+            service.update_organization, current_org_name, update_data, admin_id
+        )
+    return FastJSONResponse(updated)
 
 
 @router.delete("/delete", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_organization(
-    current_admin: Dict[str, Any] = Depends(get_current_admin),
+    current_admin: Dict[str, Any] = Depends(get_current_principal),
     service: OrganizationService = Depends(get_organization_service)
 ):
     """
     Delete the authenticated admin's organization.
     
     - Requires Authentication
-    - Automatically deletes the organization associated with the JWT token
+    - Automatically deletes the organization of the authenticated admin
     - Only authenticated admin can delete their own organization
+    - Bounded per organization; excess requests queue fairly or get 429
     """
     organization_name = current_admin.get("organization_name")
     org_id = current_admin.get("organization_id")
@@ -105,5 +169,6 @@ async def delete_organization(
             detail="Invalid authentication token"
         )
     
-    service.delete_organization(organization_name, org_id)
+    async with tenant_scheduler.slot(org_id):
+        await run_in_threadpool(service.delete_organization, organization_name, org_id)
     return None
@@ -1,10 +1,17 @@
 """
 Authentication dependencies for FastAPI routes.
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.services.organization_service import OrganizationService
+from app.services.registry import get_organization_service
 from app.security.jwt_handler import jwt_handler
+from app.security.revocation import revocation_list
+from app.security.principal import principal_cache
+from app.structured_logging import tenant_var
+from app.profiling import PURPOSE_READ, verify_profile_request
 
 security = HTTPBearer(auto_error=False)
 
@@ -19,10 +26,10 @@ async def get_current_admin(
         credentials: HTTP Bearer token credentials
         
     Returns:
-        Decoded token payload containing admin_id and organization_id
+        Decoded token payload containing admin_id, organization_id and jti
         
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid, expired or revoked
     """
     if credentials is None:
         raise HTTPException(
@@ -41,6 +48,13 @@ async def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if revocation_list.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     # Extract required fields
     admin_id = payload.get("admin_id")
     organization_id = payload.get("organization_id")
@@ -52,8 +66,105 @@ async def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    tenant_var.set(organization_id)
     return {
         "admin_id": admin_id,
         "organization_id": organization_id,
-        "organization_name": payload.get("organization_name", "")
+        "organization_name": payload.get("organization_name", ""),
+        "jti": payload.get("jti"),
+        "exp": payload.get("exp")
+    }
+
+
+def _load_principal(service: OrganizationService, admin_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load an admin and its organization from the master database.
+    
+    Args:
+        service: Organization service whose repositories are used
+        admin_id: Admin user's id
+        
+    Returns:
+        Principal or None if the admin or organization no longer exists
+    """
+    admin = service.admin_repo.find_by_id(admin_id)
+    if not admin:
+        return None
+    organization = service.org_repo.find_by_id(admin['organization_id'])
+    if not organization:
+        return None
+    admin.pop('password', None)
+    return {
+        "admin_id": admin['id'],
+        "organization_id": organization['id'],
+        "organization_name": organization['organization_name'],
+        "admin": admin,
+        "organization": organization
     }
+
+
+async def get_current_principal(
+    current_admin: Dict[str, Any] = Depends(get_current_admin),
+    service: OrganizationService = Depends(get_organization_service)
+) -> Dict[str, Any]:
+    """
+    Dependency resolving the authenticated admin's current state.
+    
+    Unlike get_current_admin, organization_name reflects renames made after
+    the token was issued. Served from the principal cache on the hot path.
+    
+    Args:
+        current_admin: Verified token claims
+        service: Organization service instance
+        
+    Returns:
+        Principal with admin_id, organization_id, organization_name, the admin
+        document (without password hash), the organization document and the
+        token's jti/exp
+        
+    Raises:
+        HTTPException: If the admin or organization no longer exists
+    """
+    admin_id = current_admin["admin_id"]
+    principal = principal_cache.get(admin_id)
+    if principal is None:
+        generation = principal_cache.generation
+        principal = await run_in_threadpool(_load_principal, service, admin_id)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Admin account no longer exists",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal_cache.set(admin_id, principal, generation)
+    
+    if principal["organization_id"] != current_admin["organization_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return {**principal, "jti": current_admin.get("jti"), "exp": current_admin.get("exp")}
+
+
+async def require_profiling_operator(
+    x_profile_operator: Optional[str] = Header(None)
+) -> None:
+    """
+    Dependency restricting profile downloads to operators.
+    
+    Profiles sample every thread, so they contain other tenants' concurrent
+    requests; a tenant admin's token is not enough. Operators send
+    ``X-Profile-Operator: <expires>.<hmac>`` signed with PROFILING_SECRET
+    for PURPOSE_READ (see app.profiling.sign_profile_request); an
+    X-Debug-Profile trigger value is not accepted.
+    
+    Raises:
+        HTTPException: 403 if the header is missing, expired or wrongly signed
+    """
+    if x_profile_operator is None or not verify_profile_request(x_profile_operator, purpose=PURPOSE_READ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator credential required",
+        )
@@ -3,8 +3,11 @@ JWT token generation and validation utilities.
 """
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import time
+import uuid
 from jose import JWTError, jwt
 from app.config import settings
+from app.security.key_ring import key_ring
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,18 +40,31 @@ class JWTHandler:
                 minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
             )
         
+        # Sub-second iat so revocation cutoffs never catch a token issued right after them
         to_encode.update({
             "exp": expire,
-            "iat": datetime.utcnow()
+            "iat": time.time(),
+            "jti": uuid.uuid4().hex
         })
         
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.JWT_SECRET_KEY,
-            algorithm=settings.JWT_ALGORITHM
-        )
+        if JWTHandler.is_symmetric():
+            encoded_jwt = jwt.encode(
+                to_encode,
+                settings.JWT_SECRET_KEY,
+                algorithm=settings.JWT_ALGORITHM
+            )
+        else:
+            signing_key = key_ring.signing_key()
+            if signing_key is None:
+                raise RuntimeError("No JWT signing key loaded. Call key_ring.load() first.")
+            encoded_jwt = jwt.encode(
+                to_encode,
+                signing_key.private_key,
+                algorithm=settings.JWT_ALGORITHM,
+                headers={"kid": signing_key.kid}
+            )
         
-        logger.info(f"Created JWT token for data: {data.get('sub', 'unknown')}")
+        logger.debug("Created JWT token for data: %s", data.get('sub', 'unknown'))
         return encoded_jwt
     
     @staticmethod
@@ -63,16 +79,30 @@ class JWTHandler:
             Decoded token payload if valid, None otherwise
         """
         try:
+            if JWTHandler.is_symmetric():
+                key = settings.JWT_SECRET_KEY
+            else:
+                kid = jwt.get_unverified_header(token).get("kid")
+                signing_key = key_ring.verification_key(kid) if kid else None
+                if signing_key is None:
+                    logger.warning("JWT verification failed: Unknown key id %s", kid)
+                    return None
+                key = signing_key.public_key
             payload = jwt.decode(
                 token,
-                settings.JWT_SECRET_KEY,
+                key,
                 algorithms=[settings.JWT_ALGORITHM]
             )
             return payload
         except JWTError as e:
-            logger.error(f"JWT verification failed: {str(e)}")
+            logger.warning("JWT verification failed: %s", e)
             return None
     
+    @staticmethod
+    def is_symmetric() -> bool:
+        """True when tokens are signed with the shared secret (HS*)."""
+        return settings.JWT_ALGORITHM.startswith("HS")
+    
     @staticmethod
     def decode_token(token: str) -> Dict[str, Any]:
         """
@@ -92,7 +122,7 @@ class JWTHandler:
                 options={"verify_signature": False}
             )
         except JWTError as e:
-            logger.error(f"JWT decoding failed: {str(e)}")
+            logger.warning("JWT decoding failed: %s", e)
             return {}
 
 
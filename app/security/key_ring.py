@@ -0,0 +1,219 @@
+"""
+Asymmetric JWT signing keys with scheduled rotation.
+Keys live in the master database so every worker signs and verifies with the same set.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+import time
+import uuid
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.concurrency import run_in_threadpool
+from jose import jwk
+from jose.backends.base import Key
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SigningKey:
+    """A loaded signing key and its schedule."""
+    
+    def __init__(self, doc: Dict[str, Any]):
+        self.kid: str = doc["kid"]
+        self.generation: int = doc["generation"]
+        self.activate_at: datetime = doc["activate_at"]
+        self.retire_at: datetime = doc["retire_at"]
+        self.expires_at: datetime = doc["expires_at"]
+        private_key = serialization.load_pem_private_key(
+            doc["private_key"].encode("utf-8"),
+            password=settings.JWT_SECRET_KEY.encode("utf-8")
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        # Parsed once; jose reuses Key objects without re-reading PEM per token
+        self.private_key: Key = jwk.construct(
+            private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()
+            ),
+            settings.JWT_ALGORITHM
+        )
+        self.public_key: Key = jwk.construct(public_pem, settings.JWT_ALGORITHM)
+        self.public_jwk: Dict[str, Any] = {
+            **self.public_key.to_dict(),
+            "kid": self.kid,
+            "use": "sig",
+        }
+
+
+class KeyRing:
+    """
+    Set of RSA signing keys shared through the ``jwt_keys`` master collection.
+    
+    Exactly one key signs at a time: the newest whose ``activate_at`` has
+    passed. The next key is created JWT_KEY_PREPUBLISH_HOURS before the
+    current one retires, so it appears in the JWKS before anything is signed
+    with it. Retired keys stay published until tokens they signed have expired,
+    then the TTL index removes them. Private keys are stored PKCS#8-encrypted
+    with JWT_SECRET_KEY.
+    """
+    
+    def __init__(self):
+        self._keys: Dict[str, SigningKey] = {}
+        self._lock = threading.Lock()
+        self._db_manager: Optional[DatabaseManager] = None
+        self._last_load = 0.0
+    
+    def load(self, db_manager: DatabaseManager) -> None:
+        """
+        Load the key set, creating or scheduling keys as needed.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self._db_manager = db_manager
+        self._reload()
+        self.rotate()
+    
+    def _reload(self) -> None:
+        """Replace the in-memory key set with the non-expired keys in the database."""
+        now = datetime.utcnow()
+        docs = self._db_manager.jwt_keys.find(
+            {"expires_at": {"$gt": now}}
+        ).sort("generation", DESCENDING)
+        keys = {}
+        for doc in docs:
+            existing = self._keys.get(doc["kid"])
+            if existing:
+                keys[doc["kid"]] = existing
+                continue
+            try:
+                keys[doc["kid"]] = SigningKey(doc)
+            except (ValueError, TypeError) as e:
+                # Typically a key encrypted under a previous JWT_SECRET_KEY
+                logger.error("Skipping unreadable JWT signing key %s: %s", doc['kid'], e)
+        with self._lock:
+            self._keys = keys
+            self._last_load = time.monotonic()
+    
+    def refresh(self) -> None:
+        """Pick up keys created by other workers and rotate if due."""
+        if self._db_manager is None:
+            return
+        self._reload()
+        self.rotate()
+    
+    def rotate(self) -> None:
+        """Create the bootstrap key or schedule the next one when rotation is due."""
+        now = datetime.utcnow()
+        current = self.signing_key(now)
+        if current is None:
+            self._create_key(generation=self._latest_generation() + 1, activate_at=now)
+            return
+        
+        pending = [k for k in self._keys.values() if k.generation > current.generation]
+        prepublish = timedelta(hours=settings.JWT_KEY_PREPUBLISH_HOURS)
+        if not pending and current.retire_at - prepublish <= now:
+            self._create_key(
+                generation=current.generation + 1,
+                activate_at=max(current.retire_at, now)
+            )
+    
+    def _latest_generation(self) -> int:
+        doc = self._db_manager.jwt_keys.find_one(sort=[("generation", DESCENDING)])
+        return doc["generation"] if doc else 0
+    
+    def _create_key(self, generation: int, activate_at: datetime) -> None:
+        """
+        Generate and store a new key; another worker winning the race is fine.
+        
+        Args:
+            generation: Sequence number (unique across workers)
+            activate_at: When the key starts signing
+        """
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=settings.JWT_KEY_SIZE
+        )
+        retire_at = activate_at + timedelta(days=settings.JWT_KEY_ROTATION_DAYS)
+        token_lifetime = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+        try:
+            self._db_manager.jwt_keys.insert_one({
+                "kid": uuid.uuid4().hex,
+                "generation": generation,
+                "private_key": private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.BestAvailableEncryption(settings.JWT_SECRET_KEY.encode("utf-8"))
+                ).decode("utf-8"),
+                "created_at": datetime.utcnow(),
+                "activate_at": activate_at,
+                "retire_at": retire_at,
+                "expires_at": retire_at + token_lifetime
+            })
+            logger.info("Created JWT signing key generation %s", generation)
+        except DuplicateKeyError:
+            logger.info("JWT signing key generation %s created by another worker", generation)
+        self._reload()
+    
+    def signing_key(self, now: Optional[datetime] = None) -> Optional[SigningKey]:
+        """
+        Get the key that signs new tokens.
+        
+        Args:
+            now: Point in time (defaults to current UTC time)
+            
+        Returns:
+            Newest activated key, or None if there is none
+        """
+        now = now or datetime.utcnow()
+        active = [k for k in self._keys.values() if k.activate_at <= now < k.expires_at]
+        return max(active, key=lambda k: k.generation, default=None)
+    
+    def verification_key(self, kid: str) -> Optional[SigningKey]:
+        """
+        Get a key by id for verification.
+        
+        Unknown ids trigger at most one database reload per
+        JWT_KEY_RELOAD_SECONDS, which picks up keys created by other workers.
+        
+        Args:
+            kid: Key id from the token header
+            
+        Returns:
+            Matching key or None
+        """
+        key = self._keys.get(kid)
+        if key is None and self._db_manager is not None:
+            if time.monotonic() - self._last_load >= settings.JWT_KEY_RELOAD_SECONDS:
+                self._reload()
+                key = self._keys.get(kid)
+        return key
+    
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Public keys of every non-expired key as a JWK Set."""
+        return {"keys": [k.public_jwk for k in self._keys.values()]}
+
+
+async def run_rotation_loop() -> None:
+    """Periodically refresh and rotate the key ring until cancelled."""
+    while True:
+        await asyncio.sleep(settings.JWT_KEY_RELOAD_SECONDS)
+        try:
+            await run_in_threadpool(key_ring.refresh)
+        except Exception as e:
+            logger.error("JWT key rotation failed: %s", e)
+
+
+# Singleton instance
+key_ring = KeyRing()
@@ -0,0 +1,270 @@
+"""
+Admission control for admin login.
+Bounds concurrent bcrypt verifies and rate-limits attempts per email and per client IP.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import math
+import os
+import threading
+import time
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from app.config import settings
+from app.db import DatabaseManager, db_manager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRateLimitStore:
+    """Token buckets held in process memory."""
+    
+    SWEEP_INTERVAL = 1024
+    
+    def __init__(self):
+        # key -> (tokens, updated, full_at); full_at is when the bucket is full again
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._ops = 0
+    
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from a bucket.
+        
+        Args:
+            key: Bucket identifier (e.g. "email:admin@acme.com")
+            capacity: Maximum burst size
+            refill_per_second: Token refill rate
+            
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+            
+            self._ops += 1
+            if self._ops % self.SWEEP_INTERVAL == 0:
+                self._sweep(now)
+        return retry_after
+    
+    def _sweep(self, now: float) -> None:
+        """Drop buckets that have refilled completely (equivalent to absent)."""
+        stale = [k for k, (_, _, full_at) in self._buckets.items() if now >= full_at]
+        for key in stale:
+            del self._buckets[key]
+    
+    def reset(self) -> None:
+        """Drop all buckets."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class MongoRateLimitStore:
+    """
+    Token buckets shared across workers in the master database.
+    
+    Each attempt is a single atomic pipeline update; idle buckets are purged
+    by the TTL index on ``expires_at``.
+    """
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+    
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from a bucket.
+        
+        Args:
+            key: Bucket identifier
+            capacity: Maximum burst size
+            refill_per_second: Token refill rate
+            
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.time()
+        expires_at = datetime.utcnow() + timedelta(seconds=capacity / refill_per_second)
+        refilled = {"$min": [
+            capacity,
+            {"$add": [
+                {"$ifNull": ["$tokens", capacity]},
+                {"$multiply": [
+                    {"$subtract": [now, {"$ifNull": ["$updated", now]}]},
+                    refill_per_second
+                ]}
+            ]}
+        ]}
+        doc = self.db_manager.login_rate_limits.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated": now, "expires_at": expires_at}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [
+                        {"$gte": ["$tokens", 1]},
+                        {"$subtract": ["$tokens", 1]},
+                        "$tokens"
+                    ]}
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc["allowed"]:
+            return 0.0
+        return (1 - doc["tokens"]) / refill_per_second
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Address the per-IP login bucket is keyed on.
+    
+    With LOGIN_CLIENT_IP_HEADER set, the entry LOGIN_TRUSTED_PROXY_HOPS from
+    the right of that header (the address the outermost trusted proxy saw);
+    entries further left are client-supplied and could be forged. Otherwise
+    the socket peer address.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Client address, or None if unknown
+    """
+    if settings.LOGIN_CLIENT_IP_HEADER:
+        forwarded = [
+            part.strip()
+            for part in request.headers.get(settings.LOGIN_CLIENT_IP_HEADER, "").split(",")
+            if part.strip()
+        ]
+        if len(forwarded) >= settings.LOGIN_TRUSTED_PROXY_HOPS:
+            return forwarded[-settings.LOGIN_TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else None
+
+
+class LoginAdmission:
+    """
+    Admission layer in front of AuthService.login.
+    
+    Rate limits reject with 429 before any database or bcrypt work. Verifies
+    that pass are capped at ``max_concurrent`` in flight; up to ``max_queue``
+    further attempts wait for a slot and anything beyond is rejected with 503
+    immediately, so a credential-stuffing burst cannot pin every CPU.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = settings.LOGIN_MAX_CONCURRENT_VERIFIES,
+        max_queue: int = settings.LOGIN_MAX_QUEUE,
+        queue_timeout: float = settings.LOGIN_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._store = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._admitted = 0
+        self.rejected_rate_limited = 0
+        self.rejected_overloaded = 0
+    
+    @property
+    def store(self):
+        """Rate limit store selected by LOGIN_RATE_LIMIT_STORE."""
+        if self._store is None:
+            if settings.LOGIN_RATE_LIMIT_STORE == "mongodb":
+                self._store = MongoRateLimitStore(db_manager)
+            else:
+                self._store = InMemoryRateLimitStore()
+        return self._store
+    
+    def check_rate(self, email: str, client_ip: Optional[str]) -> None:
+        """
+        Apply per-email and per-IP token buckets.
+        
+        Args:
+            email: Email the attempt is for
+            client_ip: Address of the client, if known
+            
+        Raises:
+            HTTPException: 429 with Retry-After if either bucket is empty
+        """
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return
+        
+        retry_after = self.store.consume(
+            f"email:{email.lower()}",
+            settings.LOGIN_EMAIL_BURST,
+            settings.LOGIN_EMAIL_PER_MINUTE / 60
+        )
+        if client_ip:
+            retry_after = max(retry_after, self.store.consume(
+                f"ip:{client_ip}",
+                settings.LOGIN_IP_BURST,
+                settings.LOGIN_IP_PER_MINUTE / 60
+            ))
+        
+        if retry_after > 0:
+            self.rejected_rate_limited += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the verify semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            self._admitted = 0
+        return self._semaphore
+    
+    @asynccontextmanager
+    async def verify_slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the bounded verify slots.
+        
+        Raises:
+            HTTPException: 503 if the wait queue is full or no slot frees up in time
+        """
+        semaphore = self._get_semaphore()
+        # Admitted = holding a slot or waiting for one
+        if self._admitted >= self.max_concurrent + self.max_queue:
+            self._reject_overloaded()
+        
+        self._admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject_overloaded()
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            self._admitted -= 1
+    
+    def _reject_overloaded(self) -> None:
+        self.rejected_overloaded += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login service is busy, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+# Singleton instance
+login_admission = LoginAdmission()
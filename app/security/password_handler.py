@@ -1,8 +1,12 @@
 """
 Password hashing utilities using bcrypt.
 """
+from datetime import datetime
+import time
 import bcrypt
+from pymongo import ReturnDocument
 from app.config import settings
+from app.db import DatabaseManager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,8 +15,10 @@ logger = logging.getLogger(__name__)
 class PasswordHandler:
     """Handler for password hashing and verification using bcrypt."""
     
-    @staticmethod
-    def hash_password(password: str) -> str:
+    def __init__(self, rounds: int = settings.BCRYPT_ROUNDS):
+        self.rounds = rounds
+    
+    def hash_password(self, password: str) -> str:
         """
         Hash a password using bcrypt.
         
@@ -23,7 +29,7 @@ class PasswordHandler:
             Hashed password as a string
         """
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        salt = bcrypt.gensalt(rounds=self.rounds)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
     
@@ -44,8 +50,92 @@ class PasswordHandler:
             hashed_bytes = hashed_password.encode('utf-8')
             return bcrypt.checkpw(password_bytes, hashed_bytes)
         except Exception as e:
-            logger.error(f"Password verification failed: {str(e)}")
+            logger.error("Password verification failed: %s", e)
             return False
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash uses a lower cost than the configured one.
+        
+        Hashes at a higher cost are left alone, so pods that briefly disagree
+        on the cost (a rollout, a recalibration) do not rewrite each other's hashes.
+        
+        Args:
+            hashed_password: Stored bcrypt hash ("$2b$<cost>$...")
+            
+        Returns:
+            True if the hash should be replaced after a successful login
+        """
+        try:
+            return int(hashed_password.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return False
+    
+    def calibrate(
+        self,
+        target_ms: float = settings.BCRYPT_TARGET_MS,
+        min_rounds: int = settings.BCRYPT_MIN_ROUNDS,
+        max_rounds: int = settings.BCRYPT_MAX_ROUNDS
+    ) -> int:
+        """
+        Find the highest bcrypt cost whose hash time fits the target on this host.
+        
+        Times a hash at ``min_rounds`` (best of three) and extrapolates, since
+        each extra round doubles the work. Does not change the cost in use;
+        see ``adopt_fleet_cost``.
+        
+        Args:
+            target_ms: Target time for a single hash in milliseconds
+            min_rounds: Lowest cost ever selected
+            max_rounds: Highest cost ever selected
+            
+        Returns:
+            Recommended number of rounds
+        """
+        salt = bcrypt.gensalt(rounds=min_rounds)
+        samples = []
+        for _ in range(3):
+            start = time.perf_counter()
+            bcrypt.hashpw(b"calibration-password", salt)
+            samples.append((time.perf_counter() - start) * 1000)
+        base_ms = min(samples)
+        
+        rounds = min_rounds
+        while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+        
+        logger.info(
+            "bcrypt cost %s fits the target on this host (~%.0f ms, target %.0f ms)",
+            rounds, base_ms * 2 ** (rounds - min_rounds), target_ms
+        )
+        return rounds
+    
+    def adopt_fleet_cost(self, db_manager: DatabaseManager) -> int:
+        """
+        Use the fleet-wide bcrypt cost, calibrating it if none is stored yet.
+        
+        The first worker to start calibrates on its host and stores the result
+        in the master ``app_settings`` collection; every worker then uses that
+        one cost, so logins never flip hashes between pods. Delete the
+        ``bcrypt_rounds`` document to recalibrate (e.g. after a hardware change).
+        
+        Args:
+            db_manager: Database manager instance
+            
+        Returns:
+            Number of rounds now in use
+        """
+        stored = db_manager.app_settings.find_one({"_id": "bcrypt_rounds"})
+        if stored is None:
+            stored = db_manager.app_settings.find_one_and_update(
+                {"_id": "bcrypt_rounds"},
+                {"$setOnInsert": {"rounds": self.calibrate(), "calibrated_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        self.rounds = stored["rounds"]
+        logger.info("Using fleet-wide bcrypt cost of %s rounds", self.rounds)
+        return self.rounds
 
 
 # Singleton instance
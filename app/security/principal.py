@@ -0,0 +1,107 @@
+"""
+Cache of resolved admin principals (admin + organization documents).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+import threading
+import time
+from app.config import settings
+
+
+class PrincipalCache:
+    """
+    LRU + TTL cache of principals keyed by admin_id.
+    
+    Entries are dropped as soon as this process writes the admin or its
+    organization (the repositories call ``invalidate_admin`` /
+    ``invalidate_organization``); the TTL bounds staleness for writes made
+    by other workers.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = settings.PRINCIPAL_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._by_organization: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so loads that raced a write are not cached
+        self.generation = 0
+    
+    def get(self, admin_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached principal.
+        
+        Args:
+            admin_id: Admin user's id
+            
+        Returns:
+            Principal or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(admin_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(admin_id)
+                return None
+            self._entries.move_to_end(admin_id)
+            return principal
+    
+    def set(self, admin_id: str, principal: Dict[str, Any], generation: int) -> None:
+        """
+        Cache a principal.
+        
+        Args:
+            admin_id: Admin user's id
+            principal: Resolved principal
+            generation: Value of ``generation`` read before the principal was loaded
+        """
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(admin_id)
+            self._entries[admin_id] = (principal, time.monotonic() + self.ttl_seconds)
+            self._by_organization.setdefault(principal["organization_id"], set()).add(admin_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate_admin(self, admin_id: str) -> None:
+        """Drop the cached principal of an admin."""
+        with self._lock:
+            self.generation += 1
+            self._remove(admin_id)
+    
+    def invalidate_organization(self, organization_id: str) -> None:
+        """Drop the cached principals of every admin of an organization."""
+        with self._lock:
+            self.generation += 1
+            for admin_id in list(self._by_organization.get(organization_id, ())):
+                self._remove(admin_id)
+    
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        with self._lock:
+            self._entries.clear()
+            self._by_organization.clear()
+    
+    def _remove(self, admin_id: str) -> None:
+        entry = self._entries.pop(admin_id, None)
+        if entry is None:
+            return
+        organization_id = entry[0]["organization_id"]
+        admins = self._by_organization.get(organization_id)
+        if admins is not None:
+            admins.discard(admin_id)
+            if not admins:
+                del self._by_organization[organization_id]
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,46 @@
+"""
+Opaque refresh token generation and hashing utilities.
+"""
+from datetime import datetime, timedelta
+import hashlib
+import secrets
+from app.config import settings
+
+
+class RefreshTokenHandler:
+    """Handler for opaque refresh tokens (stored only as SHA-256 hashes)."""
+
+    @staticmethod
+    def generate_token() -> str:
+        """
+        Generate a new opaque refresh token.
+
+        Returns:
+            URL-safe random token string
+        """
+        return secrets.token_urlsafe(32)
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """
+        Hash a refresh token for storage and lookup.
+
+        Refresh tokens carry 256 bits of entropy, so a fast hash is sufficient
+        and keeps renewal to a single indexed lookup.
+
+        Args:
+            token: Plain refresh token
+
+        Returns:
+            Hex-encoded SHA-256 digest
+        """
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def expires_at() -> datetime:
+        """Get the expiry time for a token issued now."""
+        return datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+# Singleton instance
+refresh_token_handler = RefreshTokenHandler()
@@ -0,0 +1,174 @@
+"""
+In-process mirror of the token revocation list.
+Lets get_current_admin reject revoked tokens in O(1) without a database round trip.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import asyncio
+import threading
+import time
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+from app.db import DatabaseManager
+from app.repositories.revocation_repository import (
+    RevocationRepository,
+    KIND_JTI,
+    KIND_ADMIN,
+    KIND_ORGANIZATION
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Revoked token ids and per-admin / per-organization cutoffs.
+    
+    Revocations made in this process apply immediately. Revocations made by
+    other workers are pulled incrementally every REVOCATION_SYNC_SECONDS.
+    Entries are dropped once every token they could match has expired.
+    """
+    
+    EPOCH = datetime(1970, 1, 1)
+    
+    def __init__(self):
+        # jti -> token exp; admin/org id -> cutoff (tokens with earlier iat are revoked)
+        self._jtis: Dict[str, float] = {}
+        self._admin_cutoffs: Dict[str, float] = {}
+        self._organization_cutoffs: Dict[str, float] = {}
+        self._repo: Optional[RevocationRepository] = None
+        self._last_sync: Optional[datetime] = None
+        self._lock = threading.Lock()
+    
+    def load(self, db_manager: DatabaseManager) -> None:
+        """
+        Load all live revocation entries.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self._repo = RevocationRepository(db_manager)
+        self._jtis = {}
+        self._admin_cutoffs = {}
+        self._organization_cutoffs = {}
+        self._last_sync = self.EPOCH
+        self.sync()
+    
+    def sync(self) -> None:
+        """Apply entries written since the last sync (by any worker)."""
+        if self._repo is None:
+            return
+        # _last_sync is the newest server-stamped revoked_at seen, never this
+        # process's clock; the overlap re-reads entries whose writes committed
+        # out of order (re-applying an entry is idempotent)
+        since = self._last_sync - timedelta(seconds=settings.REVOCATION_SYNC_OVERLAP_SECONDS)
+        newest = self._last_sync
+        for entry in self._repo.find_since(since):
+            self._apply(
+                entry["kind"],
+                entry["value"],
+                entry.get("cutoff") or (entry["expires_at"] - self.EPOCH).total_seconds()
+            )
+            newest = max(newest, entry["revoked_at"])
+        self._last_sync = newest
+        self._prune()
+    
+    def _prune(self) -> None:
+        """Drop entries that can no longer match an unexpired token."""
+        now = time.time()
+        lifetime = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        with self._lock:
+            self._prune_locked(now, lifetime)
+    
+    def _prune_locked(self, now: float, lifetime: float) -> None:
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        self._admin_cutoffs = {
+            k: cutoff for k, cutoff in self._admin_cutoffs.items() if cutoff + lifetime > now
+        }
+        self._organization_cutoffs = {
+            k: cutoff for k, cutoff in self._organization_cutoffs.items() if cutoff + lifetime > now
+        }
+    
+    def _apply(self, kind: str, value: str, cutoff: float) -> None:
+        """
+        Record an entry in the mirror.
+        
+        Args:
+            kind: Entry kind
+            value: Token id, admin id or organization id
+            cutoff: Token exp for KIND_JTI, otherwise the iat cutoff
+        """
+        with self._lock:
+            if kind == KIND_JTI:
+                self._jtis[value] = cutoff
+            elif kind == KIND_ADMIN:
+                self._admin_cutoffs[value] = max(cutoff, self._admin_cutoffs.get(value, 0.0))
+            elif kind == KIND_ORGANIZATION:
+                self._organization_cutoffs[value] = max(
+                    cutoff, self._organization_cutoffs.get(value, 0.0)
+                )
+    
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        """
+        Check a verified token payload against the revocation list.
+        
+        Args:
+            payload: Decoded token claims
+            
+        Returns:
+            True if the token must be rejected
+        """
+        if payload.get("jti") in self._jtis:
+            return True
+        issued_at = payload.get("iat", 0)
+        admin_cutoff = self._admin_cutoffs.get(payload.get("admin_id"))
+        if admin_cutoff is not None and issued_at < admin_cutoff:
+            return True
+        org_cutoff = self._organization_cutoffs.get(payload.get("organization_id"))
+        return org_cutoff is not None and issued_at < org_cutoff
+    
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a single token (e.g. on logout).
+        
+        Args:
+            jti: Token id
+            expires_at: Token ``exp`` claim
+        """
+        self._apply(KIND_JTI, jti, expires_at)
+        if self._repo is not None:
+            self._repo.revoke_jti(jti, datetime.utcfromtimestamp(expires_at))
+    
+    def revoke_admin(self, admin_id: str) -> None:
+        """Revoke every token issued to an admin so far."""
+        self._revoke_before(KIND_ADMIN, admin_id)
+    
+    def revoke_organization(self, organization_id: str) -> None:
+        """Revoke every token issued for an organization so far."""
+        self._revoke_before(KIND_ORGANIZATION, organization_id)
+    
+    def _revoke_before(self, kind: str, value: str) -> None:
+        cutoff = time.time()
+        self._apply(kind, value, cutoff)
+        if self._repo is not None:
+            # Once the longest-lived token issued before the cutoff expires,
+            # the entry is no longer needed
+            expires_at = datetime.utcnow() + timedelta(
+                minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+            )
+            self._repo.revoke_before(kind, value, cutoff, expires_at)
+
+
+async def run_sync_loop() -> None:
+    """Periodically pull revocations from other workers until cancelled."""
+    while True:
+        await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+        try:
+            await run_in_threadpool(revocation_list.sync)
+        except Exception as e:
+            logger.error("Revocation list sync failed: %s", e)
+
+
+# Singleton instance
+revocation_list = RevocationList()
@@ -4,10 +4,13 @@ Authentication service for handling admin login.
 from typing import Optional, Dict, Any
 from app.db import DatabaseManager
 from app.repositories.admin_repository import AdminRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.security.password_handler import password_handler
 from app.security.jwt_handler import jwt_handler
+from app.security.refresh_token_handler import refresh_token_handler
 from app.models.schemas import AdminLogin, TokenResponse
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,7 @@ class AuthService:
     
     def __init__(self, db_manager: DatabaseManager):
         self.admin_repo = AdminRepository(db_manager)
+        self.refresh_repo = RefreshTokenRepository(db_manager)
     
     def login(self, login_data: AdminLogin) -> Optional[TokenResponse]:
         """
@@ -31,14 +35,66 @@ class AuthService:
         admin = self.admin_repo.find_by_email(login_data.email)
         
         if not admin:
-            logger.warning(f"Login failed: Email not found - {login_data.email}")
+            logger.warning("Login failed: Email not found - %s", login_data.email)
             return None
             
         if not password_handler.verify_password(login_data.password, admin['password']):
-            logger.warning(f"Login failed: Invalid password - {login_data.email}")
+            logger.warning("Login failed: Invalid password - %s", login_data.email)
             return None
             
-        # Create access token
+        # Raise a stored hash to the configured cost while we have the plaintext
+        if password_handler.needs_rehash(admin['password']):
+            new_hash = password_handler.hash_password(login_data.password)
+            if self.admin_repo.replace_password_hash(admin['id'], admin['password'], new_hash):
+                logger.info("Rehashed password to %s rounds - %s", password_handler.rounds, login_data.email)
+        
+        return self._issue_tokens(admin, family_id=uuid.uuid4().hex)
+    
+    def refresh(self, refresh_token: str) -> Optional[TokenResponse]:
+        """
+        Exchange a refresh token for a new access token and a rotated refresh token.
+        
+        Presenting a refresh token that was already rotated revokes its whole
+        rotation chain, since it means the token was copied.
+        
+        Args:
+            refresh_token: Opaque refresh token issued at login or last refresh
+            
+        Returns:
+            TokenResponse if the refresh token is valid, None otherwise
+        """
+        token_hash = refresh_token_handler.hash_token(refresh_token)
+        stored = self.refresh_repo.consume(token_hash)
+        
+        if not stored:
+            logger.warning("Refresh failed: Unknown or expired refresh token")
+            return None
+        
+        if stored.get('used_at') is not None:
+            logger.warning("Refresh token reuse detected for admin: %s", stored['admin_id'])
+            self.refresh_repo.revoke_family(stored['family_id'])
+            return None
+        
+        # Reload the admin so claims reflect renames and deletions
+        admin = self.admin_repo.find_by_id(stored['admin_id'])
+        if not admin:
+            logger.warning("Refresh failed: Admin not found - %s", stored['admin_id'])
+            self.refresh_repo.revoke_family(stored['family_id'])
+            return None
+        
+        return self._issue_tokens(admin, family_id=stored['family_id'])
+    
+    def _issue_tokens(self, admin: Dict[str, Any], family_id: str) -> TokenResponse:
+        """
+        Create an access token and store a new refresh token for an admin.
+        
+        Args:
+            admin: Admin document
+            family_id: Rotation chain the refresh token belongs to
+            
+        Returns:
+            TokenResponse carrying both tokens
+        """
         token_data = {
             "sub": admin['email'],
             "admin_id": admin['id'],
@@ -48,9 +104,19 @@ class AuthService:
         
         access_token = jwt_handler.create_access_token(token_data)
         
+        refresh_token = refresh_token_handler.generate_token()
+        self.refresh_repo.create(
+            token_hash=refresh_token_handler.hash_token(refresh_token),
+            admin_id=admin['id'],
+            organization_id=admin['organization_id'],
+            family_id=family_id,
+            expires_at=refresh_token_handler.expires_at()
+        )
+        
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
+            refresh_token=refresh_token,
             admin_id=admin['id'],
             organization_id=admin['organization_id'],
             organization_name=admin.get('organization_name', '')
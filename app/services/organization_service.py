@@ -2,14 +2,25 @@
 Organization service for handling business logic.
 Manages organization lifecycle including dynamic collections.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from bson import ObjectId
 from fastapi import HTTPException, status
 from pymongo.errors import DuplicateKeyError
 from app.db import DatabaseManager
 from app.repositories.organization_repository import OrganizationRepository
 from app.repositories.admin_repository import AdminRepository
-from app.models.schemas import OrganizationCreate, OrganizationUpdate, OrganizationResponse
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.models.schemas import (
+    OrganizationCreate,
+    OrganizationUpdate,
+    OrganizationResponse,
+    OrganizationLookup
+)
 from app.security.password_handler import password_handler
+from app.http_cache import organization_stamps
+from app.security.revocation import revocation_list
+from app.resilience import DATABASE_UNAVAILABLE
+from app import tenants
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +33,7 @@ class OrganizationService:
         self.db_manager = db_manager
         self.org_repo = OrganizationRepository(db_manager)
         self.admin_repo = AdminRepository(db_manager)
+        self.refresh_repo = RefreshTokenRepository(db_manager)
     
     def create_organization(self, org_data: OrganizationCreate) -> OrganizationResponse:
         """
@@ -43,7 +55,7 @@ class OrganizationService:
                 detail=f"Organization '{org_data.organization_name}' already exists"
             )
             
-        if self.admin_repo.find_by_email(org_data.email):
+        if self.admin_repo.email_exists(org_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Email '{org_data.email}' is already registered"
@@ -51,12 +63,14 @@ class OrganizationService:
             
         try:
             # 2. Create Organization Metadata
-            # Store connection details for the dynamic collection
-            connection_details = f"Collection: org_{org_data.organization_name}"
+            # The id is assigned up front because it names the dynamic collection
+            org_id = ObjectId()
             org_dict = {
+                "_id": org_id,
                 "organization_name": org_data.organization_name,
                 "email": org_data.email,
-                "connection_details": connection_details
+                "collection_name": tenants.collection_name(str(org_id)),
+                "connection_details": tenants.connection_details(str(org_id))
             }
             created_org = self.org_repo.create(org_dict)
             
@@ -78,11 +92,11 @@ class OrganizationService:
             
             # 4. Create Dynamic Collection (initialize with an index)
             # This ensures the collection exists
-            org_collection = self.db_manager.get_org_collection(org_data.organization_name)
+            org_collection = self.db_manager.get_org_collection(created_org['id'])
             # Create a dummy index to ensure collection creation
             org_collection.create_index("created_at")
             
-            logger.info(f"Successfully created organization: {org_data.organization_name}")
+            logger.info("Successfully created organization: %s", org_data.organization_name)
             
             return OrganizationResponse(
                 id=str(created_org['id']),
@@ -94,13 +108,15 @@ class OrganizationService:
             )
             
         except DuplicateKeyError as e:
-            logger.error(f"Duplicate key error during creation: {str(e)}")
+            logger.error("Duplicate key error during creation: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Organization or email already exists"
             )
+        except DATABASE_UNAVAILABLE:
+            raise
         except Exception as e:
-            logger.error(f"Error creating organization: {str(e)}")
+            logger.error("Error creating organization: %s", e)
             # Cleanup if possible (omitted for simplicity, but in prod we'd want rollback)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -128,6 +144,43 @@ class OrganizationService:
             )
         return OrganizationResponse(**org)
 
+    def get_organizations(
+        self,
+        organization_names: List[str],
+        organization_ids: List[str]
+    ) -> List[OrganizationLookup]:
+        """
+        Get several organizations by name and/or id with a single query.
+        
+        Args:
+            organization_names: Organization names
+            organization_ids: Organization ids
+            
+        Returns:
+            One lookup result per requested name, then per requested id, in
+            request order; unknown names/ids are marked not found
+        """
+        docs = self.org_repo.find_many(organization_names, organization_ids)
+        by_name = {doc['organization_name']: doc for doc in docs}
+        by_id = {doc['id']: doc for doc in docs}
+        
+        results = []
+        for name in organization_names:
+            doc = by_name.get(name)
+            results.append(OrganizationLookup(
+                organization_name=name,
+                found=doc is not None,
+                organization=OrganizationResponse(**doc) if doc else None
+            ))
+        for organization_id in organization_ids:
+            doc = by_id.get(organization_id)
+            results.append(OrganizationLookup(
+                id=organization_id,
+                found=doc is not None,
+                organization=OrganizationResponse(**doc) if doc else None
+            ))
+        return results
+
     def update_organization(
         self, 
         current_org_name: str, 
@@ -159,7 +212,7 @@ class OrganizationService:
             fields_to_update['email'] = update_data.email
             
         new_name = update_data.organization_name
-        rename_collection = False
+        renamed = False
         
         if new_name and new_name != current_org_name:
             # Check if new name is taken
@@ -169,13 +222,22 @@ class OrganizationService:
                     detail=f"Organization name '{new_name}' is already taken"
                 )
             fields_to_update['organization_name'] = new_name
-            # Update connection details for new collection name
-            fields_to_update['connection_details'] = f"Collection: org_{new_name}"
-            rename_collection = True
+            renamed = True
+            # Collections are keyed by id, so a rename is metadata-only once
+            # a pre-existing org_<name> collection has been moved
+            if 'collection_name' not in org:
+                tenants.migrate_organization(self.db_manager, org['id'], current_org_name)
             
         # Update Organization Metadata
         if fields_to_update:
-            updated_org = self.org_repo.update(current_org_name, fields_to_update)
+            try:
+                updated_org = self.org_repo.update(current_org_name, fields_to_update)
+            except DuplicateKeyError:
+                # Taken by another worker after the exists() pre-check
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Organization name '{new_name}' is already taken"
+                )
         else:
             updated_org = org
             
@@ -185,15 +247,19 @@ class OrganizationService:
             admin_updates['email'] = update_data.email
         if update_data.password:
             admin_updates['password'] = password_handler.hash_password(update_data.password)
-        if rename_collection:
+        if renamed:
             admin_updates['organization_name'] = new_name
             
         if admin_updates:
             self.admin_repo.update(admin_id, admin_updates)
-            
-        # Handle Collection Migration if name changed
-        if rename_collection and new_name:
-            self._migrate_collection(current_org_name, str(new_name))
+        
+        # A password change ends every existing session
+        if update_data.password:
+            self.refresh_repo.revoke_by_admin(admin_id)
+            revocation_list.revoke_admin(admin_id)
+        
+        # Cached ETags for the old name are no longer current
+        organization_stamps.invalidate(current_org_name)
             
         if not updated_org:
             raise HTTPException(
@@ -236,44 +302,18 @@ class OrganizationService:
                 detail="You are not authorized to delete this organization"
             )
             
-        # 1. Delete Admin User
+        # 1. Delete Admin User and its refresh tokens
         self.admin_repo.delete_by_organization(org['id'])
+        self.refresh_repo.revoke_by_organization(org['id'])
+        revocation_list.revoke_organization(org['id'])
         
         # 2. Delete Organization Metadata
         self.org_repo.delete(organization_name)
         
-        # 3. Drop Dynamic Collection
-        self.db_manager.drop_org_collection(organization_name)
+        # 3. Drop Dynamic Collection (and a not yet migrated name-based one)
+        self.db_manager.drop_org_collection(org['id'])
+        if 'collection_name' not in org:
+            self.db_manager.drop_org_collection(organization_name)
+        organization_stamps.invalidate(organization_name)
         
         return {"detail": f"Organization '{organization_name}' deleted successfully"}
-
-    def _migrate_collection(self, old_name: str, new_name: str):
-        """
-        Migrate data from old organization collection to new one.
-        
-        Args:
-            old_name: Old organization name
-            new_name: New organization name
-        """
-        try:
-            old_coll = self.db_manager.get_org_collection(old_name)
-            new_coll = self.db_manager.get_org_collection(new_name)
-            
-            # Copy all documents
-            # Note: For very large collections, this should be done in batches or using aggregation $out
-            # For this assignment, simple copy is sufficient
-            documents = list(old_coll.find())
-            if documents:
-                new_coll.insert_many(documents)
-                
-            # Drop old collection
-            self.db_manager.drop_org_collection(old_name)
-            logger.info(f"Migrated collection from {old_name} to {new_name}")
-            
-        except Exception as e:
-            logger.error(f"Error migrating collection: {str(e)}")
-            # In a real system, we might want to revert the name change here
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error migrating organization data"
-            )
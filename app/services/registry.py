@@ -0,0 +1,90 @@
+"""
+Long-lived service instances shared by every request.
+Built once per application lifespan instead of once per request.
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from app.db import DatabaseManager
+from app.services.organization_service import OrganizationService
+from app.services.auth_service import AuthService
+
+
+class ServiceRegistry:
+    """
+    Holds the OrganizationService and AuthService used by the routers.
+    
+    Services and their repositories are stateless apart from collection
+    handles, so one instance each is safe to share across requests and
+    threadpool workers. ``init`` runs in the application lifespan after
+    the database connects; ``override`` swaps in test doubles.
+    """
+    
+    def __init__(self):
+        self._organization: Optional[OrganizationService] = None
+        self._auth: Optional[AuthService] = None
+    
+    def init(self, db_manager: DatabaseManager) -> None:
+        """
+        Build the services against a connected database manager.
+        
+        Args:
+            db_manager: Database manager instance
+        """
+        self._organization = OrganizationService(db_manager)
+        self._auth = AuthService(db_manager)
+    
+    def clear(self) -> None:
+        """Drop the services (on shutdown, with the connection they were built on)."""
+        self._organization = None
+        self._auth = None
+    
+    @property
+    def organization(self) -> OrganizationService:
+        """Get the organization service."""
+        if self._organization is None:
+            raise RuntimeError("Services not initialized. Call init() first.")
+        return self._organization
+    
+    @property
+    def auth(self) -> AuthService:
+        """Get the auth service."""
+        if self._auth is None:
+            raise RuntimeError("Services not initialized. Call init() first.")
+        return self._auth
+    
+    @contextmanager
+    def override(
+        self,
+        organization: Optional[OrganizationService] = None,
+        auth: Optional[AuthService] = None
+    ) -> Iterator["ServiceRegistry"]:
+        """
+        Temporarily replace services, e.g. with fakes in tests.
+        
+        Args:
+            organization: Replacement organization service
+            auth: Replacement auth service
+        """
+        previous = self._organization, self._auth
+        if organization is not None:
+            self._organization = organization
+        if auth is not None:
+            self._auth = auth
+        try:
+            yield self
+        finally:
+            self._organization, self._auth = previous
+
+
+# Singleton instance
+services = ServiceRegistry()
+
+
+def get_organization_service() -> OrganizationService:
+    """Dependency to get the shared organization service instance."""
+    return services.organization
+
+
+def get_auth_service() -> AuthService:
+    """Dependency to get the shared auth service instance."""
+    return services.auth
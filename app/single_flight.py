@@ -0,0 +1,82 @@
+"""
+Single-flight request coalescing.
+Collapses concurrent identical lookups into one in-flight call whose result is shared.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional
+import copy
+import threading
+
+
+class _Call:
+    """An in-flight call and its outcome."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running block until it finishes and receive a shallow
+    copy of the same result, or the same exception. Once the call completes
+    the key is released, so later calls hit the database again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn once for all concurrent callers sharing a key.
+
+        Args:
+            key: Identity of the lookup (e.g. ("org_name", "acme"))
+            fn: Function performing the lookup
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn; followers get a shallow copy so they can mutate it safely
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if call.waiters:
+            # Hand the leader its own copy; followers copy from the shared result
+            return copy.copy(call.result)
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running."""
+        with self._lock:
+            return len(self._calls)
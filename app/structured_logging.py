@@ -0,0 +1,177 @@
+"""
+Non-blocking structured logging.
+Log calls only enqueue the record; a background listener thread formats it
+(as JSON by default) and writes it, so request handlers never block on I/O.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import orjson
+from app.config import settings
+
+# Set per request by RequestContextMiddleware / get_current_admin
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+tenant_var: ContextVar[Optional[str]] = ContextVar("tenant", default=None)
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {
+    "message", "asctime", "request_id", "tenant", "suppressed"
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        tenant = getattr(record, "tenant", None)
+        if tenant:
+            entry["tenant"] = tenant
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode("utf-8")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit repetitive warning/error records.
+
+    Records are keyed by logger and unformatted message template, so every
+    "JWT verification failed: %s" counts as the same event. The first
+    ``burst`` records of a key per window pass; after that only every
+    ``every``-th does, carrying the number of records suppressed since the
+    last one that was written.
+    """
+
+    def __init__(
+        self,
+        burst: int = settings.LOG_SAMPLE_BURST,
+        every: int = settings.LOG_SAMPLE_EVERY,
+        window_seconds: float = settings.LOG_SAMPLE_WINDOW_SECONDS
+    ):
+        super().__init__()
+        self.burst = burst
+        self.every = max(every, 1)
+        self.window_seconds = window_seconds
+        # key -> (window start, records seen in window, suppressed since last emit)
+        self._counters: Dict[Tuple[str, str], Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            started, seen, suppressed = self._counters.get(key, (now, 0, 0))
+            if now - started >= self.window_seconds:
+                started, seen = now, 0
+            seen += 1
+            keep = seen <= self.burst or (seen - self.burst) % self.every == 0
+            if keep:
+                record.suppressed = suppressed
+                suppressed = 0
+            else:
+                suppressed += 1
+            self._counters[key] = (started, seen, suppressed)
+            if len(self._counters) > 10000:
+                self._counters.clear()
+        return keep
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that captures request context and defers formatting.
+
+    Unlike the stdlib QueueHandler, the message is not interpolated in the
+    calling thread: ``msg`` and ``args`` travel to the listener, which formats
+    them. A full queue drops the record (and counts it) instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.request_id = request_id_var.get()
+        record.tenant = tenant_var.get()
+        if record.exc_info:
+            # Tracebacks reference live frames; render them while they are valid
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """Owns the queue handler and listener thread installed on the root logger."""
+
+    def __init__(self):
+        self.handler: Optional[ContextQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """Route all logging through the queue and start the writer thread."""
+        if self.listener is not None:
+            return
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        stream = logging.StreamHandler(sys.stdout)
+        if settings.LOG_FORMAT == "json":
+            stream.setFormatter(JSONFormatter())
+        else:
+            stream.setFormatter(logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+            ))
+        self.handler = ContextQueueHandler(log_queue)
+        self.handler.addFilter(SamplingFilter())
+        self.listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        root.setLevel(settings.LOG_LEVEL)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread."""
+        if self.listener is None:
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
+        self.listener = None
+        self.handler = None
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full."""
+        return self.handler.dropped if self.handler is not None else 0
+
+
+# Singleton instance
+logging_pipeline = LoggingPipeline()
@@ -0,0 +1,127 @@
+"""
+Tenant collection naming and migration.
+
+Tenant collections are named after the immutable organization id
+(``org_<id>``), so renaming an organization only updates its metadata.
+Organizations created before that are migrated from ``org_<name>`` once,
+in the background, at startup.
+"""
+from bson import ObjectId
+from fastapi.concurrency import run_in_threadpool
+from pymongo.errors import OperationFailure
+from app.db import DatabaseManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 1000
+
+
+def collection_name(organization_id: str) -> str:
+    """Name of an organization's tenant collection."""
+    return f"org_{organization_id}"
+
+
+def legacy_collection_name(organization_name: str) -> str:
+    """Name-based tenant collection used before collections were keyed by id."""
+    return f"org_{organization_name}"
+
+
+def connection_details(organization_id: str) -> str:
+    """connection_details value stored in organization metadata."""
+    return f"Collection: {collection_name(organization_id)}"
+
+
+def migrate_organization(db_manager: DatabaseManager, organization_id: str, organization_name: str) -> None:
+    """
+    Move one organization's legacy ``org_<name>`` collection to ``org_<id>``.
+    
+    Uses a metadata-only renameCollection when the target does not exist yet,
+    otherwise copies in batches and drops the legacy collection. Safe to run
+    concurrently from several workers.
+    
+    Args:
+        db_manager: Database manager instance
+        organization_id: Organization's id
+        organization_name: Organization's current name
+    """
+    legacy = legacy_collection_name(organization_name)
+    target = collection_name(organization_id)
+    db = db_manager.master_db
+    if db.list_collection_names(filter={"name": legacy}):
+        try:
+            db[legacy].rename(target)
+        except OperationFailure:
+            # Target already exists (or another worker moved it): merge what is left
+            _copy_collection(db_manager, legacy, target)
+    db_manager.organizations.update_one(
+        {"_id": ObjectId(organization_id)},
+        {"$set": {"collection_name": target, "connection_details": connection_details(organization_id)}}
+    )
+    # Writes that reached the legacy name between the rename and the metadata update
+    if db.list_collection_names(filter={"name": legacy}):
+        _copy_collection(db_manager, legacy, target)
+    logger.info("Migrated tenant collection %s -> %s", legacy, target)
+
+
+def _copy_collection(db_manager: DatabaseManager, source: str, target: str) -> None:
+    source_coll = db_manager.master_db[source]
+    target_coll = db_manager.master_db[target]
+    batch = []
+    for doc in source_coll.find():
+        batch.append(doc)
+        if len(batch) >= MIGRATION_BATCH_SIZE:
+            _insert_missing(target_coll, batch)
+            batch = []
+    if batch:
+        _insert_missing(target_coll, batch)
+    db_manager.master_db.drop_collection(source)
+
+
+def _insert_missing(collection, docs) -> None:
+    existing = {doc["_id"] for doc in collection.find(
+        {"_id": {"$in": [d["_id"] for d in docs]}}, {"_id": 1}
+    )}
+    missing = [d for d in docs if d["_id"] not in existing]
+    if missing:
+        collection.insert_many(missing)
+
+
+def migrate_legacy_collections(db_manager: DatabaseManager) -> int:
+    """
+    Migrate every organization still using a name-based collection.
+    
+    Args:
+        db_manager: Database manager instance
+        
+    Returns:
+        Number of organizations migrated
+    """
+    migrated = 0
+    legacy = db_manager.organizations.find(
+        {"collection_name": {"$exists": False}},
+        {"organization_name": 1}
+    )
+    for org in legacy:
+        try:
+            migrate_organization(db_manager, str(org["_id"]), org["organization_name"])
+            migrated += 1
+        except Exception as e:
+            logger.error("Tenant collection migration failed for %s: %s", org['organization_name'], e)
+    return migrated
+
+
+async def run_migration(db_manager: DatabaseManager) -> None:
+    """
+    Migrate legacy tenant collections once, off the event loop.
+    
+    Args:
+        db_manager: Database manager instance
+    """
+    try:
+        migrated = await run_in_threadpool(migrate_legacy_collections, db_manager)
+        if migrated:
+            logger.info("Migrated %s tenant collections to id-based names", migrated)
+    except Exception as e:
+        logger.error("Tenant collection migration failed: %s", e)
+
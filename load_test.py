@@ -0,0 +1,362 @@
+"""
+Load generator for the Croupier API.
+
+Drives a running server with concurrent virtual users performing a weighted
+mix of create/login/get/update/delete, or replays a JSONL traffic file, and
+writes per-endpoint latency percentiles, RPS and error breakdowns as JSON.
+
+Usage:
+    python load_test.py --concurrency 50 --duration 60 --ramp 10
+    python load_test.py --mix create=1,login=2,get=20,update=1,delete=1
+    python load_test.py --replay examples/traffic.jsonl --requests 5000
+    python load_test.py --output reports/v1.2.json
+
+Replay files hold one JSON object per line, either a scenario step
+({"op": "get"}) run against the virtual user's own organizations, or a raw
+request ({"method": "GET", "path": "/health", "params": {...},
+"json": {...}, "headers": {...}}). Lines are cycled until the run ends.
+
+Login is rate limited per email and per client IP; for meaningful numbers
+run the target with LOGIN_RATE_LIMIT_ENABLED=false.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import string
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+import httpx
+
+OPERATIONS = ("create", "login", "get", "update", "delete")
+DEFAULT_MIX = "create=1,login=2,get=12,update=2,delete=1"
+PASSWORD = "LoadTest123"
+
+
+class Stats:
+    """Latencies, status codes and errors grouped by endpoint."""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+    
+    def record(self, endpoint: str, seconds: float, status: Optional[int], error: Optional[str]) -> None:
+        self.latencies[endpoint].append(seconds)
+        if status is not None:
+            self.statuses[endpoint][str(status)] += 1
+        if error is not None:
+            self.errors[endpoint][error] += 1
+    
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Summarize the run.
+        
+        Args:
+            elapsed: Wall-clock duration of the run in seconds
+            
+        Returns:
+            Overall and per-endpoint summaries
+        """
+        endpoints = {
+            endpoint: self._summary(
+                self.latencies[endpoint],
+                self.statuses[endpoint],
+                self.errors[endpoint],
+                elapsed
+            )
+            for endpoint in sorted(self.latencies)
+        }
+        total = self._summary(
+            [s for values in self.latencies.values() for s in values],
+            sum(self.statuses.values(), Counter()),
+            sum(self.errors.values(), Counter()),
+            elapsed
+        )
+        return {"total": total, "endpoints": endpoints}
+    
+    @staticmethod
+    def _summary(latencies: List[float], statuses: Counter, errors: Counter, elapsed: float) -> Dict[str, Any]:
+        ordered = sorted(latencies)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": sum(errors.values()),
+            "rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "p99": _percentile(ordered, 99),
+                "mean": round(sum(ordered) / count * 1000, 2) if count else None,
+                "max": round(ordered[-1] * 1000, 2) if count else None,
+            },
+            "status_codes": dict(sorted(statuses.items())),
+            "error_breakdown": dict(errors.most_common()),
+        }
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted seconds, in milliseconds."""
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered))) - 1
+    return round(ordered[rank] * 1000, 2)
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as ``create=1,get=10``.
+    
+    Args:
+        spec: Comma-separated op=weight pairs
+        
+    Returns:
+        Weight per operation
+        
+    Raises:
+        ValueError: On unknown operations or non-positive total weight
+    """
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        op, _, weight = part.partition("=")
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}' (expected one of {', '.join(OPERATIONS)})")
+        mix[op] = float(weight or 1)
+    if sum(mix.values()) <= 0:
+        raise ValueError("Operation mix needs at least one positive weight")
+    return mix
+
+
+def load_replay(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a JSONL traffic file.
+    
+    Args:
+        path: File with one step or raw request per line
+        
+    Returns:
+        Parsed entries
+        
+    Raises:
+        ValueError: On entries that are neither a known op nor a method/path request
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("op") not in OPERATIONS and not ("method" in entry and "path" in entry):
+                raise ValueError(f"{path}:{lineno}: expected an 'op' or 'method' and 'path'")
+            entries.append(entry)
+    if not entries:
+        raise ValueError(f"{path}: no requests to replay")
+    return entries
+
+
+class VirtualUser:
+    """A client session owning the organizations it created."""
+    
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        # organization_name -> {"email": ..., "token": ...}
+        self.organizations: Dict[str, Dict[str, Optional[str]]] = {}
+    
+    async def request(self, method: str, path: str, endpoint: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record it under ``endpoint`` (defaults to METHOD path)."""
+        endpoint = endpoint or f"{method.upper()} {path}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(endpoint, time.perf_counter() - started, None, type(e).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+        self.stats.record(endpoint, elapsed, response.status_code, error)
+        return response
+    
+    async def run(self, op: str) -> None:
+        """Run one scenario step, creating an organization first if none is owned."""
+        if op != "create" and not self.organizations:
+            op = "create"
+        await getattr(self, f"do_{op}")()
+    
+    def _pick(self) -> str:
+        return self.rng.choice(list(self.organizations))
+    
+    def _suffix(self) -> str:
+        return "".join(self.rng.choices(string.ascii_lowercase + string.digits, k=10))
+    
+    async def _token(self, name: str) -> Optional[str]:
+        if not self.organizations[name]["token"]:
+            await self._login(name)
+        return self.organizations[name]["token"]
+    
+    async def _login(self, name: str) -> None:
+        response = await self.request("POST", "/admin/login", json={
+            "email": self.organizations[name]["email"],
+            "password": PASSWORD
+        })
+        if response is not None and response.status_code == 200:
+            self.organizations[name]["token"] = response.json()["access_token"]
+    
+    async def do_create(self) -> None:
+        suffix = self._suffix()
+        name, email = f"load_{suffix}", f"load_{suffix}@loadtest.com"
+        response = await self.request("POST", "/org/create", json={
+            "organization_name": name,
+            "email": email,
+            "password": PASSWORD
+        })
+        if response is not None and response.status_code == 201:
+            self.organizations[name] = {"email": email, "token": None}
+    
+    async def do_login(self) -> None:
+        await self._login(self._pick())
+    
+    async def do_get(self) -> None:
+        await self.request("GET", "/org/get", params={"organization_name": self._pick()})
+    
+    async def do_update(self) -> None:
+        name = self._pick()
+        token = await self._token(name)
+        if not token:
+            return
+        email = f"load_{self._suffix()}@loadtest.com"
+        response = await self.request(
+            "PUT", "/org/update",
+            json={"email": email},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response is not None and response.status_code == 200:
+            self.organizations[name]["email"] = email
+    
+    async def do_delete(self) -> None:
+        name = self._pick()
+        token = await self._token(name)
+        if not token:
+            return
+        response = await self.request(
+            "DELETE", "/org/delete",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response is not None and response.status_code in (204, 404):
+            del self.organizations[name]
+    
+    async def replay(self, entry: Dict[str, Any]) -> None:
+        """Run a replay entry: a scenario step or a raw request."""
+        if "op" in entry:
+            await self.run(entry["op"])
+            return
+        await self.request(
+            entry["method"],
+            entry["path"],
+            endpoint=entry.get("name"),
+            params=entry.get("params"),
+            json=entry.get("json"),
+            headers=entry.get("headers")
+        )
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the load test described by the command-line arguments.
+    
+    Args:
+        args: Parsed arguments
+        
+    Returns:
+        JSON-serializable report
+    """
+    rng = random.Random(args.seed)
+    stats = Stats()
+    mix = parse_mix(args.mix)
+    ops, weights = list(mix), list(mix.values())
+    replay: Optional[Iterator[Dict[str, Any]]] = (
+        itertools.cycle(load_replay(args.replay)) if args.replay else None
+    )
+    budget = itertools.count()
+    deadline: Optional[float] = None
+    
+    def next_step() -> Optional[Any]:
+        # Shared across workers; no awaits, so no locking is needed
+        if args.requests and next(budget) >= args.requests:
+            return None
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return next(replay) if replay else rng.choices(ops, weights)[0]
+    
+    async def worker(index: int, client: httpx.AsyncClient) -> None:
+        # Spread worker start times evenly over the ramp period
+        if args.ramp and args.concurrency > 1:
+            await asyncio.sleep(args.ramp * index / (args.concurrency - 1))
+        user = VirtualUser(client, stats, random.Random(rng.random()))
+        while (step := next_step()) is not None:
+            if replay:
+                await user.replay(step)
+            else:
+                await user.run(step)
+    
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.monotonic()
+        if not args.requests:
+            deadline = started + args.duration
+        await asyncio.gather(*(worker(i, client) for i in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+    
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "ramp_seconds": args.ramp,
+            "duration_seconds": None if args.requests else args.duration,
+            "requests": args.requests,
+            "mix": None if args.replay else mix,
+            "replay": args.replay,
+            "seed": args.seed,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        **stats.report(elapsed),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Croupier load generator")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run (ignored with --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many steps instead")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which workers start")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, e.g. create=1,get=10")
+    parser.add_argument("--replay", help="JSONL traffic file to replay instead of the mix")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    
+    try:
+        report = asyncio.run(run_load(args))
+    except (ValueError, OSError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"[INFO] Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
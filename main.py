@@ -1,19 +1,40 @@
 """
 Main application entry point.
 """
+import asyncio
 import uvicorn
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.db import db_manager
-from app.routers import organization, admin
+from app.services.registry import services
+from app.tenants import run_migration as run_tenant_migration
+from app.security.password_handler import password_handler
+from app.membership import known_identities, run_sync_loop
+from app.security.jwt_handler import jwt_handler
+from app.security.key_ring import key_ring, run_rotation_loop
+from app.security.revocation import revocation_list, run_sync_loop as run_revocation_sync_loop
+from app.loop_monitor import loop_monitor
+from pymongo.errors import ConnectionFailure
+from app.resilience import CLOSED, DatabaseUnavailableError, db_resilience
+from app.responses import FastJSONResponse
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.structured_logging import logging_pipeline
+from app.idempotency import idempotency_store
+from app.routers import organization, admin, jwks, metrics
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
+    logging_pipeline.start()
     try:
         db_manager.connect()
         print("[SUCCESS] Connected to MongoDB")
@@ -21,31 +42,108 @@ async def lifespan(app: FastAPI):
         print(f"[ERROR] Failed to connect to MongoDB: {str(e)}")
         print("[ERROR] Please ensure MongoDB is running and MONGODB_URI is correct")
         raise
+    if settings.BCRYPT_CALIBRATE:
+        password_handler.adopt_fleet_cost(db_manager)
+    services.init(db_manager)
+    if settings.IDEMPOTENCY_ENABLED:
+        idempotency_store.init(db_manager)
+    if settings.TENANT_MIGRATION_ENABLED:
+        tenant_migration = asyncio.create_task(run_tenant_migration(db_manager))
+    if not jwt_handler.is_symmetric():
+        key_ring.load(db_manager)
+        key_rotation = asyncio.create_task(run_rotation_loop())
+    if settings.BLOOM_FILTER_ENABLED:
+        known_identities.build(db_manager)
+        membership_sync = asyncio.create_task(run_sync_loop(db_manager))
+    revocation_list.load(db_manager)
+    revocation_sync = asyncio.create_task(run_revocation_sync_loop())
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        capture_stacks = settings.LOOP_LAG_CAPTURE_STACKS
+        if capture_stacks is None:
+            capture_stacks = settings.DEBUG
+        lag_monitor = asyncio.create_task(loop_monitor.run(capture_stacks))
     yield
     # Shutdown
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        lag_monitor.cancel()
+    revocation_sync.cancel()
+    if settings.BLOOM_FILTER_ENABLED:
+        membership_sync.cancel()
+    if not jwt_handler.is_symmetric():
+        key_rotation.cancel()
+    if settings.TENANT_MIGRATION_ENABLED:
+        tenant_migration.cancel()
+    if settings.IDEMPOTENCY_ENABLED:
+        idempotency_store.clear()
+    services.clear()
     db_manager.disconnect()
     print("[INFO] Disconnected from MongoDB")
+    logging_pipeline.stop()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="A Multi-Tenant Organization Management Service",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
-# CORS Middleware
+# Idempotency Middleware (innermost, so stored responses are uncompressed and carry no CORS headers)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+
+# Compression Middleware (brotli when available, gzip otherwise)
+app.add_middleware(CompressionMiddleware)
+
+# Server-Timing Middleware (per-request database command count and time)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Profiling Middleware (signed X-Debug-Profile header or PROFILING_SAMPLE_RATE)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Load Shedding Middleware (rejects low-priority routes first under overload)
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
+# CORS Middleware (outside load shedding, so browsers can read 503s and their Retry-After)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Request-ID", "X-Shed-Reason"],
 )
 
+# Request Context Middleware (request id for logs and X-Request-ID)
+app.add_middleware(RequestContextMiddleware)
+
+# Database outages fail fast with 503 so clients back off instead of retrying at once
+@app.exception_handler(DatabaseUnavailableError)
+async def database_unavailable_handler(request: Request, exc: DatabaseUnavailableError):
+    return FastJSONResponse(
+        {"detail": "Database temporarily unavailable"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.exception_handler(ConnectionFailure)
+async def database_connection_failure_handler(request: Request, exc: ConnectionFailure):
+    breaker = db_resilience.breaker
+    return FastJSONResponse(
+        {"detail": "Database temporarily unavailable"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(breaker.retry_after() if breaker.state != CLOSED else 1)}
+    )
+
 # Include Routers
 app.include_router(organization.router)
 app.include_router(admin.router)
+app.include_router(jwks.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
@@ -60,7 +158,8 @@ async def health_check():
     """
     Health check endpoint for monitoring and load balancers.
     
-    Returns service status and database connectivity.
+    Returns service status, database connectivity and the state of the
+    database circuit breaker.
     """
     db_status = "disconnected"
     try:
@@ -71,13 +170,15 @@ async def health_check():
     except Exception:
         db_status = "disconnected"
     
-    health_status = "healthy" if db_status == "connected" else "unhealthy"
+    circuit = db_resilience.breaker.snapshot()
+    health_status = "healthy" if db_status == "connected" and circuit["state"] == CLOSED else "unhealthy"
     
     return {
         "status": health_status,
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION,
-        "database": db_status
+        "database": db_status,
+        "database_circuit": circuit
     }
 
 if __name__ == "__main__":
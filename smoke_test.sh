@@ -168,7 +168,7 @@ echo "Summary:"
 echo "  ✓ Organization creation"
 echo "  ✓ Admin authentication (JWT)"
 echo "  ✓ Organization retrieval"
-echo "  ✓ Organization update (with collection migration)"
+echo "  ✓ Organization update (metadata-only rename)"
 echo "  ✓ Organization deletion"
 echo "  ✓ Data cleanup verification"
 echo ""
@@ -0,0 +1,91 @@
+"""
+Benchmark for per-request service construction.
+
+Compares building OrganizationService/AuthService (and their repositories)
+on every request against resolving the shared lifespan-scoped instances,
+and uncached against cached organization collection handles. Reports time
+and bytes allocated per operation.
+
+No MongoDB server is needed: the client is created with connect=False and
+only collection handles are resolved.
+
+Usage:
+    python tests/benchmarks/bench_dependencies.py
+"""
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pymongo import MongoClient
+from app.config import settings
+from app.db import db_manager
+from app.services.organization_service import OrganizationService
+from app.services.auth_service import AuthService
+from app.services.registry import services, get_organization_service, get_auth_service
+
+ITERATIONS = 20000
+
+
+def _per_request_services():
+    OrganizationService(db_manager)
+    AuthService(db_manager)
+
+
+def _shared_services():
+    get_organization_service()
+    get_auth_service()
+
+
+def _uncached_collection():
+    db_manager.master_db["org_acme_corp"]
+
+
+def _cached_collection():
+    db_manager.get_org_collection("acme_corp")
+
+
+CASES = [
+    ("services per request", _per_request_services),
+    ("shared services", _shared_services),
+    ("org collection uncached", _uncached_collection),
+    ("org collection cached", _cached_collection),
+]
+
+
+def _allocated_bytes(fn, number):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(number):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before
+
+
+def main():
+    client = MongoClient(settings.MONGODB_URL, connect=False)
+    db_manager._client = client
+    db_manager._master_db = client[settings.MONGODB_DB_NAME]
+    services.init(db_manager)
+
+    print(f"{'case':<28}{'us/op':>10}{'ops/sec':>14}{'peak bytes/op':>16}")
+    for name, fn in CASES:
+        fn()
+        elapsed = timeit.timeit(fn, number=ITERATIONS)
+        # Peak over a single call isolates what one request keeps alive at once
+        allocated = _allocated_bytes(fn, 1)
+        print(
+            f"{name:<28}{elapsed / ITERATIONS * 1e6:>10.2f}"
+            f"{ITERATIONS / elapsed:>14,.0f}{allocated:>16,}"
+        )
+
+    services.clear()
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
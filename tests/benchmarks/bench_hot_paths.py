@@ -0,0 +1,220 @@
+"""
+Micro-benchmarks for the service and security hot paths, with regression check.
+
+Runs the real services and repositories against app.memory_mongo (no
+MongoDB server needed) and compares each case with the stored baseline in
+baselines.json. Timings are divided by a fixed pure-Python calibration
+workload measured in the same run, so baselines recorded on one machine
+stay meaningful on another. bcrypt runs at 4 rounds so AuthService.login
+and create_organization measure our code rather than the configured cost.
+
+Each case runs against its own fresh database and reports the median of
+REPEAT runs, with the calibration workload re-measured next to it. Exits
+non-zero when a case is slower than its baseline by more than its
+threshold (default 25%; noisier cases allow more, see CASE_THRESHOLDS).
+Cases whose baseline is under --min-gated-us per call are reported only:
+at that scale timer and interpreter noise exceed any real change.
+
+Usage:
+    python tests/benchmarks/bench_hot_paths.py
+    python tests/benchmarks/bench_hot_paths.py --threshold 0.10 --only jwt
+    python tests/benchmarks/bench_hot_paths.py --update-baseline
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from bson import ObjectId
+from app.db import db_manager
+from app.memory_mongo import MemoryClient
+from app.models.schemas import OrganizationCreate, OrganizationUpdate, AdminLogin
+from app.repositories.organization_repository import OrganizationRepository
+from app.security.jwt_handler import jwt_handler
+from app.security.key_ring import key_ring
+from app.security.password_handler import password_handler
+from app.services.auth_service import AuthService
+from app.services.organization_service import OrganizationService
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+REPEAT = 15
+
+# Allowed slowdown for cases noisier than the default threshold: each create
+# grows the database it runs against, and bcrypt's timing varies run to run
+CASE_THRESHOLDS = {
+    "OrganizationService.create_organization": 0.5,
+    "AuthService.login": 0.4,
+}
+
+CLAIMS = {
+    "sub": "admin@bench.com",
+    "admin_id": "65a1f0c2e4b0a1b2c3d4e5f7",
+    "organization_id": "65a1f0c2e4b0a1b2c3d4e5f6",
+    "organization_name": "bench_org"
+}
+
+
+def _calibration():
+    """Fixed interpreter-bound workload used as the unit of measurement."""
+    total = 0
+    for i in range(2000):
+        total += len(str(i)) * (i & 7)
+    return {"total": total, "items": sorted(range(200, 0, -1))}
+
+
+def _fresh_database():
+    """Connect to a new in-memory database holding one organization."""
+    db_manager.disconnect()
+    db_manager.connect(MemoryClient())
+    if not jwt_handler.is_symmetric():
+        key_ring.load(db_manager)
+    password_handler.rounds = 4
+    org_service = OrganizationService(db_manager)
+    org_service.create_organization(OrganizationCreate(
+        organization_name="bench_org",
+        email="admin@bench.com",
+        password="BenchPass123"
+    ))
+    return org_service
+
+
+def _create_organization():
+    org_service = _fresh_database()
+    names = (f"bench_org_{n}" for n in itertools.count())
+
+    def create_organization():
+        name = next(names)
+        org_service.create_organization(OrganizationCreate(
+            organization_name=name,
+            email=f"{name}@bench.com",
+            password="BenchPass123"
+        ))
+    return create_organization
+
+
+def _get_organization():
+    org_service = _fresh_database()
+    return lambda: org_service.get_organization("bench_org")
+
+
+def _login():
+    _fresh_database()
+    auth_service = AuthService(db_manager)
+    login_data = AdminLogin(email="admin@bench.com", password="BenchPass123")
+    return lambda: auth_service.login(login_data)
+
+
+def _create_access_token():
+    _fresh_database()
+    return lambda: jwt_handler.create_access_token(CLAIMS)
+
+
+def _verify_token():
+    _fresh_database()
+    token = jwt_handler.create_access_token(CLAIMS)
+    return lambda: jwt_handler.verify_token(token)
+
+
+def _validate_create():
+    payload = {
+        "organization_name": "Acme_Corp-01",
+        "email": "admin@acme.com",
+        "password": "SecurePass123"
+    }
+    return lambda: OrganizationCreate.model_validate(payload)
+
+
+def _validate_update():
+    payload = {"organization_name": "acme_renamed", "password": "NewSecurePass456"}
+    return lambda: OrganizationUpdate.model_validate(payload)
+
+
+def _serialize():
+    document = {
+        "_id": ObjectId(),
+        "organization_name": "bench_org",
+        "email": "admin@bench.com",
+        "connection_details": "Collection: org_bench_org",
+        "created_at": datetime.utcnow(),
+        "updated_at": None
+    }
+    return lambda: OrganizationRepository._serialize_document(dict(document))
+
+
+# (name, setup returning the callable to time)
+CASES = [
+    ("OrganizationService.create_organization", _create_organization),
+    ("OrganizationService.get_organization", _get_organization),
+    ("AuthService.login", _login),
+    ("JWTHandler.create_access_token", _create_access_token),
+    ("JWTHandler.verify_token", _verify_token),
+    ("OrganizationCreate.model_validate", _validate_create),
+    ("OrganizationUpdate.model_validate", _validate_update),
+    ("_serialize_document", _serialize),
+]
+
+
+def measure(fn):
+    """Median per-call time in seconds over REPEAT runs of at least 0.2s each."""
+    number, _ = timeit.Timer(fn).autorange()
+    return statistics.median(timeit.repeat(fn, number=number, repeat=REPEAT)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown relative to baseline (0.25 = 25%%)")
+    parser.add_argument("--min-gated-us", type=float, default=10.0,
+                        help="report cases with a faster baseline without gating on them")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"write results to {BASELINE_PATH.name} instead of comparing")
+    args = parser.parse_args()
+
+    baselines = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results = {}
+    regressions = []
+
+    print(f"{'case':<40}{'us/op':>10}{'relative':>10}{'baseline':>10}{'change':>9}")
+    for name, setup in CASES:
+        if args.only and args.only.lower() not in name.lower():
+            continue
+        fn = setup()
+        per_call = measure(fn)
+        relative = per_call / measure(_calibration)
+        results[name] = {"us_per_op": round(per_call * 1e6, 3), "relative": round(relative, 4)}
+        baseline = baselines.get(name, {})
+        if baseline.get("relative"):
+            change = relative / baseline["relative"] - 1
+            threshold = max(args.threshold, CASE_THRESHOLDS.get(name, 0.0))
+            if baseline.get("us_per_op", 0.0) < args.min_gated_us:
+                flag = "  (report only)"
+            elif change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(name)
+            else:
+                flag = ""
+            print(f"{name:<40}{per_call * 1e6:>10.2f}{relative:>10.3f}{baseline['relative']:>10.3f}{change:>+8.0%}{flag}")
+        else:
+            print(f"{name:<40}{per_call * 1e6:>10.2f}{relative:>10.3f}{'-':>10}{'-':>9}")
+
+    db_manager.disconnect()
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({**baselines, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than their threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Benchmark for request schema validation throughput.
+
+Measures validations per second for each request model in
+app/models/schemas.py on valid payloads and on a rejected payload.
+
+Usage:
+    python tests/benchmarks/bench_schemas.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pydantic import ValidationError
+from app.models.schemas import OrganizationCreate, OrganizationUpdate, AdminLogin
+
+ITERATIONS = 20000
+
+CASES = [
+    ("OrganizationCreate", OrganizationCreate, {
+        "organization_name": "Acme_Corp-01",
+        "email": "admin@acme.com",
+        "password": "SecurePass123"
+    }),
+    ("OrganizationCreate (weak)", OrganizationCreate, {
+        "organization_name": "acme_corp",
+        "email": "admin@acme.com",
+        "password": "weakpassword"
+    }),
+    ("OrganizationUpdate", OrganizationUpdate, {
+        "organization_name": "acme_renamed",
+        "password": "NewSecurePass456"
+    }),
+    ("OrganizationUpdate (empty)", OrganizationUpdate, {}),
+    ("AdminLogin", AdminLogin, {
+        "email": "admin@acme.com",
+        "password": "SecurePass123"
+    }),
+]
+
+
+def _validate(model, payload):
+    try:
+        model.model_validate(payload)
+    except ValidationError:
+        pass
+
+
+def main():
+    print(f"{'model':<30}{'us/op':>10}{'ops/sec':>14}")
+    for name, model, payload in CASES:
+        elapsed = timeit.timeit(lambda: _validate(model, payload), number=ITERATIONS)
+        print(f"{name:<30}{elapsed / ITERATIONS * 1e6:>10.2f}{ITERATIONS / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
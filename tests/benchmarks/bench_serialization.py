@@ -0,0 +1,64 @@
+"""
+Benchmark for response serialization.
+
+Compares FastAPI's default response_model path (validate + jsonable_encoder +
+stdlib json) against FastJSONResponse encoding validated models directly.
+
+Usage:
+    python tests/benchmarks/bench_serialization.py
+"""
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.models.schemas import OrganizationResponse, TokenResponse
+from app.responses import FastJSONResponse
+
+ITERATIONS = 20000
+
+
+def _default_path(model):
+    """Mimic FastAPI's response_model handling for an async route."""
+    validated = type(model).model_validate(model.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def _fast_path(model):
+    """Encode the validated model straight to bytes."""
+    return FastJSONResponse(model).body
+
+
+def main():
+    samples = {
+        "OrganizationResponse": OrganizationResponse(
+            id="65a1f0c2e4b0a1b2c3d4e5f6",
+            organization_name="acme_corp",
+            email="admin@acme.com",
+            connection_details="Collection: org_acme_corp",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        ),
+        "TokenResponse": TokenResponse(
+            access_token="eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 200,
+            admin_id="65a1f0c2e4b0a1b2c3d4e5f7",
+            organization_id="65a1f0c2e4b0a1b2c3d4e5f6",
+            organization_name="acme_corp"
+        ),
+    }
+
+    print(f"{'model':<22}{'default (us)':>14}{'fast (us)':>12}{'speedup':>10}")
+    for name, model in samples.items():
+        default = timeit.timeit(lambda: _default_path(model), number=ITERATIONS)
+        fast = timeit.timeit(lambda: _fast_path(model), number=ITERATIONS)
+        default_us = default / ITERATIONS * 1e6
+        fast_us = fast / ITERATIONS * 1e6
+        print(f"{name:<22}{default_us:>14.2f}{fast_us:>12.2f}{default / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
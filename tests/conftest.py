@@ -1,18 +1,45 @@
 """
 Test configuration and fixtures for Croupier tests.
 """
+import os
+
+# Tests run against the in-memory backend unless MONGODB_BACKEND=mongo is set.
+# Low bcrypt cost and RSA key size keep per-test setup (lifespan, create + login) cheap.
+os.environ.setdefault("MONGODB_BACKEND", "memory")
+os.environ.setdefault("BCRYPT_CALIBRATE", "false")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("JWT_KEY_SIZE", "1024")
+# pytest-xdist workers sharing one MongoDB server each get their own database
+if os.environ.get("PYTEST_XDIST_WORKER") and os.environ["MONGODB_BACKEND"] == "mongo":
+    os.environ["MONGODB_DB_NAME"] = (
+        f"{os.environ.get('MONGODB_DB_NAME', 'croupier_master')}_{os.environ['PYTEST_XDIST_WORKER']}"
+    )
+
 import pytest
 from fastapi.testclient import TestClient
 from main import app
 from app.db import db_manager
+from app.security.login_throttle import login_admission, InMemoryRateLimitStore
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def client():
-    """Create a test client for the FastAPI application."""
+    """
+    Create a test client for the FastAPI application.
+    
+    Every test gets its own application lifespan; with the memory backend
+    that means a fresh, empty database.
+    """
     with TestClient(app) as test_client:
         yield test_client
 
-@pytest.fixture(scope="module")
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    """Start every test with full login rate-limit buckets."""
+    if isinstance(login_admission.store, InMemoryRateLimitStore):
+        login_admission.store.reset()
+    yield
+
+@pytest.fixture
 def test_org_data():
     """Sample organization data for testing."""
     import random
@@ -24,7 +51,7 @@ def test_org_data():
         "password": "TestPass123"
     }
 
-@pytest.fixture(scope="module")
+@pytest.fixture
 def auth_headers(client, test_org_data):
     """Get authentication headers with valid JWT token."""
     # Create organization first (ignore if already exists)
@@ -55,3 +82,25 @@ def auth_headers(client, test_org_data):
     
     token = login_response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def assert_max_round_trips():
+    """
+    Assert a request sent at most ``limit`` MongoDB commands.
+    
+    Reads the count from the response's Server-Timing header, so it covers
+    every command the request caused, including those run in the thread pool.
+    """
+    import re
+    
+    def check(response, limit):
+        match = re.search(r'db;dur=[\d.]+;desc="(\d+) commands?"', response.headers.get("server-timing", ""))
+        assert match, "response has no Server-Timing db entry"
+        count = int(match.group(1))
+        assert count <= limit, (
+            f"{response.request.method} {response.request.url.path} sent {count} "
+            f"MongoDB commands, budget is {limit}"
+        )
+        return count
+    
+    return check
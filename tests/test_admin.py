@@ -58,6 +58,67 @@ class TestAdminLogin:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    def test_login_rehashes_outdated_cost(self, client, monkeypatch):
+        """Test successful login re-hashes a password stored below the configured bcrypt cost."""
+        from app.db import db_manager
+        from app.security.password_handler import password_handler
+        
+        org_data = {
+            "organization_name": "rehash_test_org",
+            "email": "rehash@example.com",
+            "password": "RehashPass123"
+        }
+        client.post("/org/create", json=org_data)
+        
+        new_rounds = password_handler.rounds + 1
+        monkeypatch.setattr(password_handler, "rounds", new_rounds)
+        response = client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        })
+        
+        assert response.status_code == status.HTTP_200_OK
+        stored = db_manager.admin_users.find_one({"email": org_data["email"]})
+        assert stored["password"].startswith(f"$2b${new_rounds:02d}$")
+    
+    def test_login_keeps_higher_cost_hash(self, client, monkeypatch):
+        """Test a pod configured with a lower cost does not downgrade a stored hash."""
+        from app.db import db_manager
+        from app.security.password_handler import password_handler
+        
+        org_data = {
+            "organization_name": "no_downgrade_org",
+            "email": "no_downgrade@example.com",
+            "password": "KeepPass123"
+        }
+        monkeypatch.setattr(password_handler, "rounds", password_handler.rounds + 1)
+        client.post("/org/create", json=org_data)
+        stored_before = db_manager.admin_users.find_one({"email": org_data["email"]})["password"]
+        
+        monkeypatch.setattr(password_handler, "rounds", password_handler.rounds - 1)
+        response = client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        })
+        
+        assert response.status_code == status.HTTP_200_OK
+        stored = db_manager.admin_users.find_one({"email": org_data["email"]})
+        assert stored["password"] == stored_before
+    
+    def test_fleet_cost_is_shared_across_workers(self, client, monkeypatch):
+        """Test a worker adopts the stored bcrypt cost instead of its own calibration."""
+        from app.db import db_manager
+        from app.security.password_handler import PasswordHandler
+        
+        first = PasswordHandler()
+        monkeypatch.setattr(first, "calibrate", lambda: 5)
+        assert first.adopt_fleet_cost(db_manager) == 5
+        
+        second = PasswordHandler()
+        monkeypatch.setattr(second, "calibrate", lambda: 7)
+        assert second.adopt_fleet_cost(db_manager) == 5
+        assert second.rounds == 5
+    
     def test_login_missing_fields(self, client):
         """Test login with missing fields returns validation error."""
         response = client.post("/admin/login", json={
@@ -75,6 +136,84 @@ class TestAdminLogin:
         })
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_login_rate_limited_per_email(self, client):
+        """Test repeated attempts for one email are throttled with 429."""
+        from app.config import settings
+        
+        statuses = []
+        for _ in range(settings.LOGIN_EMAIL_BURST + 1):
+            response = client.post("/admin/login", json={
+                "email": "bruteforce@example.com",
+                "password": "WrongPass123"
+            })
+            statuses.append(response.status_code)
+        
+        assert statuses[0] == status.HTTP_401_UNAUTHORIZED
+        assert statuses[-1] == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["retry-after"]) >= 1
+    
+    async def test_verify_queue_full_or_timed_out_gets_503(self):
+        """Test verifies beyond the slots and queue are rejected with 503 + Retry-After."""
+        import asyncio
+        from fastapi import HTTPException
+        from app.security.login_throttle import LoginAdmission
+        
+        admission = LoginAdmission(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        release = asyncio.Event()
+        
+        async def verify():
+            async with admission.verify_slot():
+                await release.wait()
+        
+        holder = asyncio.create_task(verify())
+        queued = asyncio.create_task(verify())
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as queue_full:
+            await verify()
+        with pytest.raises(HTTPException) as timed_out:
+            await queued
+        release.set()
+        await holder
+        
+        assert queue_full.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert timed_out.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert timed_out.value.headers["Retry-After"] == "1"
+        assert admission.rejected_overloaded == 2
+    
+    def test_login_ip_bucket_uses_configured_header(self, client, monkeypatch):
+        """Test clients behind a proxy get separate per-IP buckets via LOGIN_CLIENT_IP_HEADER."""
+        from app.config import settings
+        
+        monkeypatch.setattr(settings, "LOGIN_CLIENT_IP_HEADER", "X-Forwarded-For")
+        monkeypatch.setattr(settings, "LOGIN_IP_BURST", 1)
+        
+        def attempt(forwarded_for, email):
+            return client.post("/admin/login", json={
+                "email": email,
+                "password": "WrongPass123"
+            }, headers={"X-Forwarded-For": forwarded_for}).status_code
+        
+        assert attempt("203.0.113.1", "a@example.com") == status.HTTP_401_UNAUTHORIZED
+        # A forged left-most entry does not escape the bucket of the address the proxy saw
+        assert attempt("198.51.100.9, 203.0.113.1", "b@example.com") == status.HTTP_429_TOO_MANY_REQUESTS
+        assert attempt("203.0.113.2", "c@example.com") == status.HTTP_401_UNAUTHORIZED
+    
+    def test_sweep_keeps_slow_buckets_that_are_still_refilling(self, monkeypatch):
+        """Test a sweep triggered by a fast-refilling bucket keeps slower, partly drained buckets."""
+        from app.security import login_throttle
+        
+        store = login_throttle.InMemoryRateLimitStore()
+        now = [1000.0]
+        monkeypatch.setattr(login_throttle.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(store, "SWEEP_INTERVAL", 2)
+        
+        store.consume("email:slow@example.com", capacity=1, refill_per_second=0.01)
+        now[0] += 60
+        store.consume("ip:203.0.113.1", capacity=20, refill_per_second=1.0)
+        
+        # 0.6 of a token refilled: the email bucket must still be throttled
+        assert store.consume("email:slow@example.com", capacity=1, refill_per_second=0.01) > 0
 
 
 class TestJWTAuthentication:
@@ -107,3 +246,151 @@ class TestJWTAuthentication:
         
         # Should not be unauthorized (might fail for other reasons, but not auth)
         assert response.status_code != status.HTTP_401_UNAUTHORIZED
+
+
+class TestRefreshToken:
+    """Tests for POST /admin/refresh endpoint."""
+    
+    def _login(self, client):
+        import random
+        import string
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        org_data = {
+            "organization_name": f"refresh_org_{random_suffix}",
+            "email": f"refresh_{random_suffix}@example.com",
+            "password": "RefreshPass123"
+        }
+        client.post("/org/create", json=org_data)
+        return client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        }).json()
+    
+    def test_refresh_success(self, client):
+        """Test refresh token returns a new access token and rotated refresh token."""
+        tokens = self._login(client)
+        assert tokens["refresh_token"]
+        
+        response = client.post("/admin/refresh", json={
+            "refresh_token": tokens["refresh_token"]
+        })
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["access_token"]
+        assert data["refresh_token"] != tokens["refresh_token"]
+        assert data["admin_id"] == tokens["admin_id"]
+    
+    def test_refresh_token_reuse_rejected(self, client):
+        """Test a rotated refresh token cannot be used again and revokes its chain."""
+        tokens = self._login(client)
+        rotated = client.post("/admin/refresh", json={
+            "refresh_token": tokens["refresh_token"]
+        }).json()
+        
+        replay = client.post("/admin/refresh", json={
+            "refresh_token": tokens["refresh_token"]
+        })
+        assert replay.status_code == status.HTTP_401_UNAUTHORIZED
+        
+        # The replay revoked the chain, including the newest token
+        response = client.post("/admin/refresh", json={
+            "refresh_token": rotated["refresh_token"]
+        })
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_refresh_invalid_token(self, client):
+        """Test unknown refresh token is rejected."""
+        response = client.post("/admin/refresh", json={
+            "refresh_token": "not-a-real-token"
+        })
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestJWKS:
+    """Tests for GET /.well-known/jwks.json endpoint."""
+    
+    def test_jwks_verifies_issued_token(self, client, auth_headers):
+        """Test issued tokens can be verified with the published keys alone."""
+        from jose import jwt
+        from app.config import settings
+        
+        if settings.JWT_ALGORITHM.startswith("HS"):
+            pytest.skip("JWKS is only published for asymmetric algorithms")
+        
+        response = client.get("/.well-known/jwks.json")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert "max-age" in response.headers["cache-control"]
+        jwks = response.json()
+        token = auth_headers["Authorization"].split(" ", 1)[1]
+        kid = jwt.get_unverified_header(token)["kid"]
+        assert kid in [key["kid"] for key in jwks["keys"]]
+        
+        payload = jwt.decode(token, jwks, algorithms=[settings.JWT_ALGORITHM])
+        assert "admin_id" in payload
+
+
+class TestTokenRevocation:
+    """Tests for access token revocation."""
+    
+    def _login(self, client):
+        import random
+        import string
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        org_data = {
+            "organization_name": f"revoke_org_{random_suffix}",
+            "email": f"revoke_{random_suffix}@example.com",
+            "password": "RevokePass123"
+        }
+        client.post("/org/create", json=org_data)
+        token = client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        }).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    
+    def test_logout_revokes_token(self, client):
+        """Test a logged-out token is rejected."""
+        headers = self._login(client)
+        
+        response = client.post("/admin/logout", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        
+        response = client.put("/org/update", headers=headers, json={"email": "x@example.com"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_password_change_revokes_existing_tokens(self, client):
+        """Test changing the password invalidates tokens issued before it."""
+        headers = self._login(client)
+        
+        response = client.put("/org/update", headers=headers, json={"password": "ChangedPass456"})
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = client.put("/org/update", headers=headers, json={"email": "y@example.com"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_sync_applies_revocations_committed_out_of_order(self, client):
+        """Test another worker's revocation stamped before the newest one seen is still applied."""
+        from datetime import datetime, timedelta
+        from app.db import db_manager
+        from app.security.revocation import RevocationList
+        
+        revocations = RevocationList()
+        revocations.load(db_manager)
+        newest = datetime.utcnow()
+        expires_at = newest + timedelta(minutes=5)
+        db_manager.revoked_tokens.insert_one({
+            "kind": "jti", "value": "newer", "revoked_at": newest, "expires_at": expires_at
+        })
+        revocations.sync()
+        # Written by a slower worker: stamped earlier, visible only now
+        db_manager.revoked_tokens.insert_one({
+            "kind": "jti", "value": "late", "revoked_at": newest - timedelta(seconds=10), "expires_at": expires_at
+        })
+        revocations.sync()
+        
+        assert revocations.is_revoked({"jti": "newer"})
+        assert revocations.is_revoked({"jti": "late"})
+        assert revocations._last_sync == newest
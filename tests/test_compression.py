@@ -0,0 +1,47 @@
+"""
+Tests for response compression and its cache validators.
+"""
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware
+
+def _app():
+    app = FastAPI()
+    
+    @app.get("/doc")
+    def doc(request: Request, size: int = 4096):
+        if request.headers.get("if-none-match") in ('"v1"', 'W/"v1"'):
+            return Response(status_code=304, headers={"ETag": '"v1"'})
+        return Response(b"x" * size, media_type="text/plain", headers={"ETag": '"v1"'})
+    
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+class TestCompression:
+    """Tests for Vary and ETag handling across content codings."""
+    
+    def test_compressed_body_gets_weak_etag_and_vary(self):
+        """Test a gzip body is not served under the identity body's strong ETag."""
+        with TestClient(_app()) as client:
+            compressed = client.get("/doc", headers={"Accept-Encoding": "gzip"})
+            identity = client.get("/doc", headers={"Accept-Encoding": "identity"})
+            small = client.get("/doc?size=10", headers={"Accept-Encoding": "gzip"})
+        
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == 'W/"v1"'
+        assert identity.headers["etag"] == '"v1"'
+        assert small.headers["etag"] == '"v1"'
+        for response in (compressed, identity, small):
+            assert response.headers["vary"] == "Accept-Encoding"
+    
+    def test_not_modified_echoes_the_clients_validator(self):
+        """Test a 304 for a compressed copy carries the weak ETag the client holds."""
+        with TestClient(_app()) as client:
+            weak = client.get("/doc", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"v1"'})
+            strong = client.get("/doc", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1"'})
+        
+        assert weak.status_code == strong.status_code == 304
+        assert weak.headers["etag"] == 'W/"v1"'
+        assert strong.headers["etag"] == '"v1"'
+        assert weak.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,97 @@
+"""
+Tests for per-tenant fair-share concurrency limits.
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException, status
+from app.fair_share import TenantScheduler, tenant_rejected, tenant_scheduler
+
+async def _hold_slot(scheduler, tenant, order, release=None):
+    async with scheduler.slot(tenant):
+        order.append(tenant)
+        if release is not None:
+            await release.wait()
+
+
+class TestFairShare:
+    """Tests for slot scheduling, caps and rejections."""
+    
+    async def test_waiting_tenants_are_served_by_weight(self):
+        """Test a backlogged tenant cannot starve another; weights set the ratio."""
+        scheduler = TenantScheduler(max_concurrent=1, max_per_tenant=10, max_queue=10,
+                                    queue_timeout=5, weights={"heavy": 2.0})
+        order = []
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold_slot(scheduler, "noisy", order, release))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(_hold_slot(scheduler, "noisy", order)) for _ in range(4)]
+        waiters += [asyncio.create_task(_hold_slot(scheduler, "heavy", order)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth("noisy") == 4
+        assert scheduler.queue_depth("heavy") == 4
+        
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        
+        # The noisy tenant queued first, yet the weight-2 tenant gets two slots per noisy one
+        assert order[1:] == ["heavy", "heavy", "noisy", "heavy", "heavy", "noisy", "noisy", "noisy"]
+        assert scheduler.in_flight == 0
+    
+    async def test_lone_tenant_uses_all_idle_capacity(self):
+        """Test a tenant alone gets more than its cap at once, and queues only when slots run out."""
+        scheduler = TenantScheduler(max_concurrent=4, max_per_tenant=1, max_queue=1, queue_timeout=0.05)
+        order = []
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold_slot(scheduler, "org", order, release)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert order == ["org"] * 4
+        assert scheduler.in_flight == 4
+        
+        queued = asyncio.create_task(_hold_slot(scheduler, "org", order))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as queue_full:
+            await _hold_slot(scheduler, "org", order)
+        with pytest.raises(HTTPException) as timed_out:
+            await queued
+        
+        assert queue_full.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert timed_out.value.headers["Retry-After"] == "1"
+        assert tenant_rejected.value(tenant="org", reason="queue_full") >= 1
+        assert tenant_rejected.value(tenant="org", reason="timeout") >= 1
+        assert scheduler.queue_depth("org") == 0
+        
+        release.set()
+        await asyncio.gather(*holders)
+        assert scheduler.in_flight == 0
+    
+    async def test_cap_applies_while_others_wait(self):
+        """Test a freed slot goes to a waiting tenant under its cap before one over it."""
+        scheduler = TenantScheduler(max_concurrent=2, max_per_tenant=1, max_queue=10, queue_timeout=5)
+        order = []
+        releases = [asyncio.Event(), asyncio.Event()]
+        holders = [asyncio.create_task(_hold_slot(scheduler, "noisy", order, r)) for r in releases]
+        await asyncio.sleep(0)
+        noisy = asyncio.create_task(_hold_slot(scheduler, "noisy", order))
+        await asyncio.sleep(0)
+        quiet = asyncio.create_task(_hold_slot(scheduler, "quiet", order))
+        await asyncio.sleep(0)
+        
+        releases[0].set()
+        await quiet
+        # The noisy tenant still holds a slot, at its cap, so the quiet one went first
+        assert order[:3] == ["noisy", "noisy", "quiet"]
+        
+        releases[1].set()
+        await asyncio.gather(noisy, *holders)
+        assert order == ["noisy", "noisy", "quiet", "noisy"]
+        assert scheduler.in_flight == 0
+    
+    def test_update_over_tenant_limit_gets_429(self, client, auth_headers, monkeypatch):
+        """Test an organization with no free slot and no queue room is rejected."""
+        monkeypatch.setattr(tenant_scheduler, "max_concurrent", 0)
+        monkeypatch.setattr(tenant_scheduler, "max_queue", 0)
+        
+        response = client.put("/org/update", json={"email": "new@example.com"}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "tenant_requests_rejected_total" in client.get("/metrics").text
@@ -54,3 +54,33 @@ class TestRootEndpoint:
         assert "redoc" in data
         assert data["docs"] == "/docs"
         assert data["redoc"] == "/redoc"
+
+
+class TestEventLoopMonitor:
+    """Tests for event loop lag monitoring and GET /metrics."""
+    
+    def test_metrics_exports_loop_lag(self, client):
+        """Test the lag metrics are exposed in the Prometheus text format."""
+        response = client.get("/metrics")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE event_loop_lag_seconds gauge" in response.text
+        assert "event_loop_blocked_total" in response.text
+    
+    async def test_blocking_call_stack_is_captured(self):
+        """Test a call blocking the loop is measured and its stack recorded."""
+        import asyncio
+        import time
+        from app.loop_monitor import LoopLagMonitor
+        
+        monitor = LoopLagMonitor(interval_seconds=0.01, threshold_seconds=0.05)
+        task = asyncio.create_task(monitor.run(capture_stacks=True))
+        await asyncio.sleep(0.03)
+        time.sleep(0.2)
+        await asyncio.sleep(0.03)
+        task.cancel()
+        
+        assert monitor.lag >= 0.1
+        assert "test_blocking_call_stack_is_captured" in monitor.last_blocking_stack
+        assert "time.sleep(0.2)" in monitor.last_blocking_stack
@@ -0,0 +1,108 @@
+"""
+Tests for Idempotency-Key handling on mutating routes.
+"""
+from fastapi import status
+from app.db import db_manager
+from app.idempotency import idempotency_store
+
+class TestIdempotency:
+    """Tests for replaying, rejecting and bypassing Idempotency-Keys."""
+    
+    def test_retried_create_replays_original_response(self, client, test_org_data):
+        """Test a retry gets the first 201 back without creating anything again."""
+        headers = {"Idempotency-Key": "create-1"}
+        first = client.post("/org/create", json=test_org_data, headers=headers)
+        retry = client.post("/org/create", json=test_org_data, headers=headers)
+        
+        assert first.status_code == status.HTTP_201_CREATED
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.json() == first.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+        assert db_manager.organizations.count_documents({}) == 1
+        
+        # Without the front cache the record is read back from the master database
+        idempotency_store.cache.clear()
+        retry = client.post("/org/create", json=test_org_data, headers=headers)
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.headers["idempotent-replayed"] == "true"
+    
+    def test_key_reused_with_different_request_is_rejected(self, client, test_org_data):
+        """Test the same key with another body gets 422 instead of a replay."""
+        headers = {"Idempotency-Key": "create-2"}
+        client.post("/org/create", json=test_org_data, headers=headers)
+        other = dict(test_org_data, organization_name=test_org_data["organization_name"] + "_x")
+        
+        response = client.post("/org/create", json=other, headers=headers)
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert db_manager.organizations.count_documents({}) == 1
+    
+    def test_in_progress_key_and_invalid_key(self, client, test_org_data):
+        """Test a key still being processed gets 409, an over-long key 400."""
+        too_long = client.post(
+            "/org/create", json=test_org_data, headers={"Idempotency-Key": "x" * 256}
+        )
+        assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+        
+        first = client.post("/org/create", json=test_org_data, headers={"Idempotency-Key": "create-3"})
+        record_id = db_manager.idempotency_keys.find_one({})["_id"]
+        db_manager.idempotency_keys.update_one({"_id": record_id}, {"$set": {"state": "in_progress"}})
+        idempotency_store.cache.clear()
+        
+        response = client.post("/org/create", json=test_org_data, headers={"Idempotency-Key": "create-3"})
+        
+        assert first.status_code == status.HTTP_201_CREATED
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.headers["retry-after"] == "1"
+    
+    def test_client_errors_are_replayed_too(self, client, test_org_data):
+        """Test a final 4xx is replayed, while requests without a key are unaffected."""
+        client.post("/org/create", json=test_org_data)
+        
+        duplicate = client.post("/org/create", json=test_org_data, headers={"Idempotency-Key": "create-4"})
+        replay = client.post("/org/create", json=test_org_data, headers={"Idempotency-Key": "create-4"})
+        plain = client.post("/org/create", json=test_org_data)
+        
+        assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+        assert replay.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in plain.headers
+    
+    def test_stale_claim_cannot_release_or_complete_a_takeover(self, client):
+        """Test a request whose lock expired leaves the claim that took over alone."""
+        from datetime import datetime, timedelta
+        from app.repositories.idempotency_repository import IdempotencyRepository
+        
+        repo = IdempotencyRepository(db_manager)
+        slow_token, _ = repo.claim("key-1", "fp", 30, timedelta(hours=1))
+        db_manager.idempotency_keys.update_one(
+            {"_id": "key-1"}, {"$set": {"locked_until": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        new_token, _ = repo.claim("key-1", "fp", 30, timedelta(hours=1))
+        
+        repo.release("key-1", slow_token)
+        assert not repo.complete("key-1", slow_token, 201, [], b"late")
+        
+        record = db_manager.idempotency_keys.find_one({"_id": "key-1"})
+        assert new_token not in (None, slow_token)
+        assert record["claim_token"] == new_token
+        assert record["state"] == "in_progress"
+        assert repo.complete("key-1", new_token, 201, [], b"done")
+    
+    def test_claim_retries_when_the_record_disappears(self, client, monkeypatch):
+        """Test a key released between the failed insert and the read is claimed again."""
+        from datetime import timedelta
+        from app.repositories.idempotency_repository import IdempotencyRepository
+        
+        repo = IdempotencyRepository(db_manager)
+        repo.claim("key-2", "fp", 30, timedelta(hours=1))
+        find_one = repo.collection.find_one
+        
+        def released_meanwhile(query, *args, **kwargs):
+            db_manager.idempotency_keys.delete_one({"_id": "key-2"})
+            return find_one(query, *args, **kwargs)
+        
+        monkeypatch.setattr(repo.collection, "find_one", released_meanwhile)
+        token, existing = repo.claim("key-2", "fp", 30, timedelta(hours=1))
+        
+        assert token is not None and existing is None
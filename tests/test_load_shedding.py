@@ -0,0 +1,66 @@
+"""
+Tests for adaptive load shedding.
+"""
+import time
+from fastapi import status
+from app.admission import CRITICAL, LOW, NORMAL, LoadShedder, load_shedder, route_priority
+from app.db_stats import PoolWaitListener
+
+class TestLoadShedding:
+    """Tests for admission decisions and the 503 responses."""
+    
+    def test_priorities_are_shed_at_increasing_overload(self):
+        """Test low-priority routes go first, then normal ones; critical ones never."""
+        shedder = LoadShedder(max_in_flight=4, max_loop_lag_seconds=10, max_pool_wait_seconds=10)
+        
+        shedder.in_flight = 4
+        assert shedder.admit(LOW) == "in_flight"
+        assert shedder.admit(NORMAL) is None
+        
+        shedder.in_flight = 8
+        assert shedder.admit(NORMAL) == "in_flight"
+        assert shedder.admit(CRITICAL) is None
+        
+        assert route_priority("POST", "/admin/login") == CRITICAL
+        assert route_priority("GET", "/org/get") == CRITICAL
+        assert route_priority("POST", "/org/create") == LOW
+        assert route_priority("PUT", "/org/update") == NORMAL
+        assert route_priority("OPTIONS", "/org/create") == CRITICAL
+    
+    def test_pool_wait_decays_when_idle(self):
+        """Test the pool wait signal falls back once checkouts stop waiting."""
+        listener = PoolWaitListener(half_life_seconds=0.05)
+        for _ in range(20):
+            listener.record(0.5)
+        
+        assert listener.wait_seconds > 0.4
+        time.sleep(0.25)
+        assert listener.wait_seconds < 0.05
+    
+    def test_overloaded_worker_keeps_serving_critical_routes(self, client, test_org_data, monkeypatch):
+        """Test create is rejected with 503 before any work while login and get succeed."""
+        client.post("/org/create", json=test_org_data)
+        monkeypatch.setattr(load_shedder, "max_in_flight", 1)
+        monkeypatch.setattr(load_shedder, "in_flight", 1)
+        
+        origin = {"Origin": "https://app.example.com"}
+        shed = client.post("/org/create", json={"not": "validated"}, headers=origin)
+        preflight = client.options("/org/create", headers={
+            **origin,
+            "Access-Control-Request-Method": "POST"
+        })
+        login = client.post("/admin/login", json={
+            "email": test_org_data["email"],
+            "password": test_org_data["password"]
+        })
+        get = client.get(f"/org/get?organization_name={test_org_data['organization_name']}")
+        
+        assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert shed.headers["retry-after"] == "1"
+        assert shed.headers["x-shed-reason"] == "in_flight"
+        # Browsers can read the rejection and when to retry
+        assert "access-control-allow-origin" in shed.headers
+        assert "retry-after" in shed.headers["access-control-expose-headers"].lower()
+        assert preflight.status_code == status.HTTP_200_OK
+        assert login.status_code == status.HTTP_200_OK
+        assert get.status_code == status.HTTP_200_OK
@@ -0,0 +1,66 @@
+"""
+Tests for the queued structured logging pipeline and request ids.
+"""
+import json
+import logging
+import queue
+from fastapi import status
+from app.structured_logging import (
+    ContextQueueHandler,
+    JSONFormatter,
+    SamplingFilter,
+    request_id_var,
+    tenant_var
+)
+
+
+class TestStructuredLogging:
+    """Tests for record capture, formatting and sampling."""
+    
+    def test_records_carry_context_and_format_lazily(self):
+        """Test request id and tenant are captured and args are formatted by the writer."""
+        log_queue = queue.Queue()
+        handler = ContextQueueHandler(log_queue)
+        logger = logging.getLogger("tests.structured")
+        request_token = request_id_var.set("req-1")
+        tenant_token = tenant_var.set("org-1")
+        try:
+            handler.handle(logger.makeRecord(
+                logger.name, logging.INFO, __file__, 1, "Created organization: %s", ("acme",), None
+            ))
+        finally:
+            tenant_var.reset(tenant_token)
+            request_id_var.reset(request_token)
+        
+        record = log_queue.get_nowait()
+        assert record.args == ("acme",)
+        entry = json.loads(JSONFormatter().format(record))
+        assert entry["message"] == "Created organization: acme"
+        assert entry["request_id"] == "req-1"
+        assert entry["tenant"] == "org-1"
+    
+    def test_sampling_limits_repeated_failures(self):
+        """Test repeated warnings are sampled after the burst and report suppressed counts."""
+        sampler = SamplingFilter(burst=2, every=5, window_seconds=60)
+        
+        def record(level):
+            return logging.makeLogRecord({
+                "name": "tests.sampling", "levelno": level, "msg": "JWT verification failed: %s", "args": ("x",)
+            })
+        
+        kept = [sampler.filter(record(logging.WARNING)) for _ in range(6)]
+        sampled = record(logging.WARNING)
+        
+        assert kept == [True, True, False, False, False, False]
+        assert sampler.filter(sampled)
+        assert sampled.suppressed == 4
+        assert sampler.filter(record(logging.INFO))
+    
+    def test_request_id_header(self, client):
+        """Test a valid incoming request id is echoed and one is generated otherwise."""
+        echoed = client.get("/health", headers={"X-Request-ID": "abc-123"})
+        generated = client.get("/health")
+        
+        assert echoed.status_code == status.HTTP_200_OK
+        assert echoed.headers["x-request-id"] == "abc-123"
+        assert len(generated.headers["x-request-id"]) == 32
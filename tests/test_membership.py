@@ -0,0 +1,65 @@
+"""
+Tests for the membership filters on admin emails and organization names.
+"""
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi import status
+from app.config import settings
+from app.db import db_manager
+from app.membership import KnownIdentities, known_identities
+
+def _forget_everything(monkeypatch):
+    """Make this worker's filters look like their syncs have been failing."""
+    monkeypatch.setattr(known_identities, "emails", KnownIdentities._build_filter(0, []))
+    monkeypatch.setattr(known_identities, "organization_names", KnownIdentities._build_filter(0, []))
+    monkeypatch.setattr(
+        known_identities, "_last_sync",
+        datetime.utcnow() - timedelta(seconds=settings.BLOOM_SYNC_OVERLAP_SECONDS + 1)
+    )
+
+
+class TestMembershipFilters:
+    """Tests for stale filters across workers and for the periodic sync."""
+    
+    def test_records_from_another_worker_are_found(self, client, test_org_data, monkeypatch):
+        """Test login and get succeed for a tenant a stale filter has not seen."""
+        client.post("/org/create", json=test_org_data)
+        _forget_everything(monkeypatch)
+        
+        get = client.get(f"/org/get?organization_name={test_org_data['organization_name']}")
+        login = client.post("/admin/login", json={
+            "email": test_org_data["email"],
+            "password": test_org_data["password"]
+        })
+        
+        assert get.status_code == status.HTTP_200_OK
+        assert login.status_code == status.HTTP_200_OK
+        # The filter learns from the read, so later pre-checks see the record
+        assert known_identities.might_have_organization(test_org_data["organization_name"])
+        assert known_identities.might_have_email(test_org_data["email"])
+        duplicate = client.post("/org/create", json=test_org_data)
+        assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_sync_picks_up_writes_from_skewed_clocks(self, client):
+        """Test sync adds records stamped by a writer whose clock runs behind."""
+        identities = KnownIdentities()
+        identities.build(db_manager)
+        skewed = datetime.utcnow() - timedelta(seconds=settings.BLOOM_SYNC_OVERLAP_SECONDS / 2)
+        db_manager.organizations.insert_one({
+            "_id": ObjectId(),
+            "organization_name": "skewed_org",
+            "email": "skewed@example.com",
+            "created_at": skewed
+        })
+        db_manager.admin_users.insert_one({
+            "email": "skewed@example.com",
+            "password": "x",
+            "organization_id": "unused",
+            "created_at": skewed
+        })
+        assert not identities.might_have_organization("skewed_org")
+        
+        identities.sync(db_manager)
+        
+        assert identities.might_have_organization("skewed_org")
+        assert identities.might_have_email("skewed@example.com")
@@ -0,0 +1,98 @@
+"""
+Tests for the in-memory MongoDB backend used by the test suite.
+"""
+from datetime import datetime
+import pytest
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.memory_mongo import MemoryClient
+
+@pytest.fixture
+def collection():
+    """Fresh collection with a unique index on name."""
+    coll = MemoryClient()["test_db"]["items"]
+    coll.create_index([("name", ASCENDING)], unique=True)
+    return coll
+
+
+class TestMemoryCollection:
+    """Tests for MemoryCollection behaviour the repositories rely on."""
+    
+    def test_unique_index_rejects_duplicates(self, collection):
+        """Test inserts and updates that collide on a unique index fail."""
+        collection.insert_one({"name": "a"})
+        other_id = collection.insert_one({"name": "b"}).inserted_id
+        
+        with pytest.raises(DuplicateKeyError):
+            collection.insert_one({"name": "a"})
+        with pytest.raises(DuplicateKeyError):
+            collection.update_one({"_id": other_id}, {"$set": {"name": "a"}})
+        
+        assert collection.find_one({"_id": other_id})["name"] == "b"
+        assert collection.count_documents({}) == 2
+    
+    def test_find_one_and_update_return_document(self, collection):
+        """Test BEFORE/AFTER documents and upsert."""
+        collection.insert_one({"name": "a", "hits": 1})
+        
+        before = collection.find_one_and_update(
+            {"name": "a"}, {"$inc": {"hits": 1}}, return_document=ReturnDocument.BEFORE
+        )
+        after = collection.find_one_and_update(
+            {"name": "a"}, {"$inc": {"hits": 1}}, return_document=ReturnDocument.AFTER
+        )
+        upserted = collection.find_one_and_update(
+            {"name": "new"}, {"$set": {"hits": 5}}, upsert=True, return_document=True
+        )
+        
+        assert before["hits"] == 1
+        assert after["hits"] == 3
+        assert upserted["name"] == "new" and upserted["hits"] == 5
+        assert collection.find_one_and_update({"name": "missing"}, {"$set": {"hits": 0}}) is None
+        stamped = collection.find_one_and_update(
+            {"name": "a"}, {"$currentDate": {"seen_at": True}}, return_document=ReturnDocument.AFTER
+        )
+        assert isinstance(stamped["seen_at"], datetime)
+    
+    def test_query_operators_projection_and_sort(self, collection):
+        """Test filters, projections and sorting used by the repositories."""
+        for i in range(5):
+            collection.insert_one({"name": f"n{i}", "rank": i, "tags": ["even" if i % 2 == 0 else "odd"]})
+        
+        docs = list(collection.find(
+            {"$or": [{"rank": {"$gte": 3}}, {"name": "n0"}], "tags": "even"},
+            {"name": 1, "_id": 0}
+        ).sort("rank", DESCENDING))
+        
+        assert docs == [{"name": "n4"}, {"name": "n0"}]
+        assert collection.find_one({"rank": {"$in": [2, 7]}})["name"] == "n2"
+    
+    def test_returned_documents_are_copies(self, collection):
+        """Test mutating a returned document does not change stored data."""
+        collection.insert_one({"name": "a", "nested": {"value": 1}})
+        
+        doc = collection.find_one({"name": "a"})
+        doc["nested"]["value"] = 2
+        
+        assert collection.find_one({"name": "a"})["nested"]["value"] == 1
+    
+    def test_operations_are_reported_to_command_listeners(self):
+        """Test each operation is published once, like a server round trip."""
+        events = []
+        
+        class Listener:
+            def succeeded(self, event):
+                events.append(event.command_name)
+            
+            def failed(self, event):
+                events.append(f"{event.command_name}:failed")
+        
+        coll = MemoryClient(event_listeners=[Listener()])["test_db"]["items"]
+        coll.create_index([("name", ASCENDING)], unique=True)
+        coll.insert_one({"name": "a"})
+        coll.find_one({"name": "a"})
+        list(coll.find({}).sort("name", ASCENDING))
+        with pytest.raises(DuplicateKeyError):
+            coll.insert_one({"name": "a"})
+        
+        assert events == ["createIndexes", "insert", "find", "find", "insert:failed"]
@@ -92,6 +92,94 @@ class TestOrganizationGet:
         response = client.get("/org/get?organization_name=nonexistent_org")
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_get_organization_uses_overridden_service(self, client):
+        """Test routes resolve the shared service, which tests can override."""
+        from datetime import datetime
+        from app.models.schemas import OrganizationResponse
+        from app.services.registry import services
+        
+        class StubService:
+            def get_organization(self, organization_name):
+                return OrganizationResponse(
+                    id="stub",
+                    organization_name=organization_name,
+                    email="stub@example.com",
+                    created_at=datetime(2024, 1, 1)
+                )
+        
+        with services.override(organization=StubService()):
+            response = client.get("/org/get?organization_name=stubbed_org")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == "stub"
+        assert client.get("/org/get?organization_name=stubbed_org").status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestOrganizationConditionalGet:
+    """Tests for ETag / If-None-Match handling on GET /org/get."""
+    
+    def test_get_organization_returns_validators(self, client, test_org_data):
+        """Test organization retrieval includes ETag and caching headers."""
+        client.post("/org/create", json=test_org_data)
+        
+        response = client.get(f"/org/get?organization_name={test_org_data['organization_name']}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert "cache-control" in response.headers
+    
+    def test_get_organization_not_modified(self, client, test_org_data):
+        """Test matching If-None-Match returns 304 with no body."""
+        client.post("/org/create", json=test_org_data)
+        url = f"/org/get?organization_name={test_org_data['organization_name']}"
+        etag = client.get(url).headers["etag"]
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        
+        stale = client.get(url, headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == status.HTTP_200_OK
+
+
+class TestOrganizationGetMany:
+    """Tests for POST /org/get-many endpoint."""
+    
+    def test_get_many_preserves_order_and_marks_missing(self, client, test_org_data):
+        """Test results follow request order with not-found markers."""
+        created = client.post("/org/create", json=test_org_data).json()
+        name = test_org_data["organization_name"]
+        
+        response = client.post("/org/get-many", json={
+            "organization_names": ["missing_org_xyz", name],
+            "organization_ids": [created["id"], "not-an-id", "65a1f0c2e4b0a1b2c3d4e5f6"]
+        })
+        
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [r["found"] for r in results] == [False, True, True, False, False]
+        assert results[0]["organization_name"] == "missing_org_xyz"
+        assert results[0]["organization"] is None
+        assert results[1]["organization"]["id"] == created["id"]
+        assert results[2]["id"] == created["id"]
+        assert results[2]["organization"]["organization_name"] == name
+        assert results[3]["id"] == "not-an-id"
+    
+    def test_get_many_validates_batch_size(self, client):
+        """Test empty and oversized batches are rejected."""
+        from app.config import settings
+        
+        empty = client.post("/org/get-many", json={})
+        too_many = client.post("/org/get-many", json={
+            "organization_names": [f"org_{i}" for i in range(settings.ORGANIZATION_BATCH_MAX + 1)]
+        })
+        
+        assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert too_many.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
 class TestOrganizationUpdate:
@@ -115,6 +203,88 @@ class TestOrganizationUpdate:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["email"] == "newemail@example.com"
+    
+    def test_update_after_rename_uses_current_name(self, client):
+        """Test a token issued before a rename still targets the renamed organization."""
+        import random
+        import string
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        org_data = {
+            "organization_name": f"rename_org_{random_suffix}",
+            "email": f"rename_{random_suffix}@example.com",
+            "password": "RenamePass123"
+        }
+        client.post("/org/create", json=org_data)
+        token = client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        renamed = client.put("/org/update", headers=headers, json={
+            "organization_name": f"renamed_org_{random_suffix}"
+        })
+        assert renamed.status_code == status.HTTP_200_OK
+        
+        response = client.put("/org/update", headers=headers, json={
+            "email": f"renamed_{random_suffix}@example.com"
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["organization_name"] == f"renamed_org_{random_suffix}"
+    
+    def test_rename_keeps_tenant_collection(self, client):
+        """Test renaming leaves tenant data in the id-keyed collection."""
+        from app.db import db_manager
+        import random
+        import string
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        org_data = {
+            "organization_name": f"tenant_org_{random_suffix}",
+            "email": f"tenant_{random_suffix}@example.com",
+            "password": "TenantPass123"
+        }
+        org_id = client.post("/org/create", json=org_data).json()["id"]
+        db_manager.get_org_collection(org_id).insert_one({"record": 1})
+        token = client.post("/admin/login", json={
+            "email": org_data["email"],
+            "password": org_data["password"]
+        }).json()["access_token"]
+        
+        response = client.put("/org/update",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"organization_name": f"tenant_renamed_{random_suffix}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["connection_details"] == f"Collection: org_{org_id}"
+        assert db_manager.get_org_collection(org_id).count_documents({"record": 1}) == 1
+    
+    def test_legacy_name_collection_is_migrated(self, client):
+        """Test org_<name> collections of existing organizations move to org_<id>."""
+        from datetime import datetime
+        from app.db import db_manager
+        from app.tenants import migrate_legacy_collections
+        import random
+        import string
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        name = f"legacy_org_{random_suffix}"
+        
+        org_id = db_manager.organizations.insert_one({
+            "organization_name": name,
+            "email": f"legacy_{random_suffix}@example.com",
+            "connection_details": f"Collection: org_{name}",
+            "created_at": datetime.utcnow(),
+            "updated_at": None
+        }).inserted_id
+        db_manager.master_db[f"org_{name}"].insert_one({"record": 1})
+        
+        assert migrate_legacy_collections(db_manager) >= 1
+        
+        org = db_manager.organizations.find_one({"_id": org_id})
+        assert org["collection_name"] == f"org_{org_id}"
+        assert org["connection_details"] == f"Collection: org_{org_id}"
+        assert db_manager.get_org_collection(str(org_id)).count_documents({"record": 1}) == 1
+        assert f"org_{name}" not in db_manager.master_db.list_collection_names()
 
 
 class TestOrganizationDelete:
@@ -0,0 +1,77 @@
+"""
+Tests for request profiling and the profile download endpoints.
+"""
+import time
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.profiling import (
+    PURPOSE_READ,
+    ProfileStore,
+    profile_store,
+    sign_profile_request,
+    verify_profile_request
+)
+
+class TestRequestProfiling:
+    """Tests for signed triggers, artifacts and retrieval."""
+    
+    def test_profile_signature(self):
+        """Test only unexpired headers signed with the secret are accepted."""
+        expires = int(time.time()) + 60
+        value = sign_profile_request(expires, "secret")
+        
+        assert verify_profile_request(value, "secret")
+        assert not verify_profile_request(value, "other-secret")
+        assert not verify_profile_request(f"{expires + 1}.{value.split('.')[1]}", "secret")
+        assert not verify_profile_request(sign_profile_request(int(time.time()) - 1, "secret"), "secret")
+        assert not verify_profile_request(value, "secret", PURPOSE_READ)
+    
+    def test_signed_request_writes_collapsed_stacks(self, tmp_path, monkeypatch):
+        """Test a signed request is profiled, including work in the thread pool."""
+        monkeypatch.setattr(settings, "PROFILING_SECRET", "secret")
+        store = ProfileStore(directory=str(tmp_path))
+        app = FastAPI()
+        
+        @app.get("/slow")
+        def slow():
+            time.sleep(0.05)
+            return {"ok": True}
+        
+        app.add_middleware(ProfilingMiddleware, store=store)
+        header = sign_profile_request(int(time.time()) + 60)
+        with TestClient(app) as test_client:
+            plain = test_client.get("/slow")
+            profiled = test_client.get("/slow", headers={"X-Debug-Profile": header})
+        
+        assert "x-profile-id" not in plain.headers
+        name = profiled.headers["x-profile-id"]
+        for _ in range(100):
+            if store.read(name):
+                break
+            time.sleep(0.01)
+        content = store.read(name)
+        assert content.startswith("# samples=")
+        assert "slow (test_profiling.py" in content
+        assert [p["name"] for p in store.list()] == [name]
+    
+    def test_admin_profile_endpoints(self, client, auth_headers, tmp_path, monkeypatch):
+        """Test profiles are listed and downloaded by operators only, not tenant admins."""
+        monkeypatch.setattr(settings, "PROFILING_SECRET", "secret")
+        monkeypatch.setattr(profile_store, "directory", tmp_path)
+        (tmp_path / "1_GET_org-get_abc.folded").write_text("MainThread;handler (x.py:1) 3\n")
+        operator = {"X-Profile-Operator": sign_profile_request(int(time.time()) + 60, purpose=PURPOSE_READ)}
+        
+        listed = client.get("/admin/profiles", headers=operator)
+        downloaded = client.get("/admin/profiles/1_GET_org-get_abc.folded", headers=operator)
+        
+        assert listed.status_code == status.HTTP_200_OK
+        assert listed.json()["profiles"][0]["name"] == "1_GET_org-get_abc.folded"
+        assert downloaded.text == "MainThread;handler (x.py:1) 3\n"
+        assert client.get("/admin/profiles/..%2Fsecrets.folded", headers=operator).status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/admin/profiles", headers=auth_headers).status_code == status.HTTP_403_FORBIDDEN
+        forged = {"X-Profile-Operator": sign_profile_request(int(time.time()) + 60, "guess", PURPOSE_READ)}
+        assert client.get("/admin/profiles/1_GET_org-get_abc.folded", headers=forged).status_code == status.HTTP_403_FORBIDDEN
+        trigger = {"X-Profile-Operator": sign_profile_request(int(time.time()) + 60)}
+        assert client.get("/admin/profiles", headers=trigger).status_code == status.HTTP_403_FORBIDDEN
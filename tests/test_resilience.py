@@ -0,0 +1,166 @@
+"""
+Tests for database retries, the circuit breaker and 503 responses.
+"""
+import pytest
+from fastapi import status
+from pymongo.errors import AutoReconnect, DuplicateKeyError, ServerSelectionTimeoutError
+from app.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    DatabaseResilience,
+    DatabaseUnavailableError,
+    ResilientCollection,
+    db_resilience
+)
+
+
+class FlakyCollection:
+    """Collection whose operations fail with AutoReconnect a set number of times."""
+    
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+    
+    def _attempt(self):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("connection reset")
+        return {"ok": 1}
+    
+    def find_one(self, *args, **kwargs):
+        return self._attempt()
+    
+    def insert_one(self, *args, **kwargs):
+        return self._attempt()
+    
+    def find(self, *args, **kwargs):
+        # Like pymongo: building the cursor sends nothing, fetching does
+        while True:
+            yield self._attempt()
+
+
+class TestDatabaseResilience:
+    """Tests for retry and circuit breaker behaviour."""
+    
+    def test_reads_retry_and_writes_do_not(self):
+        """Test reads are retried with backoff; writes fail on the first AutoReconnect."""
+        resilience = DatabaseResilience(CircuitBreaker(failure_threshold=5), attempts=3, base_delay_seconds=0)
+        reads = FlakyCollection(failures=2)
+        writes = FlakyCollection(failures=1)
+        
+        assert ResilientCollection(reads, resilience).find_one({}) == {"ok": 1}
+        with pytest.raises(AutoReconnect):
+            ResilientCollection(writes, resilience).insert_one({})
+        
+        assert reads.calls == 3
+        assert writes.calls == 1
+    
+    def test_server_selection_timeout_is_not_retried(self):
+        """Test a server-selection timeout fails at once and counts towards opening the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        resilience = DatabaseResilience(breaker, attempts=3, base_delay_seconds=0)
+        calls = []
+        
+        def select_timeout():
+            calls.append(1)
+            raise ServerSelectionTimeoutError("No servers available")
+        
+        for _ in range(2):
+            with pytest.raises(ServerSelectionTimeoutError):
+                resilience.call(select_timeout, retry=True)
+        
+        assert len(calls) == 2
+        assert breaker.state == OPEN
+    
+    def test_retries_stop_at_the_time_budget(self):
+        """Test a read is not retried once the next backoff would pass the budget."""
+        resilience = DatabaseResilience(
+            CircuitBreaker(failure_threshold=100),
+            attempts=100,
+            base_delay_seconds=0.02,
+            max_delay_seconds=0.02,
+            budget_seconds=0.05
+        )
+        reads = FlakyCollection(failures=100)
+        
+        with pytest.raises(AutoReconnect):
+            ResilientCollection(reads, resilience).find_one({})
+        
+        assert 1 < reads.calls < 20
+        assert resilience.breaker.consecutive_failures == reads.calls
+    
+    def test_breaker_opens_fails_fast_and_recovers(self, monkeypatch):
+        """Test the circuit opens after consecutive failures and a half-open probe closes it."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, half_open_probes=1)
+        resilience = DatabaseResilience(breaker, attempts=1)
+        collection = FlakyCollection(failures=2)
+        proxy = ResilientCollection(collection, resilience)
+        
+        for _ in range(2):
+            with pytest.raises(AutoReconnect):
+                proxy.find_one({})
+        with pytest.raises(DatabaseUnavailableError) as error:
+            proxy.find_one({})
+        
+        assert breaker.state == OPEN
+        assert error.value.retry_after == 30
+        assert collection.calls == 2
+        
+        # Once the reset period has passed, one probe is let through
+        monkeypatch.setattr(breaker, "_opened_at", breaker._opened_at - 31)
+        assert proxy.find_one({}) == {"ok": 1}
+        assert breaker.state == CLOSED
+    
+    def test_half_open_limits_probes_and_server_errors_count_as_success(self):
+        """Test only the probe quota passes while half-open; answered errors close the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0, half_open_probes=1)
+        breaker.record_failure()
+        
+        def duplicate():
+            assert breaker.state == HALF_OPEN
+            # A second caller arriving while the probe is in flight is rejected
+            with pytest.raises(DatabaseUnavailableError):
+                breaker.before_call()
+            raise DuplicateKeyError("E11000")
+        
+        with pytest.raises(DuplicateKeyError):
+            DatabaseResilience(breaker).call(duplicate)
+        assert breaker.state == CLOSED
+    
+    def test_unfetched_cursor_does_not_close_half_open_circuit(self):
+        """Test a find counts as a probe only once its first batch is fetched."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0, half_open_probes=1)
+        breaker.record_failure()
+        proxy = ResilientCollection(FlakyCollection(failures=1), DatabaseResilience(breaker))
+        
+        cursor = proxy.find({})
+        assert breaker.state == OPEN
+        with pytest.raises(AutoReconnect):
+            # The half-open probe is the fetch, and MongoDB is still down
+            next(cursor)
+        
+        assert breaker.state == OPEN
+        assert breaker.consecutive_failures == 2
+        assert next(proxy.find({})) == {"ok": 1}
+        assert breaker.state == CLOSED
+    
+    def test_open_circuit_returns_503_with_retry_after(self, client, monkeypatch):
+        """Test requests fail fast with Retry-After and health reports the open circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=20)
+        breaker.record_failure()
+        monkeypatch.setattr(db_resilience, "breaker", breaker)
+        
+        response = client.post("/org/create", json={
+            "organization_name": "circuit_open_org",
+            "email": "circuit@example.com",
+            "password": "CircuitPass123"
+        })
+        health = client.get("/health").json()
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert 1 <= int(response.headers["retry-after"]) <= 20
+        assert health["status"] == "unhealthy"
+        assert health["database_circuit"]["state"] == OPEN
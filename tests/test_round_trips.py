@@ -0,0 +1,63 @@
+"""
+MongoDB round-trip budgets per endpoint.
+
+Each budget is the number of commands the endpoint needs today; a change
+that adds a query to one of these paths fails here until the budget is
+raised deliberately.
+"""
+from fastapi import status
+
+class TestRoundTripBudgets:
+    """Tests bounding the MongoDB commands each endpoint sends."""
+    
+    def test_organization_lifecycle_budgets(self, client, test_org_data, assert_max_round_trips):
+        """Test create, get, get-many, update and delete stay within budget."""
+        name = test_org_data["organization_name"]
+        created = client.post("/org/create", json=test_org_data)
+        assert created.status_code == status.HTTP_201_CREATED
+        assert_max_round_trips(created, 3)
+        
+        assert_max_round_trips(client.get(f"/org/get?organization_name={name}"), 1)
+        assert_max_round_trips(client.post("/org/get-many", json={
+            "organization_names": [name, "missing_org_one", "missing_org_two"]
+        }), 1)
+        
+        login = client.post("/admin/login", json={
+            "email": test_org_data["email"],
+            "password": test_org_data["password"]
+        })
+        assert_max_round_trips(login, 2)
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        
+        updated = client.put("/org/update", headers=headers, json={
+            "organization_name": name,
+            "email": f"new_{test_org_data['email']}"
+        })
+        assert updated.status_code == status.HTTP_200_OK
+        assert_max_round_trips(updated, 5)
+        
+        deleted = client.request("DELETE", "/org/delete", headers=headers, json={"organization_name": name})
+        assert deleted.status_code == status.HTTP_204_NO_CONTENT
+        assert_max_round_trips(deleted, 8)
+    
+    def test_token_budgets(self, client, test_org_data, assert_max_round_trips):
+        """Test refresh and logout stay within budget."""
+        client.post("/org/create", json=test_org_data)
+        tokens = client.post("/admin/login", json={
+            "email": test_org_data["email"],
+            "password": test_org_data["password"]
+        }).json()
+        
+        refreshed = client.post("/admin/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert_max_round_trips(refreshed, 3)
+        
+        logout = client.post("/admin/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+        assert_max_round_trips(logout, 1)
+    
+    def test_unknown_organization_skips_database(self, client, assert_max_round_trips):
+        """Test lookups ruled out by a freshly synced membership filter send no commands."""
+        response = client.get("/org/get?organization_name=never_created_org")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert assert_max_round_trips(response, 0) == 0